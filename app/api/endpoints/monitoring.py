@@ -1,5 +1,17 @@
 from fastapi import APIRouter
-from firebase_admin import auth
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.endpoints.topics import get_response_cache
+from app.core import config
+from app.core.metrics import registry, render_gauges
+from app.core.startup import startup_report
+from app.middleware.admission import get_admission_controller
+from app.middleware.auth import get_verifier
+from app.repositories.progress_repository import get_write_buffer
+from app.repositories.topic_repository import get_catalog
+from app.services.health_service import get_prober
+from app.services.search_service import get_search_index
+from app.services.session_service import get_session_memo
 
 router = APIRouter()
 
@@ -9,10 +21,86 @@ def read_root():
     return {"message": "Monitoring API is up and running."}
 
 
+@router.get("/live")
+def liveness():
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def readiness():
+    """
+    Último resultado del prober en segundo plano; no hace llamadas de red
+    """
+    prober = get_prober()
+    status_code = 200 if prober.is_ready() else 503
+    return JSONResponse(prober.snapshot(), status_code=status_code)
+
+
 @router.get("/test-firebase")
 def test_firebase():
+    result = get_prober().result('auth')
+    if result is None:
+        return {"message": "Firebase connection not checked yet."}
+    if result['ok']:
+        return {"message": "Firebase connection successful.", **result}
+    return {"message": "Firebase connection failed.", **result}
+
+
+@router.get("/startup")
+def startup_timing():
+    return startup_report.report()
+
+
+@router.get("/cache/topics")
+def topics_cache_stats():
+    return {**get_catalog().stats(), 'responses': get_response_cache().stats(),
+            'search': get_search_index().stats()}
+
+
+@router.get("/cache/auth")
+def auth_cache_stats():
     try:
-        page = auth.list_users(max_results=1)
-        return {"message": "Firebase connection successful.", "user_count": page.users.__len__()}
+        return get_verifier().stats()
     except Exception as e:
-        return {"message": "Firebase connection failed.", "error": str(e)}
+        return {"message": "Token verifier not available.", "error": str(e)}
+
+
+@router.get("/progress-buffer")
+def progress_buffer_stats():
+    write_buffer = get_write_buffer()
+    if write_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_buffer.stats()}
+
+
+@router.get("/cache/sessions")
+def sessions_cache_stats():
+    return get_session_memo().stats()
+
+
+@router.get("/admission")
+def admission_stats():
+    return {"enabled": config.admission_enabled, **get_admission_controller().stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Métricas en formato de texto de Prometheus: latencia por ruta, llamadas
+    al backend y los contadores de los caches
+    """
+    output = registry.render()
+    output += render_gauges('topic_catalog', get_catalog().stats())
+    output += render_gauges('topic_responses', get_response_cache().stats())
+    output += render_gauges('session_memo', get_session_memo().stats())
+    output += render_gauges('topic_search', get_search_index().stats())
+    output += render_gauges('admission', get_admission_controller().stats())
+    write_buffer = get_write_buffer()
+    if write_buffer is not None:
+        output += render_gauges('progress_write_buffer', write_buffer.stats())
+    try:
+        output += render_gauges('auth', get_verifier().stats())
+    except Exception:
+        # Sin configuración de Firebase no hay verificador que reportar
+        pass
+    return PlainTextResponse(output, media_type='text/plain; version=0.0.4')
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+
+from app.core.exceptions import ForbiddenError
+from app.middleware.auth import get_current_user
+from app.models.progress import (ProgressBulkRequest, ProgressBulkResponse, ProgressCreate,
+                                 ProgressResponse, ProgressUpdate)
+from app.services import progress_service
+
+router = APIRouter()
+
+
+@router.post('', response_model=ProgressResponse)
+async def record_progress(progress: ProgressCreate, current_user: dict = Depends(get_current_user)):
+    """
+    Registrar o actualizar el progreso del usuario en un tema
+    """
+    if progress.user_id != current_user['uid']:
+        raise ForbiddenError("No se puede registrar progreso de otro usuario")
+    return await progress_service.record_progress(progress)
+
+
+@router.post('/bulk', response_model=ProgressBulkResponse)
+async def sync_progress(bulk: ProgressBulkRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Sincronizar en una sola petición los cambios acumulados sin conexión
+    """
+    if bulk.user_id != current_user['uid']:
+        raise ForbiddenError("No se puede registrar progreso de otro usuario")
+    return await progress_service.sync_progress(bulk.user_id, bulk.items)
+
+
+@router.patch('/{topic_id}', response_model=ProgressResponse)
+async def update_progress(topic_id: str, update: ProgressUpdate,
+                          current_user: dict = Depends(get_current_user)):
+    """
+    Actualizar el status, las notas o la confianza de un progreso existente
+    """
+    return await progress_service.update_user_progress(current_user['uid'], topic_id, update)
@@ -0,0 +1,91 @@
+import uuid
+from datetime import datetime, UTC
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core import config
+from app.core.exceptions import ForbiddenError
+from app.middleware.auth import get_current_user
+from app.models.session import SessionRequest, SessionResponse
+from app.services.recommendation_service import generate_daily_session
+from app.services.session_service import open_today_session
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+def _wants_stream(request: Request, stream: bool):
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+async def _collect(session, items):
+    # Añadir a la sesión cada tema según se elige
+    async for item in items:
+        session.topics.append(item)
+        yield item
+
+
+@router.post('/today', response_model=SessionResponse)
+async def create_today_session(
+    session_request: SessionRequest,
+    request: Request,
+    limit: int = Query(5, ge=1, le=100, description='Número máximo de temas en la sesión'),
+    stream: bool = Query(False, description='Enviar cada SessionItem como una línea NDJSON'),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Generar la sesión diaria de estudio del usuario.
+
+    Con `stream=true` (o `Accept: application/x-ndjson`) cada tema se envía
+    en cuanto se elige; los datos de la sesión van en las cabeceras
+    `X-Session-Id` y `X-Session-Created-At`.
+
+    La sesión se genera una vez por día local (`timezone`) y por entradas:
+    las llamadas siguientes devuelven la misma hasta que cambie el progreso.
+    """
+    if session_request.user_id != current_user['uid']:
+        raise ForbiddenError("No se puede generar la sesión de otro usuario")
+
+    # `items` va llenando session.topics; es None si la sesión ya estaba generada
+    if config.session_memo_enabled:
+        session, items = await open_today_session(
+            session_request.user_id, session_request.topic_ids, limit, session_request.timezone)
+    else:
+        session = SessionResponse(session_id=uuid.uuid4().hex, user_id=session_request.user_id,
+                                  created_at=datetime.now(UTC), topics=[])
+        items = _collect(session, generate_daily_session(
+            session_request.user_id, limit, session_request.topic_ids))
+
+    if not _wants_stream(request, stream):
+        if items is not None:
+            async for _ in items:
+                pass
+        return session
+
+    if items is None:
+        items = _iterate(session.topics)
+
+    # Elegir el primer tema antes de enviar cabeceras para que los errores
+    # (p. ej. temas inexistentes) se respondan con su código HTTP
+    first = await anext(items, None)
+
+    async def body():
+        if first is None:
+            return
+        yield first.model_dump_json() + '\n'
+        async for item in items:
+            yield item.model_dump_json() + '\n'
+
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={'X-Session-Id': session.session_id,
+                 'X-Session-Created-At': session.created_at.isoformat()},
+    )
@@ -0,0 +1,104 @@
+import hashlib
+
+from fastapi import APIRouter, Query, Request, Response
+
+from app.core.exceptions import BadRequestError
+from app.core.http_cache import (ResponseCache, choose_encoding, etag_matches, make_etag,
+                                 prepare_response)
+from app.models.topic import (DEFAULT_TOPIC_LIST_FIELDS, TOPIC_LIST_FIELDS, TopicListItem,
+                              TopicListResponse, TopicSearchResponse)
+from app.repositories import topic_repository
+from app.services.search_service import search_topics
+
+router = APIRouter()
+
+# Respuestas de GET /topics ya serializadas y comprimidas, por versión del catálogo
+_responses = ResponseCache()
+
+# Los clientes pueden guardar la respuesta pero deben revalidarla con el ETag
+CACHE_CONTROL = 'no-cache'
+
+
+def get_response_cache():
+    return _responses
+
+
+def _parse_fields(fields):
+    if not fields:
+        return DEFAULT_TOPIC_LIST_FIELDS
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in TOPIC_LIST_FIELDS]
+    if unknown:
+        raise BadRequestError(f"Campos no válidos: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(['id', *requested]))
+
+
+async def _build_body(limit, cursor, category_id, fields):
+    items, next_cursor = await topic_repository.list_topics(
+        limit, start_after=cursor, category_id=category_id, fields=fields)
+    page = TopicListResponse(items=[TopicListItem(**item) for item in items],
+                             next_cursor=next_cursor)
+    return page.model_dump_json(exclude_unset=True).encode()
+
+
+@router.get('', response_model=TopicListResponse, response_model_exclude_unset=True)
+async def list_topics(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200, description='Número máximo de temas por página'),
+    cursor: str | None = Query(None, description='next_cursor de la página anterior'),
+    category_id: str | None = Query(None, description='Filtrar por categoría'),
+    fields: str | None = Query(
+        None, description='Campos separados por comas (id, title, category_id, details)'),
+):
+    """
+    Listar temas paginados por cursor. Por defecto no incluye `details`.
+
+    La respuesta lleva un ETag por codificación y responde 304 a
+    If-None-Match. Con el catálogo en memoria el ETag sale del hash del
+    catálogo: el 304 no lee Firestore mientras la respuesta siga en caché, y
+    el cuerpo se serializa y comprime una sola vez por versión y consulta.
+    Sin catálogo el ETag sale del propio cuerpo, leído de Firestore en cada
+    petición: el 304 solo ahorra la transferencia.
+    """
+    fields = _parse_fields(fields)
+    key = (limit, cursor, category_id, fields)
+    catalog_hash = await topic_repository.get_catalog_hash()
+    if catalog_hash is None:
+        body = await _build_body(limit, cursor, category_id, fields)
+        prepared = prepare_response(make_etag(hashlib.sha256(body).hexdigest()), body)
+    else:
+        prepared = _responses.get(catalog_hash, key)
+        if prepared is None:
+            prepared = prepare_response(make_etag(catalog_hash, *key),
+                                        await _build_body(limit, cursor, category_id, fields))
+            # Solo se guarda si el catálogo no cambió mientras se construía
+            if await topic_repository.get_catalog_hash() == catalog_hash:
+                _responses.put(catalog_hash, key, prepared)
+
+    # La codificación se elige antes de revalidar: el 304 lleva el ETag de esa codificación
+    encoding = choose_encoding(request.headers.get('accept-encoding'), prepared.encoded)
+    body, representation_etag = prepared.for_encoding(encoding)
+    headers = {'Cache-Control': CACHE_CONTROL, 'Vary': 'Accept-Encoding',
+               'ETag': representation_etag}
+    if etag_matches(request.headers.get('if-none-match'), representation_etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+    return Response(body, media_type='application/json', headers=headers)
+
+
+@router.get('/search', response_model=TopicSearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description='Texto a buscar'),
+    limit: int = Query(20, ge=1, le=100, description='Número máximo de resultados'),
+    category_id: str | None = Query(None, description='Filtrar por categoría'),
+):
+    """
+    Buscar temas por título, categoría y detalles.
+
+    Usa un índice invertido en memoria construido desde el catálogo: no
+    distingue acentos ni mayúsculas, cada palabra coincide también como
+    prefijo y los resultados se ordenan por BM25.
+    """
+    return TopicSearchResponse(query=q, items=await search_topics(q, limit, category_id))
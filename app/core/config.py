@@ -1,30 +1,142 @@
 import os
 import logging
-import firebase_admin
-from firebase_admin import credentials, firestore
+import threading
 
 # Obtener path de credenciales desde variable de entorno
 firebase_cred_path = os.getenv('FIREBASE_CREDENTIALS_PATH', 'serviceAccountKey.json')
 
-# Configurar logging
+# Backend de almacenamiento: 'firestore' o 'memory' (desarrollo local, tests, carga)
+storage_backend = os.getenv('STORAGE_BACKEND', 'firestore')
+# JSON opcional (mismo formato que app/seeds/topics.json) para poblar el backend en memoria
+memory_seed_path = os.getenv('MEMORY_SEED_PATH')
+
+# Métricas de latencia y de llamadas al backend (GET /api/v1/monitoring/metrics)
+metrics_enabled = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+# Verificación de tokens de Firebase Auth
+firebase_project_id = os.getenv('FIREBASE_PROJECT_ID')
+auth_token_cache_size = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', '10000'))
+# Comprobar revocación en cada request (lento: consulta Firebase Auth)
+auth_check_revoked = os.getenv('AUTH_CHECK_REVOKED', 'false').lower() == 'true'
+
+# Control de admisión: token buckets por usuario (UID) y global, con un coste
+# por ruta según las operaciones de Firestore que genera (tokens por segundo y ráfaga)
+admission_enabled = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+admission_user_rate = float(os.getenv('ADMISSION_USER_RATE', '5'))
+admission_user_burst = float(os.getenv('ADMISSION_USER_BURST', '30'))
+admission_global_rate = float(os.getenv('ADMISSION_GLOBAL_RATE', '200'))
+admission_global_burst = float(os.getenv('ADMISSION_GLOBAL_BURST', '400'))
+admission_max_users = int(os.getenv('ADMISSION_MAX_USERS', '10000'))
+
+# Write-behind de progreso: agrupa escrituras al mismo documento durante una ventana
+progress_write_behind = os.getenv('PROGRESS_WRITE_BEHIND', 'false').lower() == 'true'
+progress_write_behind_window_ms = int(os.getenv('PROGRESS_WRITE_BEHIND_WINDOW_MS', '500'))
+progress_write_behind_max_pending = int(os.getenv('PROGRESS_WRITE_BEHIND_MAX_PENDING', '1000'))
+
+# Organización del progreso: 'documents' (un documento por usuario y tema en
+# 'progress') o 'user_map' (un documento por usuario en 'user_progress' con un
+# mapa por tema). El write-behind solo se aplica a 'documents'.
+progress_layout = os.getenv('PROGRESS_LAYOUT', 'documents')
+
+# Cola de repaso por usuario mantenida en cada escritura de progreso; las
+# sesiones diarias la leen en lugar de puntuar todo el catálogo
+due_queue_enabled = os.getenv('DUE_QUEUE_ENABLED', 'false').lower() == 'true'
+
+# Sesión diaria memorizada por (usuario, día local, temas pedidos): persistida en
+# 'sessions' y con un LRU del proceso delante (TTL corto para acotar lo que
+# pueden tardar otras réplicas en ver una invalidación)
+session_memo_enabled = os.getenv('SESSION_MEMO_ENABLED', 'true').lower() == 'true'
+session_memo_cache_size = int(os.getenv('SESSION_MEMO_CACHE_SIZE', '1000'))
+session_memo_ttl_seconds = float(os.getenv('SESSION_MEMO_TTL_SECONDS', '60'))
+
+# Cache del catálogo de temas (segundos de vida y listener on_snapshot)
+topics_cache_ttl_seconds = float(os.getenv('TOPICS_CACHE_TTL_SECONDS', '300'))
+topics_cache_listen = os.getenv('TOPICS_CACHE_LISTEN', 'true').lower() == 'true'
+# Con el cache desactivado las lecturas de temas van directas al backend
+topics_cache_enabled = os.getenv('TOPICS_CACHE_ENABLED', 'true').lower() == 'true'
+
+# Prober de dependencias para /ready: qué comprobar, cada cuánto y con qué timeout
+health_checks = [name.strip() for name in os.getenv('HEALTH_CHECKS', 'storage,auth').split(',')
+                 if name.strip()]
+health_check_interval_seconds = float(os.getenv('HEALTH_CHECK_INTERVAL_SECONDS', '15'))
+health_check_timeout_seconds = float(os.getenv('HEALTH_CHECK_TIMEOUT_SECONDS', '3'))
+
+# Timeout de las llamadas HTTP del SDK de Firebase (Auth); sin él una llamada
+# colgada retiene su hilo indefinidamente
+firebase_http_timeout_seconds = float(os.getenv('FIREBASE_HTTP_TIMEOUT_SECONDS', '10'))
+
+# Calentar clientes, catálogo y claves de tokens al arrancar (por defecto: al primer uso)
+startup_warmup = os.getenv('STARTUP_WARMUP', 'false').lower() == 'true'
+
+log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
-# Configurar Firebase
+# Configurar logging
+
+def configure_logging():
+    """
+    Configurar el logging del proceso. Se llama al crear la aplicación o al
+    arrancar un script, no al importar este módulo.
+    """
+    logging.basicConfig(level=log_level,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+# Configurar Firebase (perezoso: nada se importa ni se conecta hasta el primer uso)
+
+_firebase_app = None
+_firestore_client = None
+_firebase_lock = threading.Lock()
+
+
+def get_firebase_app():
+    """
+    App de Firebase del proceso, inicializada la primera vez que se pide
+    """
+    global _firebase_app
+    if _firebase_app is None:
+        with _firebase_lock:
+            if _firebase_app is None:
+                import firebase_admin
+                from firebase_admin import credentials
+
+                try:
+                    if firebase_admin._apps:
+                        _firebase_app = firebase_admin.get_app()
+                    else:
+                        cred = credentials.Certificate(firebase_cred_path)
+                        _firebase_app = firebase_admin.initialize_app(
+                            cred, {'httpTimeout': firebase_http_timeout_seconds})
+                        logger.info("Firebase initialized successfully.")
+                except Exception as e:
+                    logger.error(f"Error initializing Firebase: {e}")
+                    raise
+    return _firebase_app
+
 
 def initialize_firebase():
-    try:
-        if not firebase_admin._apps:
-            cred = credentials.Certificate(firebase_cred_path)
-            firebase_admin.initialize_app(cred)
-            logger.info("Firebase initialized successfully.")
-        else:
-            logger.info("Firebase already initialized.")
-
-        db = firestore.client()
-        return db
-    
-    except Exception as e:
-        logger.error(f"Error initializing Firebase: {e}")
-        raise
\ No newline at end of file
+    """
+    Cliente síncrono de Firestore del proceso (se crea una sola vez)
+    """
+    global _firestore_client
+    if _firestore_client is None:
+        app = get_firebase_app()
+        with _firebase_lock:
+            if _firestore_client is None:
+                from firebase_admin import firestore
+
+                _firestore_client = firestore.client(app)
+    return _firestore_client
+
+
+def close_firebase():
+    """
+    Cerrar el cliente síncrono si llegó a crearse (al apagar la aplicación)
+    """
+    global _firestore_client
+    with _firebase_lock:
+        client, _firestore_client = _firestore_client, None
+    if client is not None:
+        client.close()
@@ -0,0 +1,36 @@
+class AppError(Exception):
+    """
+    Error de la aplicación que se traduce a una respuesta HTTP
+    """
+    status_code = 500
+    # Cabeceras adicionales de la respuesta (p. ej. Retry-After)
+    headers: dict[str, str] | None = None
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class BadRequestError(AppError):
+    status_code = 400
+
+
+class UnauthorizedError(AppError):
+    status_code = 401
+
+
+class ForbiddenError(AppError):
+    status_code = 403
+
+
+class NotFoundError(AppError):
+    status_code = 404
+
+
+class TooManyRequestsError(AppError):
+    status_code = 429
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.headers = {'Retry-After': str(retry_after)}
@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+# Por debajo de este tamaño no compensa comprimir
+MIN_COMPRESS_SIZE = 512
+
+
+@dataclass
+class PreparedResponse:
+    """
+    Cuerpo ya serializado (y comprimido) de una respuesta, con su ETag
+    """
+    etag: str
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def for_encoding(self, encoding):
+        """
+        Devolver (cuerpo, ETag) en la codificación elegida. Cada codificación
+        lleva su propio ETag fuerte, como exige RFC 9110.
+        """
+        if encoding in self.encoded:
+            return self.encoded[encoding], f'"{self.etag}-{encoding}"'
+        return self.body, f'"{self.etag}"'
+
+
+def make_etag(*parts):
+    return hashlib.sha256('\x1f'.join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def prepare_response(etag, body: bytes):
+    """
+    Comprimir el cuerpo una sola vez en todas las codificaciones disponibles
+    """
+    prepared = PreparedResponse(etag, body)
+    if len(body) >= MIN_COMPRESS_SIZE:
+        prepared.encoded['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+        if brotli is not None:
+            prepared.encoded['br'] = brotli.compress(body)
+    return prepared
+
+
+def choose_encoding(accept_encoding, available):
+    """
+    Elegir la codificación preferida entre las aceptadas por el cliente (br > gzip).
+    El comodín `*` no cubre las codificaciones rechazadas expresamente con q=0.
+    """
+    accepted, refused = set(), set()
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.partition(';')
+        quality = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+        else:
+            refused.add(name.strip().lower())
+    for encoding in ('br', 'gzip'):
+        if encoding in refused or encoding not in available:
+            continue
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Comprobar If-None-Match contra el ETag de la representación que se
+    serviría (comparación débil). El ETag de otra codificación no vale: el
+    304 tiene que llevar el mismo ETag que el 200 al que sustituye.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    etag = etag.removeprefix('W/').strip('"')
+    return any(tag.strip().removeprefix('W/').strip('"') == etag
+               for tag in if_none_match.split(','))
+
+
+class ResponseCache:
+    """
+    LRU de respuestas preparadas, válido para una sola versión de los datos:
+    al cambiar la versión se descarta todo
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._version = None
+        self._entries: OrderedDict[object, PreparedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, key):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+            prepared = self._entries.get(key)
+            if prepared is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prepared
+
+    def put(self, version, key, prepared):
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = prepared
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
@@ -0,0 +1,226 @@
+import math
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+# Buckets de latencia en segundos (los mismos que usa prometheus_client por defecto)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets para "operaciones o documentos por request"
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = dict(zip(self.labelnames, key))
+                lines.append(f'{self.name}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por cada combinación de labels: (conteo por bucket, suma, total)
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return series[2] if series is not None else 0
+
+    def sum(self, **labels):
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return series[1] if series is not None else 0.0
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels({**labels, 'le': _format_value(bound)})
+                    lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+                inf_labels = _format_labels({**labels, 'le': '+Inf'})
+                lines.append(f'{self.name}_bucket{inf_labels} {count}')
+                lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(total)}')
+                lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Registro mínimo de métricas con salida en formato de texto de Prometheus
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+def render_gauges(prefix, stats, documentation=''):
+    """
+    Exportar como gauges los valores numéricos de un dict de stats (los
+    contadores de los caches, el verificador de tokens, etc.)
+    """
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, (int, float)):
+            continue
+        name = f'{prefix}_{key}'
+        lines.append(f'# HELP {name} {documentation or key}')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds', 'Latencia de las peticiones HTTP',
+    ('method', 'route', 'status'))
+HTTP_REQUEST_STORAGE_READS = registry.histogram(
+    'http_request_storage_reads', 'Lecturas al backend por petición',
+    ('route',), buckets=COUNT_BUCKETS)
+HTTP_REQUEST_STORAGE_DOCUMENTS = registry.histogram(
+    'http_request_storage_documents_read', 'Documentos leídos del backend por petición',
+    ('route',), buckets=COUNT_BUCKETS)
+HTTP_REQUEST_STORAGE_WRITES = registry.histogram(
+    'http_request_storage_writes', 'Escrituras al backend por petición',
+    ('route',), buckets=COUNT_BUCKETS)
+HTTP_REQUEST_STORAGE_DOCUMENTS_WRITTEN = registry.histogram(
+    'http_request_storage_documents_written', 'Documentos escritos en el backend por petición',
+    ('route',), buckets=COUNT_BUCKETS)
+HTTP_REQUEST_STORAGE_SECONDS = registry.histogram(
+    'http_request_storage_seconds', 'Tiempo de llamadas al backend por petición', ('route',))
+STORAGE_OPERATIONS = registry.counter(
+    'storage_operations_total', 'Llamadas al backend de almacenamiento',
+    ('operation', 'collection'))
+STORAGE_DOCUMENTS_READ = registry.counter(
+    'storage_documents_read_total', 'Documentos devueltos por el backend', ('collection',))
+STORAGE_DOCUMENTS_WRITTEN = registry.counter(
+    'storage_documents_written_total', 'Documentos escritos en el backend', ('collection',))
+STORAGE_OPERATION_DURATION = registry.histogram(
+    'storage_operation_duration_seconds', 'Duración de las llamadas al backend',
+    ('operation',))
+ADMISSION_DECISIONS = registry.counter(
+    'admission_decisions_total', 'Peticiones admitidas o rechazadas por el control de admisión',
+    ('route', 'result'))
+
+
+@dataclass
+class RequestStats:
+    """
+    Lecturas, escrituras y tiempo de backend acumulados durante una petición
+    """
+    reads: int = 0
+    writes: int = 0
+    documents_read: int = 0
+    documents_written: int = 0
+    storage_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar('request_stats', default=None)
+
+
+def start_request_stats():
+    """
+    Empezar a acumular stats para la petición actual; devuelve (stats, token)
+    """
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request_stats(token):
+    _request_stats.reset(token)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
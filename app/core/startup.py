@@ -0,0 +1,60 @@
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Tiempos del arranque: desde que se importa la aplicación hasta que
+    acepta peticiones, paso a paso
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started_at = clock()
+        self.app_created_at: float | None = None
+        self.ready_at: float | None = None
+        self.steps: list[dict] = []
+
+    def mark_app_created(self):
+        self.app_created_at = self.clock()
+
+    @contextmanager
+    def step(self, name):
+        """
+        Medir un paso; si falla se registra el error y se propaga
+        """
+        start = self.clock()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.steps.append({'name': name, 'seconds': round(self.clock() - start, 6),
+                               'error': error})
+
+    def mark_ready(self):
+        self.ready_at = self.clock()
+        summary = ', '.join(f"{s['name']}={s['seconds'] * 1000:.1f}ms" for s in self.steps)
+        report = self.report()
+        logger.info(f"Startup finished in {report['total_seconds'] * 1000:.1f}ms "
+                    f"(imports {report['import_seconds'] * 1000:.1f}ms"
+                    f"{', ' + summary if summary else ''}).")
+
+    def _elapsed(self, until):
+        return round(until - self.started_at, 6) if until is not None else None
+
+    def report(self):
+        return {
+            'import_seconds': self._elapsed(self.app_created_at),
+            'steps': list(self.steps),
+            'total_seconds': self._elapsed(self.ready_at),
+        }
+
+
+# Se crea al importar app.main, que lo importa antes que el resto de la aplicación
+startup_report = StartupReport()
@@ -0,0 +1,147 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# Parámetros habituales de BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Peso de un término que solo coincide por prefijo frente a la coincidencia exacta
+PREFIX_WEIGHT = 0.5
+
+# Longitud mínima para expandir un término de la consulta por prefijo
+MIN_PREFIX_LENGTH = 2
+
+# Palabras vacías del español (y algunas del inglés técnico) que no se indexan
+STOPWORDS = frozenset({
+    'a', 'al', 'como', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'lo', 'los',
+    'o', 'para', 'por', 'que', 'se', 'su', 'sus', 'un', 'una', 'y',
+    'and', 'of', 'or', 'the', 'to',
+})
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """
+    Minúsculas y sin acentos ni diéresis ('Función' -> 'funcion', 'ñ' -> 'n')
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """
+    Términos de un texto normalizado, sin palabras vacías
+    """
+    return [token for token in _TOKEN_RE.findall(normalize(text)) if token not in STOPWORDS]
+
+
+class InvertedIndex:
+    """
+    Índice invertido en memoria con ranking BM25.
+
+    Cada documento es un Counter {término: frecuencia} (el llamador decide
+    cómo ponderar campos). Los documentos se añaden, reemplazan o quitan uno
+    a uno, manteniendo al día las frecuencias de documento y la longitud
+    media, así que no hace falta reconstruir todo cuando cambian unos pocos.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._doc_terms: dict[str, list[str]] = {}
+        self._total_length = 0
+        self._terms: list[str] | None = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._lengths
+
+    def _remove(self, doc_id):
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id):
+            docs = self._postings[term]
+            del docs[doc_id]
+            if not docs:
+                del self._postings[term]
+                self._terms = None
+
+    def upsert(self, doc_id, terms: Counter):
+        with self._lock:
+            self._remove(doc_id)
+            for term, frequency in terms.items():
+                docs = self._postings.get(term)
+                if docs is None:
+                    docs = self._postings[term] = {}
+                    self._terms = None
+                docs[doc_id] = frequency
+            length = sum(terms.values())
+            self._lengths[doc_id] = length
+            self._doc_terms[doc_id] = list(terms)
+            self._total_length += length
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _sorted_terms(self):
+        # El vocabulario ordenado se recalcula solo si cambió
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        return self._terms
+
+    def _expand(self, token, prefix):
+        """
+        Términos del índice que corresponden a un token de la consulta, con su peso
+        """
+        matches = {token: 1.0} if token in self._postings else {}
+        if prefix and len(token) >= MIN_PREFIX_LENGTH:
+            terms = self._sorted_terms()
+            for i in range(bisect.bisect_left(terms, token), len(terms)):
+                if not terms[i].startswith(token):
+                    break
+                matches.setdefault(terms[i], PREFIX_WEIGHT)
+        return matches
+
+    def search(self, query, limit=10, prefix=True, accept=None):
+        """
+        Los `limit` documentos con mayor puntuación BM25 para la consulta, como
+        [(doc_id, score)]. Con `prefix` cada token también coincide con los
+        términos que empiezan por él. `accept(doc_id)` filtra candidatos.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            count = len(self._lengths)
+            if not tokens or not count:
+                return []
+            average_length = self._total_length / count
+            scores: dict[str, float] = {}
+            for token in tokens:
+                for term, weight in self._expand(token, prefix).items():
+                    docs = self._postings[term]
+                    idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for doc_id, frequency in docs.items():
+                        norm = 1 - self.b + self.b * self._lengths[doc_id] / average_length
+                        tf = frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                        scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * tf
+
+        if accept is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if accept(doc_id)}
+        # Desempate estable por doc_id
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def stats(self):
+        return {'documents': len(self._lengths), 'terms': len(self._postings)}
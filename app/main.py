@@ -0,0 +1,105 @@
+# Primero: el reporte de arranque mide desde aquí el tiempo de los imports
+from app.core.startup import startup_report
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import ORJSONResponse
+
+from app.api.endpoints import monitoring, progress, sessions, topics
+from app.core import config
+from app.core.exceptions import AppError
+from app.middleware.admission import admit
+from app.middleware.loaders import RequestLoadersMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.repositories.backends import close_async_backend, get_async_backend
+from app.repositories.progress_repository import get_write_buffer
+from app.repositories.topic_repository import get_catalog
+from app.services.health_service import get_prober
+from app.services.search_service import get_search_index
+
+logger = logging.getLogger(__name__)
+
+
+async def warmup():
+    """
+    Crear de antemano lo que si no se crearía con la primera petición: el
+    cliente de Firestore, el catálogo de temas (y su índice de búsqueda) y
+    las claves de los tokens.
+    Un paso que falla solo se registra; se reintentará en el primer uso.
+    """
+    from app.middleware.auth import get_verifier
+
+    steps = [('storage_backend', get_async_backend)]
+    if config.topics_cache_enabled:
+        steps.append(('topic_catalog', lambda: get_catalog().ensure_loaded()))
+        steps.append(('topic_search_index', get_search_index().sync))
+    steps.append(('token_keys', lambda: asyncio.to_thread(get_verifier().key_store.start)))
+
+    for name, run in steps:
+        try:
+            with startup_report.step(name):
+                result = run()
+                if asyncio.iscoroutine(result):
+                    await result
+        except Exception as e:
+            logger.warning(f"Warmup step '{name}' failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Los clientes se crean en el primer uso, o aquí si se pidió warmup
+    if config.startup_warmup:
+        await warmup()
+    get_prober().start()
+    startup_report.mark_ready()
+    yield
+    from app.middleware.auth import stop_key_rotation
+
+    await get_prober().stop()
+    await asyncio.to_thread(stop_key_rotation)
+    try:
+        # Escribir lo que quede en el buffer de progreso antes de cerrar el cliente;
+        # si no se puede, el error sale del apagado después de cerrar lo demás
+        write_buffer = get_write_buffer()
+        if write_buffer is not None:
+            await write_buffer.close()
+    finally:
+        get_catalog().stop()
+        await close_async_backend()
+        config.close_firebase()
+
+
+config.configure_logging()
+
+app = FastAPI(
+    title='InterviewSprint API',
+    description='API REST para planes de estudio técnicos con repetición espaciada.',
+    version='0.1.0',
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+
+app.add_middleware(RequestLoadersMiddleware)
+if config.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(AppError)
+def handle_app_error(request: Request, exc: AppError):
+    return ORJSONResponse(status_code=exc.status_code, content={'detail': exc.message},
+                          headers=exc.headers)
+
+
+app.include_router(monitoring.router, prefix='/api/v1/monitoring', tags=['monitoring'])
+# Las rutas que escriben o leen mucho de Firestore pasan por el control de admisión
+app.include_router(sessions.router, prefix='/api/v1/sessions', tags=['sessions'],
+                   dependencies=[Depends(admit)])
+app.include_router(progress.router, prefix='/api/v1/progress', tags=['progress'],
+                   dependencies=[Depends(admit)])
+app.include_router(topics.router, prefix='/api/v1/topics', tags=['topics'])
+
+startup_report.mark_app_created()
@@ -0,0 +1,174 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, Request
+
+from app.core import config
+from app.core.exceptions import TooManyRequestsError
+from app.core.metrics import ADMISSION_DECISIONS
+from app.middleware.auth import get_current_user
+
+# Sincronización bulk: lectura del tema y del progreso y escritura por
+# elemento (los batches ahorran RPCs, no operaciones facturadas)
+BULK_BASE_COST = 2
+BULK_ITEM_COST = 2
+
+
+def bulk_cost(payload):
+    items = payload.get('items') if isinstance(payload, dict) else None
+    return BULK_BASE_COST + BULK_ITEM_COST * (len(items) if isinstance(items, list) else 0)
+
+
+# Coste de cada ruta en tokens: aproximadamente las operaciones de Firestore
+# que genera una petición (lecturas de tema y progreso, escrituras, cola de
+# repaso, sesión memorizada). Un coste puede ser una función del cuerpo JSON
+# de la petición. Las demás rutas cuestan DEFAULT_ROUTE_COST. Un coste mayor
+# que la capacidad de un bucket consume el bucket entero.
+ROUTE_COSTS = {
+    ('POST', '/api/v1/sessions/today'): 3,
+    ('POST', '/api/v1/progress'): 4,
+    ('PATCH', '/api/v1/progress/{topic_id}'): 3,
+    ('POST', '/api/v1/progress/bulk'): bulk_cost,
+}
+DEFAULT_ROUTE_COST = 1
+
+
+class TokenBucket:
+    """
+    Token bucket: se rellena a `rate` tokens por segundo hasta `capacity`
+    """
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, cost, now):
+        """
+        Segundos hasta que haya `cost` tokens (0 si ya los hay)
+        """
+        self._refill(now)
+        missing = min(cost, self.capacity) - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else math.inf
+
+    def take(self, cost):
+        self.tokens -= min(cost, self.capacity)
+
+
+class AdmissionController:
+    """
+    Admisión por coste con un bucket por usuario y uno global. Una petición
+    solo consume tokens si ambos los tienen; si no, se rechaza indicando
+    cuánto esperar. Los buckets de usuario se guardan en un LRU acotado (un
+    usuario olvidado vuelve con el bucket lleno).
+    """
+
+    def __init__(self, user_rate=5.0, user_burst=30.0, global_rate=200.0, global_burst=400.0,
+                 max_users=10000, clock=time.monotonic):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_users = max_users
+        self.clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock())
+        self._users: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'admitted': 0, 'rejected_user': 0, 'rejected_global': 0}
+
+    def _user_bucket(self, user_id, now):
+        bucket = self._users.get(user_id)
+        if bucket is None:
+            bucket = self._users[user_id] = TokenBucket(self.user_rate, self.user_burst, now)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return bucket
+
+    def acquire(self, user_id, cost=1):
+        """
+        Intentar admitir una petición. Devuelve (resultado, segundos de espera):
+        'admitted' con 0, o 'rejected_user' / 'rejected_global' con la espera.
+        """
+        with self._lock:
+            now = self.clock()
+            bucket = self._user_bucket(user_id, now)
+            user_wait = bucket.wait_time(cost, now)
+            global_wait = self._global.wait_time(cost, now)
+            if user_wait > 0 or global_wait > 0:
+                result = 'rejected_user' if user_wait >= global_wait else 'rejected_global'
+                self._counters[result] += 1
+                return result, max(user_wait, global_wait)
+            bucket.take(cost)
+            self._global.take(cost)
+            self._counters['admitted'] += 1
+            return 'admitted', 0.0
+
+    def reset(self):
+        with self._lock:
+            self._users.clear()
+            self._global = TokenBucket(self._global.rate, self._global.capacity, self.clock())
+
+    def stats(self):
+        with self._lock:
+            self._global._refill(self.clock())
+            return {**self._counters, 'tracked_users': len(self._users),
+                    'global_tokens': round(self._global.tokens, 2)}
+
+
+_controller = AdmissionController(
+    user_rate=config.admission_user_rate, user_burst=config.admission_user_burst,
+    global_rate=config.admission_global_rate, global_burst=config.admission_global_burst,
+    max_users=config.admission_max_users)
+
+
+def get_admission_controller():
+    return _controller
+
+
+def set_admission_controller(controller: AdmissionController):
+    global _controller
+    _controller = controller
+
+
+def route_cost(method, route, payload=None):
+    cost = ROUTE_COSTS.get((method, route), DEFAULT_ROUTE_COST)
+    return cost(payload) if callable(cost) else cost
+
+
+async def _json_body(request: Request):
+    # FastAPI ya leyó y parseó el cuerpo: request.json() lo devuelve de caché
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+async def admit(request: Request, current_user: dict = Depends(get_current_user)):
+    """
+    Dependency de FastAPI: cobra el coste de la ruta al usuario autenticado
+    antes de ejecutar el endpoint y responde 429 con Retry-After si no hay
+    tokens. Va después de la autenticación, así que el bucket es por UID.
+    """
+    if not config.admission_enabled:
+        return
+    route = getattr(request.scope.get('route'), 'path', request.url.path)
+    payload = None
+    if callable(ROUTE_COSTS.get((request.method, route))):
+        payload = await _json_body(request)
+    result, wait = _controller.acquire(current_user['uid'],
+                                       route_cost(request.method, route, payload))
+    ADMISSION_DECISIONS.inc(route=route, result=result)
+    if result != 'admitted':
+        retry_after = max(1, math.ceil(wait)) if wait != math.inf else 60
+        raise TooManyRequestsError(
+            f"Demasiadas peticiones; vuelve a intentarlo en {retry_after} s", retry_after)
@@ -0,0 +1,378 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core import config
+from app.core.exceptions import UnauthorizedError
+
+logger = logging.getLogger(__name__)
+
+# Certificados con los que Google firma los ID tokens de Firebase
+GOOGLE_CERTS_URL = ('https://www.googleapis.com/robot/v1/metadata/x509/'
+                    'securetoken@system.gserviceaccount.com')
+
+
+class InvalidTokenError(UnauthorizedError):
+    pass
+
+
+class ExpiredTokenError(InvalidTokenError):
+    pass
+
+
+class RevokedTokenError(InvalidTokenError):
+    pass
+
+
+def fetch_google_certs(timeout=5.0):
+    """
+    Descargar los certificados de Google. Devuelve ({kid: pem}, max_age en segundos).
+    """
+    response = requests.get(GOOGLE_CERTS_URL, timeout=timeout)
+    response.raise_for_status()
+    match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+    max_age = int(match.group(1)) if match else 3600
+    return response.json(), max_age
+
+
+def _load_public_key(pem):
+    if 'BEGIN CERTIFICATE' in pem:
+        return x509.load_pem_x509_certificate(pem.encode()).public_key()
+    return load_pem_public_key(pem.encode())
+
+
+class PublicKeyStore:
+    """
+    Copia local de las claves de firma de Google, renovada antes de que venza
+    su max-age. Un `kid` desconocido fuerza una recarga (como mucho una cada
+    `min_refresh_interval` segundos).
+
+    Solo hay una descarga a la vez: mientras las claves no han vencido las
+    peticiones no la esperan y siguen usando las que hay. Tras un fallo no se
+    vuelve a intentar hasta pasado un tiempo que se duplica con cada fallo.
+    """
+
+    def __init__(self, fetcher=fetch_google_certs, refresh_margin=300.0,
+                 min_refresh_interval=60.0, failure_backoff=5.0, max_failure_backoff=300.0,
+                 clock=time.time):
+        self.fetcher = fetcher
+        self.refresh_margin = refresh_margin
+        self.min_refresh_interval = min_refresh_interval
+        self.failure_backoff = failure_backoff
+        self.max_failure_backoff = max_failure_backoff
+        self.clock = clock
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._failures = 0
+        self._retry_at = 0.0
+        self._rotation = None
+        self._stop = threading.Event()
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def refresh(self):
+        certs, max_age = self.fetcher()
+        keys = {kid: _load_public_key(pem) for kid, pem in certs.items()}
+        now = self.clock()
+        with self._lock:
+            self._keys = keys
+            self._expires_at = now + max_age
+            self._last_refresh = now
+            self._failures = 0
+            self._retry_at = 0.0
+        self.refreshes += 1
+        logger.info(f"Loaded {len(keys)} token signing keys (max-age {max_age}s).")
+
+    def _needs_refresh(self, now):
+        if self._rotation is not None and self._rotation.is_alive():
+            return now >= self._expires_at
+        return now >= self._expires_at - self.refresh_margin
+
+    def _refresh_once(self, needed, blocking):
+        """
+        Recargar si `needed(now)` sigue siendo cierto una vez dentro del lock
+        (otro hilo puede haberlo hecho ya). Sin `blocking` no se espera a una
+        descarga en curso. Los errores se registran y activan la espera.
+        """
+        if self.clock() < self._retry_at:
+            return
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return
+        try:
+            if self.clock() < self._retry_at or not needed(self.clock()):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                with self._lock:
+                    self._failures += 1
+                    delay = min(self.failure_backoff * 2 ** (self._failures - 1),
+                                self.max_failure_backoff)
+                    self._retry_at = self.clock() + delay
+                self.refresh_failures += 1
+                logger.warning(f"Could not refresh token signing keys "
+                               f"(next attempt in {delay:.0f}s): {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def _unknown_kid_refresh_needed(self, kid, now):
+        recently = (self._last_refresh is not None
+                    and now - self._last_refresh < self.min_refresh_interval)
+        return kid not in self._keys and not recently
+
+    def get_key(self, kid):
+        now = self.clock()
+        if self._needs_refresh(now):
+            # Con claves aún vigentes no se espera: las usa esta petición
+            self._refresh_once(self._needs_refresh, blocking=now >= self._expires_at)
+            if self.clock() >= self._expires_at:
+                raise InvalidTokenError("Token signing keys are unavailable")
+
+        key = self._keys.get(kid)
+        if key is None and self._unknown_kid_refresh_needed(kid, now):
+            self._refresh_once(lambda now: self._unknown_kid_refresh_needed(kid, now),
+                               blocking=True)
+            key = self._keys.get(kid)
+        if key is None:
+            raise InvalidTokenError("Token signed with an unknown key")
+        return key
+
+    def _rotate_forever(self):
+        while not self._stop.is_set():
+            delay = max(self._expires_at - self.refresh_margin - self.clock(), 0.0)
+            if self._stop.wait(delay):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Could not refresh token signing keys: {e}")
+                self._stop.wait(30.0)
+
+    def start(self):
+        """
+        Precargar las claves y rotarlas en segundo plano
+        """
+        if self._rotation is not None and self._rotation.is_alive():
+            return
+        self.refresh()
+        self._stop.clear()
+        self._rotation = threading.Thread(target=self._rotate_forever, daemon=True,
+                                          name='token-key-rotation')
+        self._rotation.start()
+
+    def stop(self, timeout=5.0):
+        """
+        Parar la rotación en segundo plano y esperar a que termine el hilo
+        """
+        self._stop.set()
+        rotation, self._rotation = self._rotation, None
+        if rotation is not None and rotation.is_alive():
+            rotation.join(timeout)
+            if rotation.is_alive():
+                logger.warning("Token key rotation thread did not stop in time")
+
+
+class TokenCache:
+    """
+    LRU de tokens ya verificados, indexado por el hash del token. Cada
+    entrada vence con el `exp` del propio token.
+    """
+
+    def __init__(self, max_size=10000, clock=time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is not None and claims['exp'] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            if claims is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, claims):
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def check_revoked_with_firebase(claims):
+    """
+    Comprobación lenta de revocación: consulta el usuario en Firebase Auth
+    """
+    from firebase_admin import auth
+
+    config.get_firebase_app()
+    user = auth.get_user(claims['uid'])
+    if user.disabled:
+        raise RevokedTokenError("User disabled")
+    valid_after = user.tokens_valid_after_timestamp
+    if valid_after and claims['iat'] * 1000 < valid_after:
+        raise RevokedTokenError("Token revoked")
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifica ID tokens de Firebase localmente (RS256 con las claves de Google)
+    y guarda el resultado hasta que el token vence
+    """
+
+    def __init__(self, project_id, key_store=None, cache=None, clock=time.time,
+                 leeway=0, revocation_checker=check_revoked_with_firebase):
+        self.project_id = project_id
+        self.key_store = key_store if key_store is not None else PublicKeyStore(clock=clock)
+        self.cache = cache if cache is not None else TokenCache(clock=clock)
+        self.clock = clock
+        self.leeway = leeway
+        self.revocation_checker = revocation_checker
+        self.verified = 0
+        self.failures = 0
+
+    def _decode(self, token):
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError("Malformed token") from e
+        if header.get('alg') != 'RS256' or not header.get('kid'):
+            raise InvalidTokenError("Invalid token header")
+
+        key = self.key_store.get_key(header['kid'])
+        try:
+            claims = jwt.decode(
+                token, key, algorithms=['RS256'], audience=self.project_id,
+                issuer=f'https://securetoken.google.com/{self.project_id}',
+                options={'require': ['exp', 'iat', 'sub'],
+                         'verify_exp': False, 'verify_iat': False},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid token: {e}") from e
+
+        now = self.clock()
+        if claims['exp'] <= now - self.leeway:
+            raise ExpiredTokenError("Token expired")
+        if claims['iat'] > now + self.leeway:
+            raise InvalidTokenError("Token issued in the future")
+        if claims.get('auth_time', 0) > now + self.leeway:
+            raise InvalidTokenError("Token auth_time is in the future")
+        sub = claims['sub']
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise InvalidTokenError("Invalid token subject")
+
+        claims['uid'] = sub
+        return claims
+
+    def verify(self, token, check_revoked=False):
+        key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self.cache.get(key)
+        if claims is None:
+            try:
+                claims = self._decode(token)
+            except InvalidTokenError:
+                self.failures += 1
+                raise
+            self.cache.put(key, claims)
+            self.verified += 1
+
+        if check_revoked:
+            self.revocation_checker(claims)
+        return claims
+
+    def stats(self):
+        return {
+            'verified': self.verified,
+            'failures': self.failures,
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+            'cache_evictions': self.cache.evictions,
+            'cache_size': len(self.cache),
+            'key_refreshes': self.key_store.refreshes,
+            'key_refresh_failures': self.key_store.refresh_failures,
+        }
+
+
+_verifier: FirebaseTokenVerifier | None = None
+_verifier_lock = threading.Lock()
+
+
+def _resolve_project_id():
+    if config.firebase_project_id:
+        return config.firebase_project_id
+    with open(config.firebase_cred_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['project_id']
+
+
+def get_verifier() -> FirebaseTokenVerifier:
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = FirebaseTokenVerifier(
+                    _resolve_project_id(),
+                    cache=TokenCache(max_size=config.auth_token_cache_size))
+    return _verifier
+
+
+def set_verifier(verifier: FirebaseTokenVerifier | None):
+    """
+    Reemplazar el verificador del proceso (tests, pruebas de carga)
+    """
+    global _verifier
+    _verifier = verifier
+
+
+def stop_key_rotation():
+    """
+    Parar la rotación de claves del verificador del proceso, si se llegó a crear
+    """
+    if _verifier is not None:
+        _verifier.key_store.stop()
+
+
+def verify_firebase_token(token, check_revoked=None):
+    """
+    Validar un ID token de Firebase y devolver sus claims (incluye 'uid')
+    """
+    if check_revoked is None:
+        check_revoked = config.auth_check_revoked
+    return get_verifier().verify(token, check_revoked=check_revoked)
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials | None = Depends(_bearer)):
+    """
+    Dependency de FastAPI: claims del usuario autenticado
+    """
+    if credentials is None:
+        raise UnauthorizedError("Missing bearer token")
+    return verify_firebase_token(credentials.credentials)
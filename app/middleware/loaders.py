@@ -0,0 +1,22 @@
+from app.repositories.loaders import end_request_loaders, start_request_loaders
+
+
+class RequestLoadersMiddleware:
+    """
+    Middleware ASGI: loaders nuevos por petición, para que las cargas de
+    temas y progreso se agrupen y se reutilicen solo dentro de ella
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        _, token = start_request_loaders()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request_loaders(token)
@@ -0,0 +1,50 @@
+import time
+
+from app.core.metrics import (HTTP_REQUEST_DURATION, HTTP_REQUEST_STORAGE_DOCUMENTS,
+                              HTTP_REQUEST_STORAGE_DOCUMENTS_WRITTEN,
+                              HTTP_REQUEST_STORAGE_READS, HTTP_REQUEST_STORAGE_SECONDS,
+                              HTTP_REQUEST_STORAGE_WRITES, end_request_stats,
+                              start_request_stats)
+
+# Etiqueta para las peticiones que no corresponden a ninguna ruta (404)
+UNMATCHED_ROUTE = 'unmatched'
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: latencia por ruta (la plantilla, no la URL) y status, y
+    lecturas, escrituras y tiempo de backend por petición
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        stats, token = start_request_stats()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            end_request_stats(token)
+            # El router de FastAPI deja la ruta resuelta en el scope
+            route = getattr(scope.get('route'), 'path', UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.observe(elapsed, method=scope['method'], route=route,
+                                          status=status_code)
+            HTTP_REQUEST_STORAGE_READS.observe(stats.reads, route=route)
+            HTTP_REQUEST_STORAGE_DOCUMENTS.observe(stats.documents_read, route=route)
+            HTTP_REQUEST_STORAGE_WRITES.observe(stats.writes, route=route)
+            HTTP_REQUEST_STORAGE_DOCUMENTS_WRITTEN.observe(stats.documents_written, route=route)
+            HTTP_REQUEST_STORAGE_SECONDS.observe(stats.storage_seconds, route=route)
@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+from pydantic import BaseModel
+
+from app.models.progress import ProgressResponse
+from app.models.session import SessionItem
+from app.models.topic import TopicResponse
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: type[BaseModel]):
+    """
+    (todos los campos, campos obligatorios) de un modelo, calculados una vez
+    """
+    fields = model.model_fields
+    return tuple(fields), frozenset(name for name, info in fields.items() if info.is_required())
+
+
+def from_document(model: type[BaseModel], doc_id, data):
+    """
+    Construir un modelo de respuesta desde un documento de nuestro propio
+    almacén sin volver a validarlo (los datos ya se validaron al escribirse).
+
+    Solo se copian los campos del modelo. Si falta alguno obligatorio el
+    documento no es de fiar y se valida completo, para fallar con un error claro.
+    """
+    names, required = _model_fields(model)
+    values = {name: data[name] for name in names if name in data}
+    values['id'] = doc_id
+    if not required <= values.keys():
+        return model(**values)
+    return model.model_construct(**values)
+
+
+def topic_from_document(doc_id, data) -> TopicResponse:
+    return from_document(TopicResponse, doc_id, data)
+
+
+def progress_from_document(doc_id, data) -> ProgressResponse:
+    return from_document(ProgressResponse, doc_id, data)
+
+
+def session_item_from_topic(topic: TopicResponse) -> SessionItem:
+    """
+    SessionItem a partir de un tema ya validado
+    """
+    return SessionItem.model_construct(topic_id=topic.id, title=topic.title,
+                                       category_id=topic.category_id, details=topic.details)
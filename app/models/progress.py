@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
@@ -7,6 +7,8 @@ class ProgressBase(BaseModel):
     topic_id: str = Field(..., title='ID del tema', max_length=100)
     status: str = Field(..., title='Estado del progreso', max_length=50)
     notes: str = Field(default='', title='Notas adicionales', max_length=500)
+    confidence_level: int = Field(
+        default=1, title='Nivel de confianza (1 = bajo, 5 = alto)', ge=1, le=5)
 
 
 class ProgressCreate(ProgressBase):
@@ -17,12 +19,56 @@ class ProgressUpdate(BaseModel):
     status: str | None = Field(
         None, title='Estado del progreso', max_length=50)
     notes: str | None = Field(None, title='Notas adicionales', max_length=500)
+    confidence_level: int | None = Field(
+        None, title='Nivel de confianza (1 = bajo, 5 = alto)', ge=1, le=5)
 
 
 class ProgressResponse(ProgressBase):
     id: str = Field(..., title='ID del progreso')
     created_at: datetime = Field(..., title='Fecha de creación')
     updated_at: datetime = Field(..., title='Última actualización')
+    # Campos que mantiene el servidor en cada escritura (no los envía el cliente)
+    streak: int = Field(
+        default=0, title='Días consecutivos estudiando el tema', ge=0)
+    last_reviewed_at: datetime | None = Field(
+        default=None, title='Última revisión del tema')
+    study_days: int = Field(
+        default=0, title='Bitmap de días de estudio (bit 0 = study_anchor, bit i = i días antes)',
+        ge=0)
+    study_anchor: str | None = Field(
+        default=None, title='Último día de estudio (YYYY-MM-DD, UTC)')
+    longest_streak: int = Field(default=0, title='Racha más larga registrada', ge=0)
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Límite de elementos por sincronización (un batch de Firestore admite 500 escrituras)
+MAX_BULK_ITEMS = 500
+
+
+class ProgressBulkItem(ProgressUpdate):
+    topic_id: str = Field(..., title='ID del tema', max_length=100)
+
+
+class ProgressBulkRequest(BaseModel):
+    user_id: str = Field(..., title='ID del usuario', max_length=100)
+    items: list[ProgressBulkItem] = Field(
+        ..., title='Cambios de progreso pendientes', min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class ProgressBulkResult(BaseModel):
+    index: int = Field(..., title='Posición del elemento en la petición')
+    topic_id: str = Field(..., title='ID del tema')
+    result: str = Field(..., title='created, updated o error')
+    error: str | None = Field(default=None, title='Motivo del error')
+    progress: ProgressResponse | None = Field(
+        default=None, title='Progreso resultante')
+
+
+class ProgressBulkResponse(BaseModel):
+    user_id: str = Field(..., title='ID del usuario')
+    created: int = Field(default=0, title='Progresos creados')
+    updated: int = Field(default=0, title='Progresos actualizados')
+    failed: int = Field(default=0, title='Elementos con error')
+    results: list[ProgressBulkResult] = Field(
+        default_factory=list, title='Resultado por elemento')
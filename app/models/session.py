@@ -1,10 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
 class SessionRequest(BaseModel):
     user_id: str = Field(..., title='ID del usuario', max_length=100)
     topic_ids: list[str] = Field(..., title='IDs de los temas para la sesión')
+    timezone: str | None = Field(
+        default=None, title='Zona horaria IANA del usuario para el día de la sesión (UTC por defecto)',
+        max_length=64)
 
 
 class SessionItem(BaseModel):
@@ -21,5 +24,4 @@ class SessionResponse(BaseModel):
     topics: list[SessionItem] = Field(
         default_factory=list, title='Temas de la sesión')
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
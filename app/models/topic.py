@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class TopicBase(BaseModel):
@@ -22,5 +22,34 @@ class TopicCreate(TopicBase):
 class TopicResponse(TopicBase):
     id: str = Field(..., title='ID del tema', examples=['js-tipos-de-datos'])
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Campos que admite la proyección de GET /topics (el id siempre se incluye)
+TOPIC_LIST_FIELDS = ('id', 'title', 'category_id', 'details')
+DEFAULT_TOPIC_LIST_FIELDS = ('id', 'title', 'category_id')
+
+
+class TopicListItem(BaseModel):
+    id: str = Field(..., title='ID del tema')
+    title: str | None = Field(default=None, title='Titulo del tema')
+    category_id: str | None = Field(default=None, title='ID de la categoria')
+    details: list[str] | None = Field(default=None, title='Detalles del tema')
+
+
+class TopicListResponse(BaseModel):
+    items: list[TopicListItem] = Field(default_factory=list, title='Temas de la página')
+    next_cursor: str | None = Field(
+        default=None, title='ID del último tema; se pasa como cursor para la página siguiente')
+
+
+class TopicSearchItem(BaseModel):
+    id: str = Field(..., title='ID del tema')
+    title: str = Field(..., title='Titulo del tema')
+    category_id: str = Field(..., title='ID de la categoria')
+    score: float = Field(..., title='Puntuación BM25 de la coincidencia')
+
+
+class TopicSearchResponse(BaseModel):
+    query: str = Field(..., title='Consulta recibida')
+    items: list[TopicSearchItem] = Field(default_factory=list, title='Temas encontrados')
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
 
 class UserBase(BaseModel):
@@ -14,5 +14,4 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     id: str = Field(..., title='ID del usuario')
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
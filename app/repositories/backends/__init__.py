@@ -0,0 +1,124 @@
+import json
+import logging
+import threading
+
+from app.core import config
+from app.repositories.backends.base import (DELETE_FIELD, DOCUMENT_ID, MAX_BATCH_SIZE,
+                                            AsyncStorageBackend, Document,
+                                            DocumentNotFoundError, StorageBackend, WriteOp)
+from app.repositories.backends.instrumented import InstrumentedBackend
+from app.repositories.backends.memory_backend import AsyncMemoryBackend, MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+_backend: StorageBackend | None = None
+_async_backend: AsyncStorageBackend | None = None
+_backend_lock = threading.RLock()
+
+
+def _load_memory_seed(backend, path):
+    """
+    Poblar el backend en memoria con categorias y topics desde un JSON
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    for collection in ('categories', 'topics'):
+        for record in data.get(collection, []):
+            fields = {k: v for k, v in record.items() if k != 'id'}
+            backend.set(collection, record['id'], fields)
+    logger.info(f"Memory backend seeded from {path}.")
+
+
+def create_backend(name):
+    """
+    Construir el backend configurado ('firestore' o 'memory')
+    """
+    if name == 'memory':
+        backend = MemoryBackend()
+        if config.memory_seed_path:
+            _load_memory_seed(backend, config.memory_seed_path)
+        return backend
+    if name == 'firestore':
+        from app.repositories.backends.firestore_backend import FirestoreBackend
+        return FirestoreBackend(config.initialize_firebase())
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def create_async_backend(name):
+    """
+    Construir el backend async configurado. En modo 'memory' comparte los
+    datos con el backend síncrono del proceso.
+    """
+    if name == 'memory':
+        return AsyncMemoryBackend(get_backend())
+    if name == 'firestore':
+        from google.cloud.firestore import AsyncClient
+
+        from app.repositories.backends.firestore_backend import AsyncFirestoreBackend
+        firebase_app = config.get_firebase_app()
+        client = AsyncClient(project=firebase_app.project_id,
+                             credentials=firebase_app.credential.get_credential())
+        return AsyncFirestoreBackend(client, sync_factory=get_backend)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def get_backend() -> StorageBackend:
+    """
+    Devolver el backend síncrono del proceso (scripts y listeners), creándolo la primera vez
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(config.storage_backend)
+                logger.info(f"Storage backend: {config.storage_backend}.")
+    return _backend
+
+
+def set_backend(backend: StorageBackend | None):
+    """
+    Reemplazar el backend del proceso (tests, benchmarks)
+    """
+    global _backend
+    _backend = backend
+
+
+def get_async_backend() -> AsyncStorageBackend:
+    """
+    Devolver el backend async que usa la API, creándolo la primera vez
+    """
+    global _async_backend
+    if _async_backend is None:
+        with _backend_lock:
+            if _async_backend is None:
+                backend = create_async_backend(config.storage_backend)
+                if config.metrics_enabled:
+                    backend = InstrumentedBackend(backend)
+                _async_backend = backend
+    return _async_backend
+
+
+def set_async_backend(backend: AsyncStorageBackend | None):
+    global _async_backend
+    _async_backend = backend
+
+
+async def close_async_backend():
+    """
+    Cerrar el backend async (al apagar la aplicación)
+    """
+    global _async_backend
+    if _async_backend is not None:
+        await _async_backend.close()
+        _async_backend = None
+
+
+__all__ = [
+    'DELETE_FIELD', 'DOCUMENT_ID', 'MAX_BATCH_SIZE', 'AsyncMemoryBackend',
+    'AsyncStorageBackend', 'Document', 'DocumentNotFoundError', 'InstrumentedBackend',
+    'MemoryBackend',
+    'StorageBackend', 'WriteOp', 'close_async_backend', 'create_async_backend',
+    'create_backend', 'get_async_backend', 'get_backend', 'set_async_backend',
+    'set_backend',
+]
@@ -0,0 +1,194 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator
+
+# Firestore admite como máximo 500 operaciones por batch
+MAX_BATCH_SIZE = 500
+
+# Campo especial para ordenar por document ID
+DOCUMENT_ID = '__name__'
+
+
+class _DeleteField:
+    def __repr__(self):
+        return 'DELETE_FIELD'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+# Sentinela para borrar un campo en update() (equivale a firestore.DELETE_FIELD)
+DELETE_FIELD = _DeleteField()
+
+
+class DocumentNotFoundError(Exception):
+    """
+    El documento no existe (por ejemplo, al hacer update())
+    """
+
+    def __init__(self, collection, doc_id):
+        super().__init__(f"Document not found: {collection}/{doc_id}")
+        self.collection = collection
+        self.doc_id = doc_id
+
+
+@dataclass(frozen=True)
+class Document:
+    id: str
+    data: dict
+
+
+@dataclass(frozen=True)
+class WriteOp:
+    kind: str  # 'set', 'update' o 'delete'
+    collection: str
+    doc_id: str
+    data: dict = field(default_factory=dict)
+    merge: bool = False
+
+
+class StorageBackend(ABC):
+    """
+    Interfaz de almacenamiento usada por los repositorios.
+
+    Las consultas siguen la semántica de Firestore: filtros de igualdad
+    ('==' e 'in'), order_by sobre un campo (los documentos sin ese campo se
+    excluyen), desempate por document ID, limit y cursor start_after con el
+    ID del último documento de la página anterior.
+    """
+
+    @abstractmethod
+    def get(self, collection: str, doc_id: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def get_many(self, collection: str, doc_ids: list[str]) -> dict[str, dict]:
+        """
+        Leer varios documentos; los que no existen se omiten del resultado
+        """
+
+    @abstractmethod
+    def set(self, collection: str, doc_id: str, data: dict, merge: bool = False) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, collection: str, doc_id: str, data: dict) -> None:
+        """
+        Actualizar campos (admite rutas con punto, p. ej. 'topics.js-closures').
+        Lanza DocumentNotFoundError si el documento no existe.
+        """
+
+    @abstractmethod
+    def delete(self, collection: str, doc_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def query(self, collection: str, filters=(), order_by: str | None = None,
+              descending: bool = False, limit: int | None = None,
+              start_after: str | None = None, select: list[str] | None = None) -> list[Document]:
+        ...
+
+    @abstractmethod
+    def stream(self, collection: str) -> Iterator[Document]:
+        ...
+
+    @abstractmethod
+    def count(self, collection: str, filters=()) -> int:
+        ...
+
+    @abstractmethod
+    def collections(self) -> list[str]:
+        """
+        Nombres de las colecciones de primer nivel
+        """
+
+    @abstractmethod
+    def write_batch(self, operations: list[WriteOp]) -> None:
+        """
+        Aplicar hasta MAX_BATCH_SIZE escrituras de forma atómica
+        """
+
+    @abstractmethod
+    def transform(self, collection: str, doc_id: str,
+                  fn: Callable[[dict | None], dict | None]) -> dict | None:
+        """
+        Leer, modificar y escribir un documento de forma atómica: `fn` recibe
+        los datos actuales (None si no existe) y devuelve los campos a escribir
+        con set con merge, o None para no escribir. Si el documento cambia
+        entre medias se reintenta, así que `fn` no debe tener efectos
+        secundarios. Devuelve lo que devolvió `fn` en el intento que se aplicó.
+        """
+
+    @abstractmethod
+    def watch(self, collection: str, callback: Callable[[list[Document]], Any]):
+        """
+        Llamar a `callback` con la colección completa cada vez que cambie.
+        Devuelve un handle con `is_active` y `unsubscribe()`.
+        """
+
+
+class AsyncStorageBackend(ABC):
+    """
+    Versión async de StorageBackend, usada por la API. Misma semántica de
+    consultas; `stream()` es un iterador async y `watch()` sigue siendo
+    síncrono (los listeners corren en su propio hilo).
+    """
+
+    @abstractmethod
+    async def get(self, collection: str, doc_id: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    async def get_many(self, collection: str, doc_ids: list[str]) -> dict[str, dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, collection: str, doc_id: str, data: dict, merge: bool = False) -> None:
+        ...
+
+    @abstractmethod
+    async def update(self, collection: str, doc_id: str, data: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, collection: str, doc_id: str) -> None:
+        ...
+
+    @abstractmethod
+    async def query(self, collection: str, filters=(), order_by: str | None = None,
+                    descending: bool = False, limit: int | None = None,
+                    start_after: str | None = None, select: list[str] | None = None) -> list[Document]:
+        ...
+
+    @abstractmethod
+    def stream(self, collection: str) -> AsyncIterator[Document]:
+        ...
+
+    @abstractmethod
+    async def count(self, collection: str, filters=()) -> int:
+        ...
+
+    @abstractmethod
+    async def collections(self) -> list[str]:
+        ...
+
+    @abstractmethod
+    async def write_batch(self, operations: list[WriteOp]) -> None:
+        ...
+
+    @abstractmethod
+    async def transform(self, collection: str, doc_id: str,
+                        fn: Callable[[dict | None], dict | None]) -> dict | None:
+        ...
+
+    @abstractmethod
+    def watch(self, collection: str, callback: Callable[[list[Document]], Any]):
+        ...
+
+    async def close(self) -> None:
+        """
+        Liberar conexiones (se llama al apagar la aplicación)
+        """
@@ -0,0 +1,245 @@
+from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import async_transactional
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.repositories.backends.base import (DELETE_FIELD, DOCUMENT_ID, MAX_BATCH_SIZE,
+                                            AsyncStorageBackend, Document,
+                                            DocumentNotFoundError, StorageBackend)
+
+
+def _to_firestore(data):
+    """
+    Traducir los sentinelas del backend a los de Firestore
+    """
+    return {k: firestore.DELETE_FIELD if v is DELETE_FIELD else v for k, v in data.items()}
+
+
+def _build_query(collection_ref, filters=(), order_by=None, descending=False,
+                 limit=None, start_after=None, cursor_snapshot=None, select=None):
+    """
+    Construir la consulta; válido para colecciones del cliente síncrono y async.
+    Si se ordena por un campo, el cursor necesita el snapshot del documento.
+    """
+    query = collection_ref
+    for field_path, op, value in filters:
+        query = query.where(filter=FieldFilter(field_path, op, value))
+
+    direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+    if order_by not in (None, DOCUMENT_ID):
+        query = query.order_by(order_by, direction=direction)
+    if order_by is not None or start_after is not None:
+        query = query.order_by(DOCUMENT_ID, direction=direction)
+
+    if start_after is not None:
+        if order_by in (None, DOCUMENT_ID):
+            query = query.start_after({DOCUMENT_ID: start_after})
+        else:
+            if cursor_snapshot is None or not cursor_snapshot.exists:
+                raise ValueError(f"Cursor document not found: {start_after}")
+            query = query.start_after(cursor_snapshot)
+
+    if select is not None:
+        query = query.select(select)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def _needs_cursor_snapshot(order_by, start_after):
+    return start_after is not None and order_by not in (None, DOCUMENT_ID)
+
+
+def _check_batch_size(operations):
+    if len(operations) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch admits at most {MAX_BATCH_SIZE} writes")
+
+
+def _add_to_batch(db, batch, op):
+    ref = db.collection(op.collection).document(op.doc_id)
+    if op.kind == 'set':
+        batch.set(ref, _to_firestore(op.data), merge=op.merge)
+    elif op.kind == 'update':
+        batch.update(ref, _to_firestore(op.data))
+    elif op.kind == 'delete':
+        batch.delete(ref)
+    else:
+        raise ValueError(f"Unsupported write kind: {op.kind}")
+
+
+class FirestoreBackend(StorageBackend):
+    """
+    Backend sobre el cliente síncrono de Firestore
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, collection, doc_id):
+        snapshot = self.db.collection(collection).document(doc_id).get()
+        return snapshot.to_dict() if snapshot.exists else None
+
+    def get_many(self, collection, doc_ids):
+        collection_ref = self.db.collection(collection)
+        refs = [collection_ref.document(doc_id) for doc_id in dict.fromkeys(doc_ids)]
+        if not refs:
+            return {}
+        return {snap.id: snap.to_dict() for snap in self.db.get_all(refs) if snap.exists}
+
+    def _query(self, collection, filters=(), order_by=None, descending=False,
+               limit=None, start_after=None, select=None):
+        collection_ref = self.db.collection(collection)
+        cursor_snapshot = None
+        if _needs_cursor_snapshot(order_by, start_after):
+            cursor_snapshot = collection_ref.document(start_after).get()
+        return _build_query(collection_ref, filters, order_by, descending, limit,
+                            start_after, cursor_snapshot, select)
+
+    def query(self, collection, filters=(), order_by=None, descending=False,
+              limit=None, start_after=None, select=None):
+        query = self._query(collection, filters, order_by, descending,
+                            limit, start_after, select)
+        return [Document(snap.id, snap.to_dict() or {}) for snap in query.stream()]
+
+    def stream(self, collection):
+        for snap in self.db.collection(collection).stream():
+            yield Document(snap.id, snap.to_dict() or {})
+
+    def count(self, collection, filters=()):
+        result = self._query(collection, filters).count().get()
+        return int(result[0][0].value)
+
+    def collections(self):
+        return sorted(collection.id for collection in self.db.collections())
+
+    def write_batch(self, operations):
+        _check_batch_size(operations)
+        batch = self.db.batch()
+        for op in operations:
+            _add_to_batch(self.db, batch, op)
+        batch.commit()
+
+    def set(self, collection, doc_id, data, merge=False):
+        self.db.collection(collection).document(doc_id).set(_to_firestore(data), merge=merge)
+
+    def update(self, collection, doc_id, data):
+        try:
+            self.db.collection(collection).document(doc_id).update(_to_firestore(data))
+        except NotFound as e:
+            raise DocumentNotFoundError(collection, doc_id) from e
+
+    def delete(self, collection, doc_id):
+        self.db.collection(collection).document(doc_id).delete()
+
+    def transform(self, collection, doc_id, fn):
+        ref = self.db.collection(collection).document(doc_id)
+
+        # La transacción se reintenta entera si el documento cambia
+        @firestore.transactional
+        def run(transaction):
+            snapshot = ref.get(transaction=transaction)
+            update = fn(snapshot.to_dict() if snapshot.exists else None)
+            if update is not None:
+                transaction.set(ref, _to_firestore(update), merge=True)
+            return update
+
+        return run(self.db.transaction())
+
+    def watch(self, collection, callback):
+        def on_snapshot(col_snapshot, changes, read_time):
+            callback([Document(snap.id, snap.to_dict() or {}) for snap in col_snapshot])
+
+        return self.db.collection(collection).on_snapshot(on_snapshot)
+
+
+class AsyncFirestoreBackend(AsyncStorageBackend):
+    """
+    Backend sobre google.cloud.firestore.AsyncClient. Los listeners
+    (on_snapshot) solo existen en el cliente síncrono, así que watch() usa
+    `sync_factory` para crear un FirestoreBackend cuando hace falta.
+    """
+
+    def __init__(self, db, sync_factory=None):
+        self.db = db
+        self._sync_factory = sync_factory
+        self._sync = None
+
+    async def get(self, collection, doc_id):
+        snapshot = await self.db.collection(collection).document(doc_id).get()
+        return snapshot.to_dict() if snapshot.exists else None
+
+    async def get_many(self, collection, doc_ids):
+        collection_ref = self.db.collection(collection)
+        refs = [collection_ref.document(doc_id) for doc_id in dict.fromkeys(doc_ids)]
+        if not refs:
+            return {}
+        return {snap.id: snap.to_dict() async for snap in self.db.get_all(refs) if snap.exists}
+
+    async def _query(self, collection, filters=(), order_by=None, descending=False,
+                     limit=None, start_after=None, select=None):
+        collection_ref = self.db.collection(collection)
+        cursor_snapshot = None
+        if _needs_cursor_snapshot(order_by, start_after):
+            cursor_snapshot = await collection_ref.document(start_after).get()
+        return _build_query(collection_ref, filters, order_by, descending, limit,
+                            start_after, cursor_snapshot, select)
+
+    async def query(self, collection, filters=(), order_by=None, descending=False,
+                    limit=None, start_after=None, select=None):
+        query = await self._query(collection, filters, order_by, descending,
+                                  limit, start_after, select)
+        return [Document(snap.id, snap.to_dict() or {}) async for snap in query.stream()]
+
+    async def stream(self, collection):
+        async for snap in self.db.collection(collection).stream():
+            yield Document(snap.id, snap.to_dict() or {})
+
+    async def count(self, collection, filters=()):
+        query = await self._query(collection, filters)
+        result = await query.count().get()
+        return int(result[0][0].value)
+
+    async def collections(self):
+        return sorted([collection.id async for collection in self.db.collections()])
+
+    async def write_batch(self, operations):
+        _check_batch_size(operations)
+        batch = self.db.batch()
+        for op in operations:
+            _add_to_batch(self.db, batch, op)
+        await batch.commit()
+
+    async def set(self, collection, doc_id, data, merge=False):
+        await self.db.collection(collection).document(doc_id).set(_to_firestore(data), merge=merge)
+
+    async def update(self, collection, doc_id, data):
+        try:
+            await self.db.collection(collection).document(doc_id).update(_to_firestore(data))
+        except NotFound as e:
+            raise DocumentNotFoundError(collection, doc_id) from e
+
+    async def delete(self, collection, doc_id):
+        await self.db.collection(collection).document(doc_id).delete()
+
+    async def transform(self, collection, doc_id, fn):
+        ref = self.db.collection(collection).document(doc_id)
+
+        @async_transactional
+        async def run(transaction):
+            snapshot = await ref.get(transaction=transaction)
+            update = fn(snapshot.to_dict() if snapshot.exists else None)
+            if update is not None:
+                transaction.set(ref, _to_firestore(update), merge=True)
+            return update
+
+        return await run(self.db.transaction())
+
+    def watch(self, collection, callback):
+        if self._sync is None:
+            if self._sync_factory is None:
+                raise RuntimeError("Listeners need a synchronous Firestore client")
+            self._sync = self._sync_factory()
+        return self._sync.watch(collection, callback)
+
+    async def close(self):
+        self.db.close()
@@ -0,0 +1,124 @@
+import time
+from collections import Counter as CollectionCounter
+
+from app.core.metrics import (STORAGE_DOCUMENTS_READ, STORAGE_DOCUMENTS_WRITTEN,
+                              STORAGE_OPERATION_DURATION, STORAGE_OPERATIONS,
+                              current_request_stats)
+from app.repositories.backends.base import AsyncStorageBackend
+
+
+class InstrumentedBackend(AsyncStorageBackend):
+    """
+    Envoltorio de un backend async que cuenta llamadas, documentos leídos y
+    escritos y tiempo de RPC, tanto en las métricas globales como en las stats
+    de la petición en curso (para detectar patrones N+1)
+    """
+
+    def __init__(self, inner: AsyncStorageBackend):
+        self.inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def _record_read(self, operation, collection, documents, elapsed):
+        STORAGE_OPERATIONS.inc(operation=operation, collection=collection)
+        STORAGE_DOCUMENTS_READ.inc(documents, collection=collection)
+        STORAGE_OPERATION_DURATION.observe(elapsed, operation=operation)
+        stats = current_request_stats()
+        if stats is not None:
+            stats.reads += 1
+            stats.documents_read += documents
+            stats.storage_seconds += elapsed
+
+    def _record_write(self, operation, written, elapsed):
+        for collection, documents in written.items():
+            STORAGE_OPERATIONS.inc(operation=operation, collection=collection)
+            STORAGE_DOCUMENTS_WRITTEN.inc(documents, collection=collection)
+        STORAGE_OPERATION_DURATION.observe(elapsed, operation=operation)
+        stats = current_request_stats()
+        if stats is not None:
+            stats.writes += 1
+            stats.documents_written += sum(written.values())
+            stats.storage_seconds += elapsed
+
+    async def get(self, collection, doc_id):
+        start = time.perf_counter()
+        data = await self.inner.get(collection, doc_id)
+        self._record_read('get', collection, int(data is not None), time.perf_counter() - start)
+        return data
+
+    async def get_many(self, collection, doc_ids):
+        start = time.perf_counter()
+        found = await self.inner.get_many(collection, doc_ids)
+        self._record_read('get_many', collection, len(found), time.perf_counter() - start)
+        return found
+
+    async def query(self, collection, filters=(), order_by=None, descending=False,
+                    limit=None, start_after=None, select=None):
+        start = time.perf_counter()
+        docs = await self.inner.query(collection, filters, order_by, descending,
+                                      limit, start_after, select)
+        self._record_read('query', collection, len(docs), time.perf_counter() - start)
+        return docs
+
+    async def stream(self, collection):
+        start = time.perf_counter()
+        documents = 0
+        try:
+            async for doc in self.inner.stream(collection):
+                documents += 1
+                yield doc
+        finally:
+            self._record_read('stream', collection, documents, time.perf_counter() - start)
+
+    async def count(self, collection, filters=()):
+        start = time.perf_counter()
+        total = await self.inner.count(collection, filters)
+        # Una agregación se factura como una lectura
+        self._record_read('count', collection, 1, time.perf_counter() - start)
+        return total
+
+    async def collections(self):
+        start = time.perf_counter()
+        names = await self.inner.collections()
+        self._record_read('collections', '*', 0, time.perf_counter() - start)
+        return names
+
+    async def set(self, collection, doc_id, data, merge=False):
+        start = time.perf_counter()
+        await self.inner.set(collection, doc_id, data, merge)
+        self._record_write('set', {collection: 1}, time.perf_counter() - start)
+
+    async def update(self, collection, doc_id, data):
+        start = time.perf_counter()
+        await self.inner.update(collection, doc_id, data)
+        self._record_write('update', {collection: 1}, time.perf_counter() - start)
+
+    async def delete(self, collection, doc_id):
+        start = time.perf_counter()
+        await self.inner.delete(collection, doc_id)
+        self._record_write('delete', {collection: 1}, time.perf_counter() - start)
+
+    async def write_batch(self, operations):
+        start = time.perf_counter()
+        await self.inner.write_batch(operations)
+        written = CollectionCounter(op.collection for op in operations)
+        self._record_write('write_batch', written, time.perf_counter() - start)
+
+    async def transform(self, collection, doc_id, fn):
+        start = time.perf_counter()
+        update = await self.inner.transform(collection, doc_id, fn)
+        # Una operación con una lectura y, si fn devolvió campos, una escritura
+        self._record_write('transform', {collection: int(update is not None)},
+                           time.perf_counter() - start)
+        STORAGE_DOCUMENTS_READ.inc(collection=collection)
+        stats = current_request_stats()
+        if stats is not None:
+            stats.documents_read += 1
+        return update
+
+    def watch(self, collection, callback):
+        return self.inner.watch(collection, callback)
+
+    async def close(self):
+        await self.inner.close()
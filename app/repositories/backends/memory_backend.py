@@ -0,0 +1,291 @@
+import copy
+import operator
+import threading
+
+from app.repositories.backends.base import (DELETE_FIELD, DOCUMENT_ID, MAX_BATCH_SIZE,
+                                            AsyncStorageBackend, Document,
+                                            DocumentNotFoundError, StorageBackend, WriteOp)
+
+_MISSING = object()
+
+
+def _get_path(data, path):
+    """
+    Leer un campo con ruta de puntos ('a.b.c'); devuelve _MISSING si no existe
+    """
+    value = data
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_path(data, path, value):
+    parts = path.split('.')
+    target = data
+    for part in parts[:-1]:
+        if not isinstance(target.get(part), dict):
+            target[part] = {}
+        target = target[part]
+    if value is DELETE_FIELD:
+        target.pop(parts[-1], None)
+    else:
+        target[parts[-1]] = value
+
+
+def _deep_merge(target, patch):
+    for key, value in patch.items():
+        if value is DELETE_FIELD:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _strip_sentinels(data):
+    return {k: v for k, v in data.items() if v is not DELETE_FIELD}
+
+
+_COMPARISONS = {
+    '==': operator.eq,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda actual, value: actual in value,
+}
+
+
+def _matches(doc_id, data, filters):
+    for field_path, op, value in filters:
+        actual = doc_id if field_path == DOCUMENT_ID else _get_path(data, field_path)
+        if actual is _MISSING:
+            return False
+        if op not in _COMPARISONS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        try:
+            if not _COMPARISONS[op](actual, value):
+                return False
+        except TypeError:
+            # Como en Firestore, un rango no compara valores de distinto tipo
+            return False
+    return True
+
+
+class _MemoryWatch:
+    def __init__(self, backend, collection, callback):
+        self._backend = backend
+        self.collection = collection
+        self.callback = callback
+        self.is_active = True
+
+    def unsubscribe(self):
+        self.is_active = False
+        self._backend._remove_watch(self)
+
+
+class MemoryBackend(StorageBackend):
+    """
+    Backend en memoria y thread-safe con la misma semántica de consultas que
+    FirestoreBackend. Pensado para desarrollo local, tests y pruebas de carga.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._collections: dict[str, dict[str, dict]] = {}
+        self._watches: list[_MemoryWatch] = []
+
+    def _docs(self, collection):
+        return self._collections.setdefault(collection, {})
+
+    # Lecturas
+
+    def get(self, collection, doc_id):
+        with self._lock:
+            data = self._docs(collection).get(doc_id)
+            return copy.deepcopy(data) if data is not None else None
+
+    def get_many(self, collection, doc_ids):
+        with self._lock:
+            docs = self._docs(collection)
+            return {doc_id: copy.deepcopy(docs[doc_id])
+                    for doc_id in dict.fromkeys(doc_ids) if doc_id in docs}
+
+    def query(self, collection, filters=(), order_by=None, descending=False,
+              limit=None, start_after=None, select=None):
+        with self._lock:
+            docs = self._docs(collection)
+            matches = [(doc_id, data) for doc_id, data in docs.items()
+                       if _matches(doc_id, data, filters)]
+
+            if order_by in (None, DOCUMENT_ID):
+                def sort_key(item):
+                    return item[0]
+            else:
+                # Firestore excluye los documentos que no tienen el campo de orden
+                matches = [(doc_id, data) for doc_id, data in matches
+                           if _get_path(data, order_by) is not _MISSING]
+
+                def sort_key(item):
+                    return (_get_path(item[1], order_by), item[0])
+            matches.sort(key=sort_key, reverse=descending)
+
+            if start_after is not None:
+                if order_by in (None, DOCUMENT_ID):
+                    cursor_key = start_after
+                else:
+                    cursor_data = docs.get(start_after)
+                    if cursor_data is None:
+                        raise ValueError(f"Cursor document not found: {start_after}")
+                    cursor_key = (_get_path(cursor_data, order_by), start_after)
+                if descending:
+                    matches = [m for m in matches if sort_key(m) < cursor_key]
+                else:
+                    matches = [m for m in matches if sort_key(m) > cursor_key]
+
+            if limit is not None:
+                matches = matches[:limit]
+
+            results = []
+            for doc_id, data in matches:
+                if select is not None:
+                    data = {f: _get_path(data, f) for f in select
+                            if _get_path(data, f) is not _MISSING}
+                results.append(Document(doc_id, copy.deepcopy(data)))
+            return results
+
+    def stream(self, collection):
+        return iter(self.query(collection))
+
+    def count(self, collection, filters=()):
+        with self._lock:
+            return sum(1 for doc_id, data in self._docs(collection).items()
+                       if _matches(doc_id, data, filters))
+
+    def collections(self):
+        with self._lock:
+            return sorted(name for name, docs in self._collections.items() if docs)
+
+    # Escrituras
+
+    def _apply(self, op: WriteOp):
+        docs = self._docs(op.collection)
+        if op.kind == 'set':
+            data = copy.deepcopy(op.data)
+            if op.merge and op.doc_id in docs:
+                _deep_merge(docs[op.doc_id], data)
+            else:
+                docs[op.doc_id] = _strip_sentinels(data)
+        elif op.kind == 'update':
+            target = docs[op.doc_id]
+            for path, value in op.data.items():
+                _set_path(target, path, copy.deepcopy(value))
+        elif op.kind == 'delete':
+            docs.pop(op.doc_id, None)
+        else:
+            raise ValueError(f"Unsupported write kind: {op.kind}")
+
+    def write_batch(self, operations):
+        if len(operations) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch admits at most {MAX_BATCH_SIZE} writes")
+        with self._lock:
+            # Validar antes de aplicar para que el batch sea atómico
+            for op in operations:
+                if op.kind == 'update' and op.doc_id not in self._docs(op.collection):
+                    raise DocumentNotFoundError(op.collection, op.doc_id)
+            for op in operations:
+                self._apply(op)
+        self._notify({op.collection for op in operations})
+
+    def set(self, collection, doc_id, data, merge=False):
+        self.write_batch([WriteOp('set', collection, doc_id, data, merge)])
+
+    def update(self, collection, doc_id, data):
+        self.write_batch([WriteOp('update', collection, doc_id, data)])
+
+    def delete(self, collection, doc_id):
+        self.write_batch([WriteOp('delete', collection, doc_id)])
+
+    def transform(self, collection, doc_id, fn):
+        with self._lock:
+            data = self._docs(collection).get(doc_id)
+            update = fn(copy.deepcopy(data) if data is not None else None)
+            if update is not None:
+                self._apply(WriteOp('set', collection, doc_id, update, merge=True))
+        if update is not None:
+            self._notify({collection})
+        return update
+
+    # Listeners
+
+    def watch(self, collection, callback):
+        handle = _MemoryWatch(self, collection, callback)
+        with self._lock:
+            self._watches.append(handle)
+        callback(self.query(collection))
+        return handle
+
+    def _remove_watch(self, handle):
+        with self._lock:
+            if handle in self._watches:
+                self._watches.remove(handle)
+
+    def _notify(self, collections):
+        with self._lock:
+            watches = [w for w in self._watches if w.collection in collections]
+        for handle in watches:
+            handle.callback(self.query(handle.collection))
+
+    def clear(self):
+        with self._lock:
+            self._collections.clear()
+
+
+class AsyncMemoryBackend(AsyncStorageBackend):
+    """
+    Interfaz async sobre un MemoryBackend; comparte los datos con la vía síncrona
+    """
+
+    def __init__(self, backend: MemoryBackend | None = None):
+        self.sync = backend if backend is not None else MemoryBackend()
+
+    async def get(self, collection, doc_id):
+        return self.sync.get(collection, doc_id)
+
+    async def get_many(self, collection, doc_ids):
+        return self.sync.get_many(collection, doc_ids)
+
+    async def set(self, collection, doc_id, data, merge=False):
+        self.sync.set(collection, doc_id, data, merge)
+
+    async def update(self, collection, doc_id, data):
+        self.sync.update(collection, doc_id, data)
+
+    async def delete(self, collection, doc_id):
+        self.sync.delete(collection, doc_id)
+
+    async def query(self, collection, filters=(), order_by=None, descending=False,
+                    limit=None, start_after=None, select=None):
+        return self.sync.query(collection, filters, order_by, descending,
+                               limit, start_after, select)
+
+    async def stream(self, collection):
+        for doc in self.sync.stream(collection):
+            yield doc
+
+    async def count(self, collection, filters=()):
+        return self.sync.count(collection, filters)
+
+    async def collections(self):
+        return self.sync.collections()
+
+    async def write_batch(self, operations):
+        self.sync.write_batch(operations)
+
+    async def transform(self, collection, doc_id, fn):
+        return self.sync.transform(collection, doc_id, fn)
+
+    def watch(self, collection, callback):
+        return self.sync.watch(collection, callback)
@@ -0,0 +1,36 @@
+from datetime import datetime, UTC
+
+from app.repositories.backends import get_async_backend
+
+DUE_QUEUES_COLLECTION = 'due_queues'
+
+
+async def get_due_queue(user_id):
+    """
+    Obtener la cola de repaso de un usuario ({topic_id: vence}), o None si
+    todavía no se ha construido
+    """
+    data = await get_async_backend().get(DUE_QUEUES_COLLECTION, user_id)
+    if data is None:
+        return None
+    return dict(data.get('topics', {}))
+
+
+async def update_due_entries(user_id, entries):
+    """
+    Actualizar solo las entradas indicadas (set con merge sobre el mapa)
+    """
+    await get_async_backend().set(DUE_QUEUES_COLLECTION, user_id, {
+        'topics': entries,
+        'updated_at': datetime.now(UTC),
+    }, merge=True)
+
+
+async def replace_due_queue(user_id, entries):
+    """
+    Reemplazar la cola completa de un usuario (reconstrucción)
+    """
+    await get_async_backend().set(DUE_QUEUES_COLLECTION, user_id, {
+        'topics': entries,
+        'updated_at': datetime.now(UTC),
+    })
@@ -0,0 +1,151 @@
+import asyncio
+from contextvars import ContextVar
+
+from app.repositories import progress_repository, topic_repository
+
+# Claves por llamada al backend: cada get_many (db.get_all en Firestore) pide
+# como mucho este número de documentos y los lotes se lanzan en paralelo
+MAX_LOAD_BATCH_SIZE = 100
+
+
+class DataLoader:
+    """
+    Agrupa las cargas por clave que se piden en la misma vuelta del event
+    loop y las resuelve con una sola llamada a `batch_load(keys)` (que
+    devuelve {clave: valor}; las claves ausentes resuelven a None).
+
+    Las claves se deduplican y el futuro de cada una se guarda durante la
+    vida del loader: peticiones concurrentes de la misma clave esperan la
+    misma carga (single-flight) y las siguientes la reutilizan.
+    """
+
+    def __init__(self, batch_load, max_batch_size=MAX_LOAD_BATCH_SIZE):
+        self._batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._futures: dict[object, asyncio.Future] = {}
+        self._queue: list[tuple[object, asyncio.Future]] = []
+        self._dispatch: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._counters = {'loads': 0, 'cached': 0, 'batches': 0, 'keys': 0}
+
+    def _future(self, key):
+        self._counters['loads'] += 1
+        future = self._futures.get(key)
+        if future is not None:
+            self._counters['cached'] += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = self._futures[key] = loop.create_future()
+        self._queue.append((key, future))
+        if self._dispatch is None:
+            # Se despacha después de las cargas ya encoladas en esta vuelta
+            self._dispatch = loop.call_soon(self._dispatch_queue)
+        return future
+
+    def _dispatch_queue(self):
+        self._dispatch = None
+        queued, self._queue = self._queue, []
+        for start in range(0, len(queued), self.max_batch_size):
+            task = asyncio.get_running_loop().create_task(
+                self._load_batch(queued[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, queued):
+        self._counters['batches'] += 1
+        self._counters['keys'] += len(queued)
+        try:
+            values = await self._batch_load([key for key, _ in queued])
+        except Exception as e:
+            for key, future in queued:
+                # Sin cachear el error: una carga posterior lo reintenta
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in queued:
+            if not future.done():
+                future.set_result(values.get(key))
+
+    async def load(self, key):
+        return await self._future(key)
+
+    async def load_many(self, keys):
+        """
+        Valores en el mismo orden que `keys` (None para los que no existen)
+        """
+        return list(await asyncio.gather(*(self._future(key) for key in keys)))
+
+    def prime(self, key, value):
+        """
+        Guardar un valor ya conocido (p. ej. recién escrito) sin ir al backend
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._futures[key] = future
+
+    def clear(self, key=None):
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+    def stats(self):
+        return dict(self._counters)
+
+
+async def _load_topics(topic_ids):
+    return await topic_repository.get_topics_many(topic_ids)
+
+
+async def _load_progress(keys):
+    """
+    Claves (user_id, topic_id): un get_many por usuario, en paralelo
+    """
+    by_user: dict[str, list[str]] = {}
+    for user_id, topic_id in keys:
+        by_user.setdefault(user_id, []).append(topic_id)
+    results = await asyncio.gather(*(progress_repository.get_progress_many(user_id, topic_ids)
+                                     for user_id, topic_ids in by_user.items()))
+    return {(user_id, topic_id): progress
+            for user_id, found in zip(by_user, results)
+            for topic_id, progress in found.items()}
+
+
+class RequestLoaders:
+    """
+    Loaders de una petición: temas por id y progreso por (user_id, topic_id)
+    """
+
+    def __init__(self):
+        self.topics = DataLoader(_load_topics)
+        self.progress = DataLoader(_load_progress)
+
+    def stats(self):
+        return {'topics': self.topics.stats(), 'progress': self.progress.stats()}
+
+
+_request_loaders: ContextVar[RequestLoaders | None] = ContextVar('request_loaders', default=None)
+
+
+def start_request_loaders():
+    """
+    Crear los loaders de la petición actual; devuelve (loaders, token)
+    """
+    loaders = RequestLoaders()
+    return loaders, _request_loaders.set(loaders)
+
+
+def end_request_loaders(token):
+    _request_loaders.reset(token)
+
+
+def get_loaders() -> RequestLoaders:
+    """
+    Loaders de la petición en curso. Fuera de una petición (scripts, tests)
+    se devuelven unos nuevos: agrupan las cargas pero no las recuerdan.
+    """
+    loaders = _request_loaders.get()
+    return loaders if loaders is not None else RequestLoaders()
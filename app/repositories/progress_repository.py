@@ -1,4 +1,319 @@
-from firebase_admin import firestore
-from app.models.topic import TopicCreate, TopicResponse
-from typing import List, Optional
+import asyncio
+import logging
 
+from app.core import config
+from app.models.converters import progress_from_document
+from app.repositories.backends import MAX_BATCH_SIZE, WriteOp, get_async_backend
+from app.repositories.progress_write_buffer import ProgressWriteBuffer
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_COLLECTION = 'progress'
+USER_PROGRESS_COLLECTION = 'user_progress'
+
+# Organizaciones del progreso admitidas en config.progress_layout
+DOCUMENTS_LAYOUT = 'documents'
+USER_MAP_LAYOUT = 'user_map'
+
+_write_buffer: ProgressWriteBuffer | None = None
+if config.progress_write_behind:
+    _write_buffer = ProgressWriteBuffer(
+        PROGRESS_COLLECTION,
+        window_seconds=config.progress_write_behind_window_ms / 1000,
+        max_pending=config.progress_write_behind_max_pending,
+    )
+
+
+def get_write_buffer():
+    """
+    Buffer write-behind del progreso, o None si está desactivado
+    """
+    return _write_buffer
+
+
+def set_write_buffer(buffer: ProgressWriteBuffer | None):
+    global _write_buffer
+    _write_buffer = buffer
+
+
+def progress_doc_id(user_id, topic_id):
+    """
+    ID determinista del documento de progreso de un usuario en un tema
+    """
+    return f'{user_id}_{topic_id}'
+
+
+def _user_map_layout():
+    if config.progress_layout not in (DOCUMENTS_LAYOUT, USER_MAP_LAYOUT):
+        raise ValueError(f"Unknown progress layout: {config.progress_layout}")
+    return config.progress_layout == USER_MAP_LAYOUT
+
+
+def user_map_entry(fields):
+    """
+    Entrada del mapa `topics` de user_progress: los campos del progreso sin
+    user_id ni topic_id, que ya están en el ID del documento y en la clave
+    """
+    return {k: v for k, v in fields.items() if k not in ('user_id', 'topic_id')}
+
+
+def _user_map_topics(data):
+    return (data or {}).get('topics') or {}
+
+
+async def _get_user_map(user_id):
+    """
+    Mapa {topic_id: campos} del documento user_progress de un usuario
+    """
+    return _user_map_topics(await get_async_backend().get(USER_PROGRESS_COLLECTION, user_id))
+
+
+def _from_user_map(user_id, topic_id, entry):
+    return progress_from_document(progress_doc_id(user_id, topic_id),
+                                  {'user_id': user_id, 'topic_id': topic_id, **entry})
+
+
+async def _save_user_map(user_id, updates):
+    """
+    Escribir varias entradas del mapa de un usuario con un solo set con merge:
+    solo cambian los campos enviados y la escritura es atómica en el documento
+    """
+    await get_async_backend().set(USER_PROGRESS_COLLECTION, user_id, {
+        'user_id': user_id,
+        'topics': {topic_id: user_map_entry(fields) for topic_id, fields in updates.items()},
+    }, merge=True)
+
+
+def _with_pending(doc_id, data):
+    """
+    Aplicar encima lo que siga pendiente en el buffer (read-your-writes)
+    """
+    if _write_buffer is None:
+        return data
+    pending = _write_buffer.get_pending(doc_id)
+    if pending is None:
+        return data
+    return {**(data or {}), **pending}
+
+
+async def get_user_progress(user_id):
+    """
+    Obtener todo el progreso de un usuario
+    """
+    if _user_map_layout():
+        return [_from_user_map(user_id, topic_id, entry)
+                for topic_id, entry in (await _get_user_map(user_id)).items()]
+    docs = await get_async_backend().query(PROGRESS_COLLECTION, [('user_id', '==', user_id)])
+    progress = {doc.id: doc.data for doc in docs}
+    if _write_buffer is not None:
+        for doc_id, pending in _write_buffer.pending_items():
+            if pending.get('user_id') == user_id:
+                progress[doc_id] = {**progress.get(doc_id, {}), **pending}
+    return [progress_from_document(doc_id, data) for doc_id, data in progress.items()]
+
+
+async def get_user_progress_map(user_id):
+    """
+    Obtener el progreso de un usuario indexado por topic_id
+    """
+    return {progress.topic_id: progress for progress in await get_user_progress(user_id)}
+
+
+async def get_progress_by_topic(user_id, topic_id):
+    """
+    Obtener el progreso de un usuario en un tema, o None si no existe
+    """
+    if _user_map_layout():
+        entry = (await _get_user_map(user_id)).get(topic_id)
+        return _from_user_map(user_id, topic_id, entry) if entry is not None else None
+    doc_id = progress_doc_id(user_id, topic_id)
+    data = _with_pending(doc_id, await get_async_backend().get(PROGRESS_COLLECTION, doc_id))
+    return progress_from_document(doc_id, data) if data is not None else None
+
+
+async def get_progress_many(user_id, topic_ids):
+    """
+    Obtener en una sola lectura el progreso de un usuario en varios temas,
+    indexado por topic_id (los temas sin progreso no aparecen)
+    """
+    if _user_map_layout():
+        entries = await _get_user_map(user_id)
+        return {topic_id: _from_user_map(user_id, topic_id, entries[topic_id])
+                for topic_id in dict.fromkeys(topic_ids) if topic_id in entries}
+    doc_ids = {progress_doc_id(user_id, topic_id): topic_id for topic_id in topic_ids}
+    found = await get_async_backend().get_many(PROGRESS_COLLECTION, list(doc_ids))
+    progress = {}
+    for doc_id, topic_id in doc_ids.items():
+        data = _with_pending(doc_id, found.get(doc_id))
+        if data is not None:
+            progress[topic_id] = progress_from_document(doc_id, data)
+    return progress
+
+
+async def save_progress(user_id, topic_id, fields):
+    """
+    Guardar campos del progreso (set con merge). Con write-behind activo la
+    escritura se encola y se combina con las demás del mismo documento.
+    """
+    doc_id = progress_doc_id(user_id, topic_id)
+    if _user_map_layout():
+        await _save_user_map(user_id, {topic_id: fields})
+        return doc_id
+    fields = {'user_id': user_id, 'topic_id': topic_id, **fields}
+    # Con el buffer lleno se escribe directamente
+    if _write_buffer is None or not _write_buffer.add(doc_id, fields):
+        await get_async_backend().set(PROGRESS_COLLECTION, doc_id, fields, merge=True)
+    return doc_id
+
+
+async def save_progress_many(user_id, updates):
+    """
+    Guardar varios progresos de un usuario ({topic_id: campos}) en batches.
+    Devuelve {topic_id: error} con los que no se pudieron escribir.
+    """
+    if _user_map_layout():
+        if not updates:
+            return {}
+        try:
+            await _save_user_map(user_id, updates)
+        except Exception as e:
+            logger.error(f"Error writing {len(updates)} progress entries for {user_id}: {e}")
+            return {topic_id: str(e) for topic_id in updates}
+        return {}
+
+    operations = []
+    for topic_id, fields in updates.items():
+        fields = {'user_id': user_id, 'topic_id': topic_id, **fields}
+        operations.append((topic_id, progress_doc_id(user_id, topic_id), fields))
+
+    if _write_buffer is not None:
+        # Lo que no cabe en el buffer se escribe directamente
+        operations = [op for op in operations if not _write_buffer.add(op[1], op[2])]
+
+    failed = {}
+    for start in range(0, len(operations), MAX_BATCH_SIZE):
+        chunk = operations[start:start + MAX_BATCH_SIZE]
+        try:
+            await get_async_backend().write_batch([
+                WriteOp('set', PROGRESS_COLLECTION, doc_id, fields, merge=True)
+                for _, doc_id, fields in chunk])
+        except Exception as e:
+            logger.error(f"Error writing {len(chunk)} progress documents for {user_id}: {e}")
+            failed.update({topic_id: str(e) for topic_id, _, _ in chunk})
+    return failed
+
+
+async def _update_user_map(user_id, computes):
+    """
+    Recalcular varias entradas del mapa de un usuario en una transacción
+    sobre su documento user_progress
+    """
+    applied = {}
+
+    def apply(data):
+        applied.clear()
+        entries = _user_map_topics(data)
+        topics = {}
+        for topic_id, compute in computes.items():
+            entry = entries.get(topic_id)
+            current = _from_user_map(user_id, topic_id, entry) if entry is not None else None
+            fields = compute(current)
+            applied[topic_id] = (current, fields)
+            if fields is not None:
+                topics[topic_id] = user_map_entry(fields)
+        return {'user_id': user_id, 'topics': topics} if topics else None
+
+    await get_async_backend().transform(USER_PROGRESS_COLLECTION, user_id, apply)
+    return applied
+
+
+async def _read_buffered(doc_id):
+    """
+    Leer un documento más lo pendiente en el buffer. Si un flush termina
+    mientras se lee, la lectura puede ser anterior a lo que ese flush sacó
+    del buffer y se repite.
+    """
+    while True:
+        flushed = _write_buffer.flushed_docs()
+        data = await get_async_backend().get(PROGRESS_COLLECTION, doc_id)
+        if _write_buffer.flushed_docs() == flushed:
+            return _with_pending(doc_id, data)
+
+
+async def _update_document(user_id, topic_id, compute):
+    doc_id = progress_doc_id(user_id, topic_id)
+    applied = [None, None]
+
+    def apply(data):
+        current = progress_from_document(doc_id, data) if data is not None else None
+        fields = compute(current)
+        applied[:] = [current, fields]
+        if fields is None:
+            return None
+        return {'user_id': user_id, 'topic_id': topic_id, **fields}
+
+    if _write_buffer is not None:
+        # Entre leer lo pendiente y encolar no se cede el event loop: dos
+        # escrituras del proceso al mismo documento se calculan una sobre otra
+        update = apply(await _read_buffered(doc_id))
+        if update is None or _write_buffer.add(doc_id, update):
+            return tuple(applied)
+    # Con el buffer lleno (o sin buffer) se recalcula dentro de una transacción
+    await get_async_backend().transform(PROGRESS_COLLECTION, doc_id, apply)
+    return tuple(applied)
+
+
+async def update_progress(user_id, topic_id, compute):
+    """
+    Leer y actualizar el progreso de un tema de forma atómica: `compute`
+    recibe el progreso actual (None si no existe) y devuelve los campos a
+    escribir con merge, o None para no escribir. Si el documento cambia
+    entre medias se reintenta, así que `compute` no debe tener efectos
+    secundarios. Devuelve (progreso anterior, campos escritos) del intento
+    que se aplicó.
+    """
+    if _user_map_layout():
+        return (await _update_user_map(user_id, {topic_id: compute}))[topic_id]
+    return await _update_document(user_id, topic_id, compute)
+
+
+async def update_progress_many(user_id, computes):
+    """
+    update_progress para varios temas de un usuario ({topic_id: compute}).
+    Con el layout user_map es una sola transacción; con documentos, una por
+    tema en paralelo. Devuelve ({topic_id: (anterior, campos)}, {topic_id: error}).
+    """
+    if not computes:
+        return {}, {}
+    if _user_map_layout():
+        try:
+            return await _update_user_map(user_id, computes), {}
+        except Exception as e:
+            logger.error(f"Error updating {len(computes)} progress entries for {user_id}: {e}")
+            return {}, {topic_id: str(e) for topic_id in computes}
+
+    results = await asyncio.gather(
+        *(_update_document(user_id, topic_id, compute) for topic_id, compute in computes.items()),
+        return_exceptions=True)
+    applied, failed = {}, {}
+    for topic_id, result in zip(computes, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error updating progress {progress_doc_id(user_id, topic_id)}: {result}")
+            failed[topic_id] = str(result)
+        else:
+            applied[topic_id] = result
+    return applied, failed
+
+
+async def list_users_with_progress():
+    """
+    IDs de los usuarios que tienen algún progreso guardado
+    """
+    if _user_map_layout():
+        return [doc.id for doc in await get_async_backend().query(USER_PROGRESS_COLLECTION,
+                                                                  select=[])]
+    users = set()
+    async for doc in get_async_backend().stream(PROGRESS_COLLECTION):
+        if doc.data.get('user_id'):
+            users.add(doc.data['user_id'])
+    return sorted(users)
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+
+from app.repositories.backends import MAX_BATCH_SIZE, WriteOp, get_async_backend
+
+logger = logging.getLogger(__name__)
+
+
+class FlushError(RuntimeError):
+    """
+    Al cerrar quedaron parches sin escribir; `pending` guarda {doc_id: campos}
+    """
+
+    def __init__(self, message, pending):
+        super().__init__(message)
+        self.pending = pending
+
+
+class ProgressWriteBuffer:
+    """
+    Buffer write-behind para documentos de progreso.
+
+    Los parches a un mismo documento dentro de la ventana se combinan (el
+    último valor de cada campo gana) y se escriben juntos con set(merge=True)
+    en batches. Las lecturas consultan get_pending() para ver sus propias
+    escrituras antes del flush.
+
+    Solo hay un flush en curso a la vez. Si falla, el siguiente espera una
+    ventana que se duplica con cada fallo seguido (hasta `max_backoff_seconds`).
+    Con `max_pending` documentos en el buffer no se aceptan documentos nuevos:
+    add() devuelve False y el llamador escribe directamente (backpressure).
+    """
+
+    def __init__(self, collection, window_seconds=0.5, max_pending=1000, backend=None,
+                 max_backoff_seconds=30.0):
+        self.collection = collection
+        self.window_seconds = window_seconds
+        self.max_pending = max_pending
+        self.max_backoff_seconds = max_backoff_seconds
+        self._backend = backend
+        self._pending: dict[str, dict] = {}
+        # Parches que está escribiendo el flush en curso
+        self._in_flight: dict[str, dict] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._consecutive_errors = 0
+        self._counters = {
+            'received': 0,
+            'merged': 0,
+            'rejected': 0,
+            'flushed_docs': 0,
+            'flushed_batches': 0,
+            'flush_errors': 0,
+        }
+
+    @property
+    def backend(self):
+        return self._backend or get_async_backend()
+
+    def _size(self):
+        return len(self._pending) + len(self._in_flight)
+
+    def add(self, doc_id, fields):
+        """
+        Encolar un parche para `doc_id` y programar el flush de la ventana.
+        Devuelve False, sin encolarlo, si el buffer está lleno y el documento
+        no tiene nada pendiente: entonces hay que escribirlo directamente.
+        """
+        known = doc_id in self._pending or doc_id in self._in_flight
+        if not known and self._size() >= self.max_pending:
+            self._counters['rejected'] += 1
+            self._flush_soon()
+            return False
+
+        self._counters['received'] += 1
+        pending = self._pending.get(doc_id)
+        if pending is None:
+            self._pending[doc_id] = dict(fields)
+        else:
+            pending.update(fields)
+            self._counters['merged'] += 1
+
+        if self._size() >= self.max_pending:
+            self._flush_soon()
+        elif self._timer is None and self._flush_task is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.window_seconds, self._schedule_flush)
+        return True
+
+    def get_pending(self, doc_id):
+        if doc_id not in self._pending and doc_id not in self._in_flight:
+            return None
+        return {**self._in_flight.get(doc_id, {}), **self._pending.get(doc_id, {})}
+
+    def flushed_docs(self):
+        """
+        Documentos escritos por los flushes hasta ahora (cambia cada vez que
+        algo sale del buffer)
+        """
+        return self._counters['flushed_docs']
+
+    def pending_items(self):
+        return [(doc_id, self.get_pending(doc_id))
+                for doc_id in dict.fromkeys([*self._in_flight, *self._pending])]
+
+    def _flush_soon(self):
+        # Tras un fallo se respeta la espera ya programada en el timer
+        if self._consecutive_errors == 0:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is not None:
+            # Al terminar, el flush en curso reprograma lo que quede pendiente
+            return
+        self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task):
+        self._flush_task = None
+
+    async def flush(self):
+        """
+        Escribir todo lo pendiente en batches; si un batch falla, sus parches
+        vuelven al buffer debajo de los que hayan llegado mientras tanto
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._in_flight, self._pending = self._pending, {}
+        items = list(self._in_flight.items())
+
+        failed = False
+        for start in range(0, len(items), MAX_BATCH_SIZE):
+            chunk = items[start:start + MAX_BATCH_SIZE]
+            operations = [WriteOp('set', self.collection, doc_id, fields, merge=True)
+                          for doc_id, fields in chunk]
+            try:
+                await self.backend.write_batch(operations)
+            except Exception as e:
+                failed = True
+                self._counters['flush_errors'] += 1
+                logger.error(f"Error flushing {len(chunk)} progress writes: {e}")
+                for doc_id, fields in chunk:
+                    self._pending[doc_id] = {**fields, **self._pending.get(doc_id, {})}
+                    del self._in_flight[doc_id]
+                continue
+            for doc_id, _ in chunk:
+                del self._in_flight[doc_id]
+            self._counters['flushed_docs'] += len(chunk)
+            self._counters['flushed_batches'] += 1
+
+        self._consecutive_errors = self._consecutive_errors + 1 if failed else 0
+        if self._pending and self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self._backoff_delay(), self._schedule_flush)
+
+    def _backoff_delay(self):
+        return min(self.window_seconds * 2 ** self._consecutive_errors,
+                   max(self.max_backoff_seconds, self.window_seconds))
+
+    async def close(self, attempts=3):
+        """
+        Esperar el flush en curso y vaciar el buffer (al apagar la aplicación).
+        Si el flush falla se reintenta con la misma espera, hasta `attempts`
+        veces en total; si aun así queda algo sin escribir lanza FlushError.
+        """
+        try:
+            for attempt in range(attempts):
+                if attempt:
+                    # La espera la hace close(): el timer no lanza otro flush a la vez
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+                    await asyncio.sleep(self._backoff_delay())
+                if self._flush_task is not None:
+                    await asyncio.gather(self._flush_task, return_exceptions=True)
+                await self.flush()
+                if not self._pending:
+                    return
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        raise FlushError(f"{len(self._pending)} progress writes could not be flushed "
+                         f"after {attempts} attempts", dict(self._pending))
+
+    def stats(self):
+        return {**self._counters, 'pending': len(self._pending),
+                'in_flight': len(self._in_flight), 'consecutive_errors': self._consecutive_errors}
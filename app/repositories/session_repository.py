@@ -0,0 +1,62 @@
+from app.models.session import SessionResponse
+from app.repositories.backends import MAX_BATCH_SIZE, WriteOp, get_async_backend
+
+SESSIONS_COLLECTION = 'sessions'
+# Un documento por usuario con un contador que sube en cada invalidación
+SESSION_VERSIONS_COLLECTION = 'session_versions'
+
+
+async def get_session(session_id):
+    """
+    Obtener una sesión guardada, o None si no existe
+    """
+    data = await get_async_backend().get(SESSIONS_COLLECTION, session_id)
+    if data is None:
+        return None
+    return SessionResponse(session_id=session_id, user_id=data['user_id'],
+                           created_at=data['created_at'], topics=data.get('topics', []))
+
+
+async def save_session(session: SessionResponse, local_date, inputs_hash):
+    """
+    Guardar una sesión con el día local y el hash de las entradas que la generaron
+    """
+    data = session.model_dump(exclude={'session_id'})
+    data.update(local_date=local_date, inputs_hash=inputs_hash)
+    await get_async_backend().set(SESSIONS_COLLECTION, session.session_id, data)
+
+
+async def delete_session(session_id):
+    await get_async_backend().delete(SESSIONS_COLLECTION, session_id)
+
+
+async def get_sessions_version(user_id):
+    """
+    Versión de invalidación de las sesiones del usuario (0 si nunca se invalidaron)
+    """
+    data = await get_async_backend().get(SESSION_VERSIONS_COLLECTION, user_id)
+    return (data or {}).get('version', 0)
+
+
+async def bump_sessions_version(user_id):
+    """
+    Subir la versión de invalidación de forma atómica; devuelve la nueva
+    """
+    update = await get_async_backend().transform(
+        SESSION_VERSIONS_COLLECTION, user_id,
+        lambda data: {'version': (data or {}).get('version', 0) + 1})
+    return update['version']
+
+
+async def delete_user_sessions(user_id, local_dates):
+    """
+    Borrar las sesiones de un usuario para los días indicados. Devuelve cuántas se borraron.
+    """
+    docs = await get_async_backend().query(
+        SESSIONS_COLLECTION,
+        [('user_id', '==', user_id), ('local_date', 'in', list(local_dates))],
+        select=[])
+    operations = [WriteOp('delete', SESSIONS_COLLECTION, doc.id) for doc in docs]
+    for start in range(0, len(operations), MAX_BATCH_SIZE):
+        await get_async_backend().write_batch(operations[start:start + MAX_BATCH_SIZE])
+    return len(operations)
@@ -0,0 +1,333 @@
+import asyncio
+import bisect
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+
+from app.core import config
+from app.core.config import topics_cache_listen, topics_cache_ttl_seconds
+from app.models.converters import topic_from_document
+from app.models.topic import TopicCreate, TopicResponse
+from app.repositories.backends import DOCUMENT_ID, get_async_backend
+
+logger = logging.getLogger(__name__)
+
+TOPICS_COLLECTION = 'topics'
+
+# Tamaño máximo de página al recorrer la colección sin cache
+MAX_TOPICS_PAGE = 500
+
+
+class TopicCatalogCache:
+    """
+    Catálogo de temas en memoria del proceso, indexado por id y por category_id.
+
+    Se mantiene al día con un listener (on_snapshot en Firestore); si el listener
+    no está activo, la colección se recarga completa cuando vence el TTL.
+    Cada recarga incrementa `version`.
+    """
+
+    def __init__(self, ttl_seconds=300.0, listen=True):
+        self.ttl_seconds = ttl_seconds
+        self.listen = listen
+        self._lock = threading.Lock()
+        self._reload_task: asyncio.Future | None = None
+        self._topics: dict[str, TopicResponse] = {}
+        self._ids: list[str] = []
+        self._by_category: dict[str, list[str]] = {}
+        self._loaded_at: float | None = None
+        self._stale = True
+        self._version = 0
+        self._content_hash: str | None = None
+        self._watch = None
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'stale_hits': 0,
+            'reloads': 0,
+            'snapshots': 0,
+            'invalidations': 0,
+        }
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def content_hash(self):
+        """
+        Hash del contenido del catálogo: solo cambia si cambian los temas, no
+        en cada recarga (sirve como ETag)
+        """
+        return self._content_hash
+
+    def _listening(self):
+        return self._watch is not None and getattr(self._watch, 'is_active', False)
+
+    def _is_fresh(self):
+        if self._loaded_at is None or self._stale:
+            return False
+        if self._listening():
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def _replace(self, docs):
+        """
+        Reconstruir los índices a partir de (id, data) y publicarlos de una vez
+        """
+        topics = {}
+        by_category: dict[str, list[str]] = {}
+        for doc_id, data in docs:
+            topic = topic_from_document(doc_id, data)
+            topics[doc_id] = topic
+            by_category.setdefault(topic.category_id, []).append(doc_id)
+
+        for ids in by_category.values():
+            ids.sort()
+        topics = dict(sorted(topics.items()))
+        content = json.dumps([topic.model_dump() for topic in topics.values()],
+                             sort_keys=True, ensure_ascii=False)
+        content_hash = hashlib.sha256(content.encode()).hexdigest()
+
+        with self._lock:
+            self._topics = topics
+            self._ids = list(topics)
+            self._content_hash = content_hash
+            self._by_category = by_category
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            self._version += 1
+
+    async def _reload(self, backend):
+        docs = [(doc.id, doc.data) async for doc in backend.stream(TOPICS_COLLECTION)]
+        self._replace(docs)
+        self._counters['reloads'] += 1
+        logger.info(f"Topic catalog loaded: {len(self._topics)} topics "
+                    f"(version {self._version}).")
+
+    def _on_snapshot(self, docs):
+        """
+        Callback del listener: recibe la colección completa, así que basta con
+        reconstruir los índices sin lecturas adicionales
+        """
+        try:
+            self._replace((doc.id, doc.data) for doc in docs)
+            self._counters['snapshots'] += 1
+        except Exception as e:
+            logger.error(f"Error applying topics snapshot: {e}")
+            self.invalidate()
+
+    def _start_listener(self, backend):
+        if not self.listen or self._listening():
+            return
+        try:
+            self._watch = backend.watch(TOPICS_COLLECTION, self._on_snapshot)
+            logger.info("Topic catalog listener started.")
+        except Exception as e:
+            self._watch = None
+            logger.warning(f"Could not start topic catalog listener: {e}")
+
+    async def _reload_or_serve_stale(self, backend):
+        try:
+            backend = backend or get_async_backend()
+            await self._reload(backend)
+        except Exception as e:
+            if self._loaded_at is None:
+                raise
+            self._counters['stale_hits'] += 1
+            logger.warning(f"Serving stale topic catalog: {e}")
+            return
+        self._start_listener(backend)
+
+    async def ensure_loaded(self, backend=None):
+        """
+        Devolver desde memoria si el catálogo está vigente; si no, recargarlo.
+        Las peticiones concurrentes esperan la misma recarga. Si la recarga
+        falla y hay una copia previa, se sirve la copia (stale_hit).
+        """
+        if self._is_fresh():
+            self._counters['hits'] += 1
+            return
+
+        self._counters['misses'] += 1
+        task = self._reload_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._reload_or_serve_stale(backend))
+            self._reload_task = task
+        # shield: si se cancela esta petición, la recarga sigue para las demás
+        await asyncio.shield(task)
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+        self._counters['invalidations'] += 1
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def all(self):
+        return list(self._topics.values())
+
+    def get(self, topic_id):
+        return self._topics.get(topic_id)
+
+    def iter_sorted(self):
+        """
+        Recorrer los temas ordenados por id sin copiar el catálogo
+        """
+        return iter(self._topics.values())
+
+    def by_category(self, category_id):
+        topics = self._topics
+        return [topics[i] for i in self._by_category.get(category_id, [])]
+
+    def page(self, limit, start_after=None, category_id=None):
+        """
+        Página de temas ordenados por id a partir del cursor `start_after`,
+        usando el índice por categoría si se filtra
+        """
+        ids = self._ids if category_id is None else self._by_category.get(category_id, [])
+        start = bisect.bisect_right(ids, start_after) if start_after is not None else 0
+        topics = self._topics
+        return [topics[i] for i in ids[start:start + limit]]
+
+    def stats(self):
+        age = None
+        if self._loaded_at is not None:
+            age = time.monotonic() - self._loaded_at
+        return {
+            **self._counters,
+            'version': self._version,
+            'content_hash': self._content_hash,
+            'size': len(self._topics),
+            'age_seconds': age,
+            'listening': self._listening(),
+        }
+
+
+_catalog = TopicCatalogCache(ttl_seconds=topics_cache_ttl_seconds,
+                             listen=topics_cache_listen)
+
+
+def get_catalog():
+    return _catalog
+
+
+async def get_all_topics():
+    """
+    Obtener todos los temas (desde el catálogo en memoria)
+    """
+    if not config.topics_cache_enabled:
+        docs = await get_async_backend().query(TOPICS_COLLECTION, order_by=DOCUMENT_ID)
+        return [topic_from_document(doc.id, doc.data) for doc in docs]
+    await _catalog.ensure_loaded()
+    return _catalog.all()
+
+
+async def get_topic_by_id(topic_id):
+    """
+    Obtener un tema por su ID, o None si no existe
+    """
+    if not config.topics_cache_enabled:
+        data = await get_async_backend().get(TOPICS_COLLECTION, topic_id)
+        return topic_from_document(topic_id, data) if data is not None else None
+    await _catalog.ensure_loaded()
+    return _catalog.get(topic_id)
+
+
+async def get_topics_many(topic_ids):
+    """
+    Obtener varios temas por ID ({id: tema}; los que no existen se omiten).
+    Sin cache se leen con un solo get_many.
+    """
+    if not config.topics_cache_enabled:
+        found = await get_async_backend().get_many(TOPICS_COLLECTION, topic_ids)
+        return {doc_id: topic_from_document(doc_id, data) for doc_id, data in found.items()}
+    await _catalog.ensure_loaded()
+    return {topic_id: topic for topic_id in topic_ids
+            if (topic := _catalog.get(topic_id)) is not None}
+
+
+async def first_topics(limit, exclude=()):
+    """
+    Primeros `limit` temas por id que no están en `exclude`. Sin cache se
+    leen páginas ordenadas por id hasta tenerlos.
+    """
+    if config.topics_cache_enabled:
+        await _catalog.ensure_loaded()
+        return list(itertools.islice(
+            (topic for topic in _catalog.iter_sorted() if topic.id not in exclude), limit))
+
+    topics, cursor = [], None
+    page_size = min(limit + len(exclude), MAX_TOPICS_PAGE)
+    while len(topics) < limit:
+        docs = await get_async_backend().query(TOPICS_COLLECTION, order_by=DOCUMENT_ID,
+                                               limit=page_size, start_after=cursor)
+        topics.extend(topic_from_document(doc.id, doc.data)
+                      for doc in docs if doc.id not in exclude)
+        if len(docs) < page_size:
+            break
+        cursor = docs[-1].id
+    return topics[:limit]
+
+
+async def filter_topics(category_id):
+    """
+    Obtener los temas de una categoría usando el índice por category_id
+    """
+    if not config.topics_cache_enabled:
+        docs = await get_async_backend().query(
+            TOPICS_COLLECTION, [('category_id', '==', category_id)], order_by=DOCUMENT_ID)
+        return [topic_from_document(doc.id, doc.data) for doc in docs]
+    await _catalog.ensure_loaded()
+    return _catalog.by_category(category_id)
+
+
+async def get_catalog_hash():
+    """
+    Hash del contenido del catálogo en memoria, o None si el cache está
+    desactivado. Con el listener activo no hace lecturas a Firestore.
+    """
+    if not config.topics_cache_enabled:
+        return None
+    await _catalog.ensure_loaded()
+    return _catalog.content_hash
+
+
+async def list_topics(limit, start_after=None, category_id=None, fields=('id',)):
+    """
+    Página de temas ordenada por id (keyset sobre el document ID) con solo los
+    campos pedidos. Devuelve (temas como dict, cursor de la página siguiente o None).
+
+    Sin cache se consulta el backend con select(), así que los campos no
+    pedidos (p. ej. details) ni siquiera se leen.
+    """
+    fields = [field for field in fields if field != 'id']
+    if config.topics_cache_enabled:
+        await _catalog.ensure_loaded()
+        page = [(topic.id, topic.model_dump(include=set(fields)))
+                for topic in _catalog.page(limit + 1, start_after, category_id)]
+    else:
+        filters = [('category_id', '==', category_id)] if category_id is not None else []
+        docs = await get_async_backend().query(
+            TOPICS_COLLECTION, filters, order_by=DOCUMENT_ID, limit=limit + 1,
+            start_after=start_after, select=fields)
+        page = [(doc.id, doc.data) for doc in docs]
+
+    next_cursor = page[limit - 1][0] if len(page) > limit else None
+    return [{'id': doc_id, **data} for doc_id, data in page[:limit]], next_cursor
+
+
+async def create_topic(topic_id, topic: TopicCreate):
+    """
+    Crear un tema e invalidar el catálogo en memoria
+    """
+    await get_async_backend().set(TOPICS_COLLECTION, topic_id, topic.model_dump())
+    _catalog.invalidate()
+    return TopicResponse(id=topic_id, **topic.model_dump())
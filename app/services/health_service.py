@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+
+from app.core import config
+from app.repositories.backends import get_async_backend
+
+logger = logging.getLogger(__name__)
+
+# Documento que se lee para comprobar el backend (no necesita existir)
+HEALTH_COLLECTION = '_health'
+HEALTH_DOC_ID = 'probe'
+
+
+async def check_storage():
+    """
+    Una lectura puntual al backend de almacenamiento
+    """
+    await get_async_backend().get(HEALTH_COLLECTION, HEALTH_DOC_ID)
+
+
+def _list_one_user():
+    from firebase_admin import auth
+
+    config.get_firebase_app()
+    auth.list_users(max_results=1)
+
+
+class ThreadedCheck:
+    """
+    Comprobación síncrona ejecutada en un hilo. El timeout del prober solo
+    cancela la espera, no el hilo: mientras la llamada anterior siga en curso
+    no se lanza otra (la comprobación falla), así un servicio colgado no va
+    acumulando un hilo del executor por intervalo.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self._future: asyncio.Future | None = None
+
+    def running(self):
+        return self._future is not None and not self._future.done()
+
+    async def __call__(self):
+        if self.running():
+            raise RuntimeError("Previous check is still running")
+        self._future = asyncio.get_running_loop().run_in_executor(None, self.fn)
+        await asyncio.shield(self._future)
+
+
+_auth_check = ThreadedCheck(_list_one_user)
+
+
+async def check_auth():
+    """
+    Alcanzar la API de Firebase Auth (el SDK es síncrono: corre en un hilo)
+    """
+    await _auth_check()
+
+
+CHECKS = {
+    'storage': check_storage,
+    'auth': check_auth,
+}
+
+
+class DependencyProber:
+    """
+    Comprueba las dependencias en segundo plano cada `interval` segundos y
+    guarda el resultado; /ready solo lee ese resultado, sin tocar la red.
+    """
+
+    def __init__(self, checks, interval=15.0, timeout=3.0, clock=time.monotonic):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self.clock = clock
+        self._results: dict[str, dict] = {}
+        self._last_run: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _probe(self, name, check):
+        start = self.clock()
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+            error = None
+        except asyncio.TimeoutError:
+            error = f"Timed out after {self.timeout}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = self.clock()
+
+        previous = self._results.get(name, {})
+        self._results[name] = {
+            'ok': error is None,
+            'latency_ms': round((finished - start) * 1000, 3),
+            'error': error,
+            'last_success': finished if error is None else previous.get('last_success'),
+        }
+        if error is not None:
+            logger.warning(f"Health check '{name}' failed: {error}")
+
+    async def run_once(self):
+        await asyncio.gather(*(self._probe(name, check) for name, check in self.checks.items()))
+        self._last_run = self.clock()
+
+    async def _run_forever(self):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _age(self, timestamp):
+        return round(self.clock() - timestamp, 3) if timestamp is not None else None
+
+    def is_ready(self):
+        """
+        Listo si todas las dependencias pasaron su última comprobación y esa
+        comprobación no es más vieja que tres intervalos
+        """
+        if self._last_run is None or self.clock() - self._last_run > 3 * self.interval:
+            return False
+        return all(result['ok'] for result in self._results.values())
+
+    def snapshot(self):
+        dependencies = {
+            name: {
+                'ok': result['ok'],
+                'latency_ms': result['latency_ms'],
+                'last_success_age_seconds': self._age(result['last_success']),
+                'error': result['error'],
+            }
+            for name, result in self._results.items()
+        }
+        if self._last_run is None:
+            status = 'unknown'
+        else:
+            status = 'ok' if self.is_ready() else 'degraded'
+        return {
+            'status': status,
+            'last_check_age_seconds': self._age(self._last_run),
+            'dependencies': dependencies,
+        }
+
+    def result(self, name):
+        return self.snapshot()['dependencies'].get(name)
+
+
+def _configured_checks():
+    unknown = [name for name in config.health_checks if name not in CHECKS]
+    if unknown:
+        logger.warning(f"Ignoring unknown health checks: {', '.join(unknown)}")
+    return {name: CHECKS[name] for name in config.health_checks if name in CHECKS}
+
+
+_prober = DependencyProber(_configured_checks(),
+                           interval=config.health_check_interval_seconds,
+                           timeout=config.health_check_timeout_seconds)
+
+
+def get_prober():
+    return _prober
+
+
+def set_prober(prober: DependencyProber):
+    global _prober
+    _prober = prober
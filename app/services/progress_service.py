@@ -0,0 +1,145 @@
+from datetime import datetime, UTC
+
+from app.core.exceptions import NotFoundError
+from app.models.progress import (ProgressBulkItem, ProgressBulkResponse, ProgressBulkResult,
+                                 ProgressCreate, ProgressResponse, ProgressUpdate)
+from app.repositories import progress_repository
+from app.repositories.loaders import get_loaders
+from app.services.recommendation_service import refresh_due_entries
+from app.services.session_service import invalidate_user_sessions
+from app.services.streak_service import study_day_fields
+
+
+async def _require_topic(topic_id):
+    if await get_loaders().topics.load(topic_id) is None:
+        raise NotFoundError(f"Tema no encontrado: {topic_id}")
+
+
+async def _finish(user_id, topic_id, existing, fields):
+    current = existing.model_dump(exclude={'id'}) if existing is not None else {
+        'user_id': user_id, 'topic_id': topic_id}
+    progress = ProgressResponse(id=progress_repository.progress_doc_id(user_id, topic_id),
+                                **{**current, **fields})
+    await refresh_due_entries(user_id, [progress])
+    await invalidate_user_sessions(user_id)
+    return progress
+
+
+def _reviewed(existing, fields, now):
+    """
+    Campos enviados más fechas y racha, calculados sobre el progreso actual
+    """
+    return {**fields, 'updated_at': now, 'last_reviewed_at': now,
+            **study_day_fields(existing, now)}
+
+
+async def record_progress(progress: ProgressCreate, now: datetime | None = None) -> ProgressResponse:
+    """
+    Registrar el progreso de un usuario en un tema: lo crea si no existe y,
+    si existe, actualiza solo los campos enviados. Cada escritura marca el
+    día como estudiado y recalcula la racha con el bitmap de días, todo
+    dentro de la misma transacción que lee el progreso actual.
+    """
+    now = now or datetime.now(UTC)
+    await _require_topic(progress.topic_id)
+
+    def compute(existing):
+        if existing is None:
+            fields = progress.model_dump(exclude={'user_id', 'topic_id'})
+            fields['created_at'] = now
+        else:
+            fields = progress.model_dump(exclude={'user_id', 'topic_id'}, exclude_unset=True)
+        return _reviewed(existing, fields, now)
+
+    existing, fields = await progress_repository.update_progress(
+        progress.user_id, progress.topic_id, compute)
+    return await _finish(progress.user_id, progress.topic_id, existing, fields)
+
+
+async def update_user_progress(user_id, topic_id, update: ProgressUpdate,
+                               now: datetime | None = None) -> ProgressResponse:
+    """
+    Actualizar parcialmente un progreso existente
+    """
+    now = now or datetime.now(UTC)
+
+    def compute(existing):
+        if existing is None:
+            raise NotFoundError(f"Progreso no encontrado para el tema: {topic_id}")
+        return _reviewed(existing, update.model_dump(exclude_none=True), now)
+
+    existing, fields = await progress_repository.update_progress(user_id, topic_id, compute)
+    return await _finish(user_id, topic_id, existing, fields)
+
+
+def _bulk_compute(fields, now):
+    def compute(existing):
+        if existing is None and 'status' not in fields:
+            # Sin status no se puede crear: no se escribe nada
+            return None
+        update = _reviewed(existing, fields, now)
+        if existing is None:
+            update['created_at'] = now
+        return update
+    return compute
+
+
+async def sync_progress(user_id, items: list[ProgressBulkItem],
+                        now: datetime | None = None) -> ProgressBulkResponse:
+    """
+    Aplicar de una vez los cambios acumulados por un cliente sin conexión.
+
+    Los elementos del mismo tema se combinan en orden (el último valor de cada
+    campo gana) y cada tema se recalcula sobre su progreso actual de forma
+    atómica (una sola transacción con el layout user_map). Cada elemento
+    recibe su propio resultado.
+    """
+    now = now or datetime.now(UTC)
+    merged: dict[str, dict] = {}
+    positions: dict[str, list[int]] = {}
+    for index, item in enumerate(items):
+        fields = item.model_dump(exclude={'topic_id'}, exclude_none=True)
+        merged.setdefault(item.topic_id, {}).update(fields)
+        positions.setdefault(item.topic_id, []).append(index)
+
+    # Todos los temas se validan con una sola carga del loader de la petición
+    topics = await get_loaders().topics.load_many(list(merged))
+    errors: dict[str, str] = {}
+    computes = {}
+    for (topic_id, fields), topic in zip(merged.items(), topics):
+        if topic is None:
+            errors[topic_id] = "Tema no encontrado"
+            continue
+        computes[topic_id] = _bulk_compute(fields, now)
+
+    applied, failed = await progress_repository.update_progress_many(user_id, computes)
+    errors.update(failed)
+    for topic_id, (_, fields) in applied.items():
+        if fields is None:
+            errors[topic_id] = "Se necesita status para crear el progreso"
+
+    response = ProgressBulkResponse(user_id=user_id)
+    for topic_id, indexes in positions.items():
+        if topic_id in errors:
+            result = {'result': 'error', 'error': errors[topic_id]}
+            response.failed += len(indexes)
+        else:
+            current, fields = applied[topic_id]
+            base = current.model_dump(exclude={'id'}) if current is not None else {
+                'user_id': user_id, 'topic_id': topic_id}
+            progress = ProgressResponse(id=progress_repository.progress_doc_id(user_id, topic_id),
+                                        **{**base, **fields})
+            result = {'result': 'updated' if current is not None else 'created',
+                      'progress': progress}
+            if current is not None:
+                response.updated += len(indexes)
+            else:
+                response.created += len(indexes)
+        response.results.extend(ProgressBulkResult(index=i, topic_id=topic_id, **result)
+                                for i in indexes)
+    response.results.sort(key=lambda r: r.index)
+    await refresh_due_entries(user_id, [r.progress for r in response.results
+                                        if r.progress is not None])
+    if len(errors) < len(merged):
+        await invalidate_user_sessions(user_id)
+    return response
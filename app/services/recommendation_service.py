@@ -0,0 +1,335 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.core import config
+from app.core.exceptions import BadRequestError
+from app.models.converters import session_item_from_topic
+from app.repositories import due_queue_repository, progress_repository, topic_repository
+from app.repositories.loaders import get_loaders
+
+logger = logging.getLogger(__name__)
+
+# Prioridad de un tema que el usuario nunca ha estudiado
+NEW_TOPIC_PRIORITY = 10.0
+
+# Prioridad base por status; un status desconocido se trata como 'not-started'
+STATUS_BASE_PRIORITY = {
+    'not-started': 8.0,
+    'in-progress': 5.0,
+    'completed': 2.0,
+}
+DEFAULT_STATUS_PRIORITY = STATUS_BASE_PRIORITY['not-started']
+
+# (días sin revisar, bonus), de mayor a menor: solo se aplica el primero que se cumple
+AGE_BONUSES = ((30, 8.0), (14, 5.0), (7, 3.0))
+
+# Ajustes por confianza (cuanto menor, más urgente) y por racha (cuanto mayor, menos urgente)
+MAX_CONFIDENCE = 5
+CONFIDENCE_WEIGHT = 0.5
+STREAK_WEIGHT = 0.25
+STREAK_CAP = 8
+
+# Intervalo base de repaso en días por status; se multiplica por la confianza
+# y crece con la racha (ver next_due_at)
+REVIEW_INTERVAL_DAYS = {
+    'not-started': 0.0,
+    'in-progress': 1.0,
+    'completed': 7.0,
+}
+
+# Códigos de status para el cálculo vectorizado; 0 = sin progreso
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_BASE_PRIORITY, start=1)}
+_STATUS_PRIORITY_TABLE = np.array(
+    [NEW_TOPIC_PRIORITY, *STATUS_BASE_PRIORITY.values()], dtype=np.float64)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def days_since_review(user_progress, now: datetime) -> float:
+    """
+    Días desde la última revisión (last_reviewed_at, o updated_at si no hay)
+    """
+    reviewed_at = user_progress.last_reviewed_at or user_progress.updated_at
+    return (_as_utc(now) - _as_utc(reviewed_at)).total_seconds() / 86400
+
+
+def calculate_topic_priority(topic, user_progress, now: datetime | None = None) -> float:
+    """
+    Calcular la prioridad de un tema (mayor = más urgente estudiar).
+
+    Implementación de referencia, un tema a la vez; score_topics() hace el
+    mismo cálculo para todo el catálogo en una sola pasada.
+    """
+    if user_progress is None:
+        return NEW_TOPIC_PRIORITY
+
+    now = now or datetime.now(timezone.utc)
+    priority = STATUS_BASE_PRIORITY.get(user_progress.status, DEFAULT_STATUS_PRIORITY)
+
+    days = days_since_review(user_progress, now)
+    for threshold, bonus in AGE_BONUSES:
+        if days > threshold:
+            priority += bonus
+            break
+
+    priority += (MAX_CONFIDENCE - user_progress.confidence_level) * CONFIDENCE_WEIGHT
+    priority -= min(user_progress.streak, STREAK_CAP) * STREAK_WEIGHT
+    return priority
+
+
+@dataclass
+class ProgressColumns:
+    """
+    Progreso de un usuario en formato columnar, alineado con una lista de temas
+    """
+    status: np.ndarray             # int8, código de STATUS_CODES (0 = sin progreso)
+    confidence: np.ndarray         # float64
+    days_since_review: np.ndarray  # float64
+    streak: np.ndarray             # float64
+
+
+def build_progress_columns(topic_ids, progress_map, now: datetime | None = None) -> ProgressColumns:
+    """
+    Construir las columnas para `topic_ids` a partir de {topic_id: progreso}.
+    Solo se recorren los temas con progreso; el resto queda con los valores por defecto.
+    """
+    now = now or datetime.now(timezone.utc)
+    size = len(topic_ids)
+    columns = ProgressColumns(
+        status=np.zeros(size, dtype=np.int8),
+        confidence=np.full(size, MAX_CONFIDENCE, dtype=np.float64),
+        days_since_review=np.zeros(size, dtype=np.float64),
+        streak=np.zeros(size, dtype=np.float64),
+    )
+
+    positions = {topic_id: i for i, topic_id in enumerate(topic_ids)}
+    unknown_code = STATUS_CODES['not-started']
+    for topic_id, progress in progress_map.items():
+        i = positions.get(topic_id)
+        if i is None or progress is None:
+            continue
+        columns.status[i] = STATUS_CODES.get(progress.status, unknown_code)
+        columns.confidence[i] = progress.confidence_level
+        columns.days_since_review[i] = days_since_review(progress, now)
+        columns.streak[i] = progress.streak
+    return columns
+
+
+def score_topics(columns: ProgressColumns) -> np.ndarray:
+    """
+    Calcular la prioridad de todos los temas en una pasada vectorizada.
+    Aplica las mismas operaciones y en el mismo orden que calculate_topic_priority.
+    """
+    days = columns.days_since_review
+    age_bonus = np.select([days > threshold for threshold, _ in AGE_BONUSES],
+                          [bonus for _, bonus in AGE_BONUSES], default=0.0)
+
+    priority = _STATUS_PRIORITY_TABLE[columns.status]
+    priority = priority + age_bonus
+    priority = priority + (MAX_CONFIDENCE - columns.confidence) * CONFIDENCE_WEIGHT
+    priority = priority - np.minimum(columns.streak, STREAK_CAP) * STREAK_WEIGHT
+    return np.where(columns.status == 0, NEW_TOPIC_PRIORITY, priority)
+
+
+def rank_topics(topics, progress_map, now: datetime | None = None):
+    """
+    Ordenar temas por prioridad (desempate por id) con la función de referencia.
+    Devuelve una lista de (prioridad, tema).
+    """
+    now = now or datetime.now(timezone.utc)
+    scored = [(calculate_topic_priority(topic, progress_map.get(topic.id), now), topic)
+              for topic in topics]
+    scored.sort(key=lambda item: (-item[0], item[1].id))
+    return scored
+
+
+def rank_topics_vectorized(topics, progress_map, now: datetime | None = None):
+    """
+    Igual que rank_topics(), pero puntuando el catálogo con score_topics()
+    """
+    topic_ids = [topic.id for topic in topics]
+    scores = score_topics(build_progress_columns(topic_ids, progress_map, now))
+    order = np.lexsort((np.array(topic_ids), -scores))
+    return [(float(scores[i]), topics[i]) for i in order]
+
+
+def select_top_topics(topics, progress_map, limit, now: datetime | None = None):
+    """
+    Elegir los `limit` temas más prioritarios con un heap acotado, O(n log k),
+    sin ordenar todo el catálogo. Devuelve (prioridad, tema) de mayor a menor,
+    con el mismo orden que rank_topics().
+    """
+    if limit <= 0 or not topics:
+        return []
+    topic_ids = [topic.id for topic in topics]
+    scores = score_topics(build_progress_columns(topic_ids, progress_map, now))
+    best = heapq.nsmallest(limit, zip(scores.tolist(), range(len(topics))),
+                           key=lambda item: (-item[0], topic_ids[item[1]]))
+    return [(priority, topics[i]) for priority, i in best]
+
+
+def next_due_at(user_progress) -> datetime:
+    """
+    Momento en que conviene volver a repasar un tema, según su progreso
+    """
+    interval = REVIEW_INTERVAL_DAYS.get(user_progress.status, REVIEW_INTERVAL_DAYS['not-started'])
+    interval *= user_progress.confidence_level
+    interval *= 1 + min(user_progress.streak, STREAK_CAP) * STREAK_WEIGHT
+    reviewed_at = user_progress.last_reviewed_at or user_progress.updated_at
+    return _as_utc(reviewed_at) + timedelta(days=interval)
+
+
+def build_due_queue(progress_items):
+    """
+    Construir la cola de repaso {topic_id: vence} a partir de progresos
+    """
+    return {progress.topic_id: next_due_at(progress) for progress in progress_items}
+
+
+def select_due_topics(due_queue, catalog, limit, now: datetime | None = None):
+    """
+    Elegir los `limit` temas que antes vencen, sin puntuar el catálogo.
+
+    Los temas sin progreso cuentan como vencidos en `now`: van detrás de los
+    atrasados y delante de los que vencen más tarde. Solo se recorren del
+    catálogo (ordenado por id) los temas nuevos necesarios.
+    """
+    if limit <= 0:
+        return []
+    now = _as_utc(now or datetime.now(timezone.utc))
+    queued = heapq.nsmallest(limit, ((_as_utc(due), topic_id)
+                                     for topic_id, due in due_queue.items()
+                                     if catalog.get(topic_id) is not None))
+    new_topics = itertools.islice((topic for topic in catalog.iter_sorted()
+                                   if topic.id not in due_queue), limit)
+    merged = heapq.merge(queued, ((now, topic.id) for topic in new_topics))
+    return [catalog.get(topic_id) for _, topic_id in itertools.islice(merged, limit)]
+
+
+async def rebuild_due_queue(user_id):
+    """
+    Reconstruir la cola de repaso de un usuario desde su progreso
+    """
+    due_queue = build_due_queue(await progress_repository.get_user_progress(user_id))
+    await due_queue_repository.replace_due_queue(user_id, due_queue)
+    return due_queue
+
+
+async def refresh_due_entries(user_id, progress_items):
+    """
+    Actualizar en la cola las entradas de los progresos recién escritos. Un
+    fallo solo se registra: la cola se puede reconstruir con rebuild_due_queue().
+    """
+    if not config.due_queue_enabled or not progress_items:
+        return
+    try:
+        await due_queue_repository.update_due_entries(user_id, build_due_queue(progress_items))
+    except Exception as e:
+        logger.error(f"Error updating due queue for {user_id}: {e}")
+
+
+class _LoadedTopics:
+    """
+    Lo que select_due_topics usa del catálogo (get e iter_sorted), sobre los
+    temas leídos del backend cuando el cache está desactivado
+    """
+
+    def __init__(self, topics):
+        self._topics = dict(sorted(topics.items()))
+
+    def get(self, topic_id):
+        return self._topics.get(topic_id)
+
+    def iter_sorted(self):
+        return iter(self._topics.values())
+
+
+async def _load_due_topics(due_queue, limit):
+    """
+    Temas de la cola por orden de vencimiento, leídos con get_many por lotes
+    hasta tener `limit` que existan (la cola puede tener temas ya borrados)
+    """
+    ordered = [topic_id for _, topic_id in sorted((_as_utc(due), topic_id)
+                                                  for topic_id, due in due_queue.items())]
+    found = {}
+    for start in range(0, len(ordered), limit):
+        found.update(await topic_repository.get_topics_many(ordered[start:start + limit]))
+        if len(found) >= limit:
+            break
+    return found
+
+
+async def _select_from_due_queue(user_id, limit, now):
+    if limit <= 0:
+        return []
+    if config.topics_cache_enabled:
+        due_queue, _ = await asyncio.gather(
+            due_queue_repository.get_due_queue(user_id),
+            topic_repository.get_catalog().ensure_loaded(),
+        )
+    else:
+        due_queue = await due_queue_repository.get_due_queue(user_id)
+    if due_queue is None:
+        due_queue = await rebuild_due_queue(user_id)
+    if config.topics_cache_enabled:
+        return select_due_topics(due_queue, topic_repository.get_catalog(), limit, now)
+
+    due_topics, new_topics = await asyncio.gather(
+        _load_due_topics(due_queue, limit),
+        topic_repository.first_topics(limit, exclude=due_queue),
+    )
+    topics = _LoadedTopics({**due_topics, **{topic.id: topic for topic in new_topics}})
+    return select_due_topics(due_queue, topics, limit, now)
+
+
+async def _load_requested(user_id, topic_ids):
+    """
+    Temas pedidos y el progreso del usuario en ellos, con los loaders de la
+    petición: un get_many por lote sea cual sea el número de temas
+    """
+    requested = list(dict.fromkeys(topic_ids))
+    loaders = get_loaders()
+    topics, progress = await asyncio.gather(
+        loaders.topics.load_many(requested),
+        loaders.progress.load_many([(user_id, topic_id) for topic_id in requested]),
+    )
+    missing = [topic_id for topic_id, topic in zip(requested, topics) if topic is None]
+    if missing:
+        raise BadRequestError(f"Temas no encontrados: {', '.join(missing)}")
+    progress_map = {topic_id: item for topic_id, item in zip(requested, progress)
+                    if item is not None}
+    return topics, progress_map
+
+
+async def generate_daily_session(user_id, limit=5, topic_ids=None, now: datetime | None = None):
+    """
+    Generador async de la sesión diaria: produce un SessionItem por tema elegido.
+    Si se pasan `topic_ids`, solo se consideran esos temas y se leen, junto
+    con su progreso, con los loaders de la petición; si no, el catálogo y el
+    progreso del usuario se leen en paralelo. Con la cola de repaso activa
+    (y sin `topic_ids`) se leen sus primeras entradas en lugar de puntuar.
+    """
+    if config.due_queue_enabled and not topic_ids:
+        selected = await _select_from_due_queue(user_id, limit, now)
+    elif topic_ids:
+        topics, progress_map = await _load_requested(user_id, topic_ids)
+        selected = [topic for _, topic in select_top_topics(topics, progress_map, limit, now)]
+    else:
+        topics, progress_map = await asyncio.gather(
+            topic_repository.get_all_topics(),
+            progress_repository.get_user_progress_map(user_id),
+        )
+        selected = [topic for _, topic in select_top_topics(topics, progress_map, limit, now)]
+
+    for topic in selected:
+        yield session_item_from_topic(topic)
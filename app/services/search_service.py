@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from app.core.text_search import InvertedIndex, tokenize
+from app.models.topic import TopicResponse, TopicSearchItem
+from app.repositories.topic_repository import get_catalog
+
+logger = logging.getLogger(__name__)
+
+# Un término del título cuenta como varios de los detalles
+TITLE_WEIGHT = 3
+CATEGORY_WEIGHT = 2
+
+
+def topic_terms(topic: TopicResponse) -> Counter:
+    """
+    Términos de un tema con su frecuencia ponderada por campo
+    """
+    terms = Counter()
+    for token in tokenize(topic.title):
+        terms[token] += TITLE_WEIGHT
+    for token in tokenize(topic.category_id.replace('-', ' ')):
+        terms[token] += CATEGORY_WEIGHT
+    for detail in topic.details:
+        terms.update(tokenize(detail))
+    return terms
+
+
+class TopicSearchIndex:
+    """
+    Índice de búsqueda sobre el catálogo de temas en memoria.
+
+    Se sincroniza con la versión del catálogo al buscar: solo se reindexan los
+    temas añadidos, modificados o borrados desde la última sincronización, y
+    las búsquedas no hacen lecturas al backend.
+    """
+
+    def __init__(self, catalog=None):
+        self._catalog = catalog
+        self._index = InvertedIndex()
+        self._topics: dict[str, TopicResponse] = {}
+        self._version = None
+        self._lock = threading.Lock()
+        self._counters = {'searches': 0, 'syncs': 0, 'reindexed': 0, 'removed': 0}
+        self._last_sync_seconds = None
+
+    @property
+    def catalog(self):
+        return self._catalog or get_catalog()
+
+    def sync(self):
+        """
+        Aplicar al índice los cambios del catálogo desde la última versión vista
+        """
+        catalog = self.catalog
+        if catalog.version == self._version:
+            return
+        with self._lock:
+            version = catalog.version
+            if version == self._version:
+                return
+            start = time.perf_counter()
+            current = {topic.id: topic for topic in catalog.iter_sorted()}
+            removed = [topic_id for topic_id in self._topics if topic_id not in current]
+            changed = [topic for topic_id, topic in current.items()
+                       if self._topics.get(topic_id) != topic]
+            for topic_id in removed:
+                self._index.remove(topic_id)
+            for topic in changed:
+                self._index.upsert(topic.id, topic_terms(topic))
+            self._topics = current
+            self._version = version
+            self._counters['syncs'] += 1
+            self._counters['reindexed'] += len(changed)
+            self._counters['removed'] += len(removed)
+            self._last_sync_seconds = time.perf_counter() - start
+        if changed or removed:
+            logger.info(f"Topic search index synced to catalog version {version}: "
+                        f"{len(changed)} reindexed, {len(removed)} removed.")
+
+    async def search(self, query, limit=10, category_id=None) -> list[TopicSearchItem]:
+        """
+        Temas que mejor coinciden con la consulta, de mayor a menor puntuación
+        """
+        await self.catalog.ensure_loaded()
+        self.sync()
+        self._counters['searches'] += 1
+        topics = self._topics
+        accept = None
+        if category_id is not None:
+            def accept(topic_id):
+                return topics[topic_id].category_id == category_id
+        return [TopicSearchItem(id=topic_id, title=topics[topic_id].title,
+                                category_id=topics[topic_id].category_id,
+                                score=round(score, 4))
+                for topic_id, score in self._index.search(query, limit, accept=accept)]
+
+    def stats(self):
+        return {**self._counters, **self._index.stats(), 'version': self._version,
+                'last_sync_seconds': self._last_sync_seconds}
+
+
+_search_index = TopicSearchIndex()
+
+
+def get_search_index():
+    return _search_index
+
+
+async def search_topics(query, limit=10, category_id=None):
+    """
+    Búsqueda de texto completo en el catálogo (sin acentos, por prefijo y con BM25)
+    """
+    return await _search_index.search(query, limit, category_id)
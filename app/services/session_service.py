@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core import config
+from app.core.exceptions import BadRequestError
+from app.models.session import SessionResponse
+from app.repositories import session_repository
+from app.services.recommendation_service import generate_daily_session
+
+logger = logging.getLogger(__name__)
+
+
+class SessionMemo:
+    """
+    LRU de sesiones diarias por session_id, con un índice por usuario para
+    invalidar todas las de un usuario de una vez. El TTL acota cuánto puede
+    servir una réplica una sesión que otra ya invalidó.
+
+    Cada invalidación sube la época del usuario: quien leyó o generó una
+    sesión pasa la época que vio al empezar y put() la descarta si hubo una
+    invalidación entre medias.
+    """
+
+    def __init__(self, max_entries=1000, ttl_seconds=60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, SessionResponse]] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._epochs: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _discard(self, session_id):
+        _, session = self._entries.pop(session_id)
+        keys = self._by_user.get(session.user_id)
+        if keys is not None:
+            keys.discard(session_id)
+            if not keys:
+                del self._by_user[session.user_id]
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    self._discard(session_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry[1]
+
+    def epoch(self, user_id):
+        with self._lock:
+            return self._epochs.get(user_id, 0)
+
+    def put(self, session: SessionResponse, epoch=None):
+        with self._lock:
+            if epoch is not None and self._epochs.get(session.user_id, 0) != epoch:
+                return False
+            if session.session_id in self._entries:
+                self._discard(session.session_id)
+            self._entries[session.session_id] = (self._clock(), session)
+            self._by_user.setdefault(session.user_id, set()).add(session.session_id)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+            return True
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for session_id in list(self._by_user.get(user_id, ())):
+                self._discard(session_id)
+            self._epochs[user_id] = self._epochs.get(user_id, 0) + 1
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+                'size': len(self._entries)}
+
+
+_memo = SessionMemo(config.session_memo_cache_size, config.session_memo_ttl_seconds)
+
+
+def get_session_memo():
+    return _memo
+
+
+def resolve_timezone(name):
+    """
+    ZoneInfo de una zona IANA (UTC si no se indica)
+    """
+    if not name:
+        return UTC
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise BadRequestError(f"Zona horaria no válida: {name}")
+
+
+def inputs_hash(topic_ids, limit):
+    """
+    Hash estable de las entradas de la sesión: los temas pedidos (sin orden
+    ni duplicados) y el límite
+    """
+    key = ','.join(sorted(set(topic_ids or ()))) + f'|{limit}'
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def daily_session_id(user_id, local_date, digest):
+    """
+    ID determinista de la sesión de un usuario para un día y unas entradas
+    """
+    return f'{user_id}_{local_date}_{digest}'
+
+
+async def _generate(session, items, local_date, digest, version, epoch):
+    """
+    Ir añadiendo a la sesión los temas que se eligen y guardarla al terminar.
+
+    Una invalidación que llegue mientras se genera (una escritura de progreso
+    en esta u otra réplica) haría guardar una sesión ya obsoleta. Por eso se
+    guarda y después se vuelve a leer la versión: si cambió desde que se
+    empezó, se borra lo guardado. La invalidación sube la versión antes de
+    borrar, así que en cualquier orden la sesión obsoleta no sobrevive. En el
+    LRU solo entra si la época del usuario no cambió desde que se empezó.
+    """
+    async for item in items:
+        session.topics.append(item)
+        yield item
+    await session_repository.save_session(session, local_date, digest)
+    if await session_repository.get_sessions_version(session.user_id) != version:
+        await session_repository.delete_session(session.session_id)
+        return
+    _memo.put(session, epoch)
+
+
+async def open_today_session(user_id, topic_ids=None, limit=5, timezone=None,
+                             now: datetime | None = None):
+    """
+    Sesión del día local del usuario para estas entradas. Devuelve
+    (session, items): si ya existe (en el LRU o en la colección 'sessions')
+    `items` es None; si no, `session` aún no tiene temas e `items` es un
+    iterador async que los va eligiendo y guarda la sesión al agotarse.
+    """
+    now = now or datetime.now(UTC)
+    local_date = now.astimezone(resolve_timezone(timezone)).date().isoformat()
+    digest = inputs_hash(topic_ids, limit)
+    session_id = daily_session_id(user_id, local_date, digest)
+
+    session = _memo.get(session_id)
+    if session is not None:
+        return session, None
+
+    epoch = _memo.epoch(user_id)
+    session, version = await asyncio.gather(session_repository.get_session(session_id),
+                                            session_repository.get_sessions_version(user_id))
+    if session is not None:
+        _memo.put(session, epoch)
+        return session, None
+
+    session = SessionResponse(session_id=session_id, user_id=user_id, created_at=now, topics=[])
+    items = generate_daily_session(user_id, limit, topic_ids, now)
+    return session, _generate(session, items, local_date, digest, version, epoch)
+
+
+async def get_today_session(user_id, topic_ids=None, limit=5, timezone=None,
+                            now: datetime | None = None) -> SessionResponse:
+    """
+    Sesión del día local del usuario para estas entradas. Se genera una sola
+    vez: las llamadas siguientes del mismo día devuelven la misma sesión
+    hasta que un cambio de progreso la invalida.
+    """
+    session, items = await open_today_session(user_id, topic_ids, limit, timezone, now)
+    if items is not None:
+        async for _ in items:
+            pass
+    return session
+
+
+async def invalidate_user_sessions(user_id, now: datetime | None = None):
+    """
+    Descartar las sesiones memorizadas de un usuario tras un cambio de progreso.
+    Se borran los días locales que pueden ser "hoy" en alguna zona horaria
+    (el día UTC y los adyacentes). Primero se sube la versión de
+    invalidación, para que una sesión que se esté generando no se guarde, y
+    después se vacía el LRU: así nada de lo que se generó con la versión
+    anterior puede volver a entrar en él. Un fallo solo se registra.
+    """
+    if not config.session_memo_enabled:
+        return
+    today = (now or datetime.now(UTC)).astimezone(UTC).date()
+    local_dates = [(today + timedelta(days=offset)).isoformat() for offset in (-1, 0, 1)]
+    try:
+        await session_repository.bump_sessions_version(user_id)
+    except Exception as e:
+        logger.error(f"Error bumping the sessions version for {user_id}: {e}")
+    finally:
+        _memo.invalidate_user(user_id)
+    try:
+        await session_repository.delete_user_sessions(user_id, local_dates)
+    except Exception as e:
+        logger.error(f"Error invalidating daily sessions for {user_id}: {e}")
@@ -0,0 +1,95 @@
+from datetime import date, datetime
+
+# Días que recuerda el bitmap: los enteros de Firestore son de 64 bits con
+# signo, así que se usan 63 bits para que el valor nunca sea negativo
+STUDY_WINDOW_DAYS = 63
+_WINDOW_MASK = (1 << STUDY_WINDOW_DAYS) - 1
+
+
+def _as_date(value) -> date | None:
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(value)
+
+
+def record_study_day(study_days, study_anchor, day):
+    """
+    Marcar `day` como día de estudio. El bit 0 es el día `study_anchor` y el
+    bit i, i días antes; un día posterior al ancla desplaza el bitmap y pasa
+    a ser el ancla. Devuelve (study_days, study_anchor en ISO).
+    """
+    day = _as_date(day)
+    anchor = _as_date(study_anchor)
+    if anchor is None or not study_days:
+        return 1, day.isoformat()
+
+    offset = (day - anchor).days
+    if offset > 0:
+        study_days = (study_days << offset | 1) & _WINDOW_MASK if offset < STUDY_WINDOW_DAYS else 1
+        anchor = day
+    elif -offset < STUDY_WINDOW_DAYS:
+        study_days |= 1 << -offset
+    return study_days, anchor.isoformat()
+
+
+def _trailing_ones(bits):
+    return (~bits & (bits + 1)).bit_length() - 1
+
+
+def current_streak(study_days, study_anchor, today):
+    """
+    Días consecutivos de estudio que terminan hoy o ayer (la racha sigue viva
+    hasta que pasa un día entero sin estudiar)
+    """
+    anchor = _as_date(study_anchor)
+    if anchor is None or not study_days:
+        return 0
+    gap = (_as_date(today) - anchor).days
+    if gap > 1:
+        return 0
+    if gap < 0:
+        # Ancla en el futuro respecto a `today` (relojes desfasados): contar desde today
+        study_days >>= -gap
+    return _trailing_ones(study_days)
+
+
+def longest_streak(study_days):
+    """
+    Racha más larga dentro de la ventana del bitmap. No es de coste
+    constante: cada paso acorta todas las rachas en un día, así que hace
+    tantas iteraciones como días tiene la racha más larga (como mucho
+    STUDY_WINDOW_DAYS).
+    """
+    length = 0
+    while study_days:
+        study_days &= study_days << 1
+        length += 1
+    return length
+
+
+def study_day_fields(existing, day):
+    """
+    Campos de racha del progreso tras estudiar en `day`: bitmap, ancla, racha
+    actual y la más larga registrada (que también cubre lo que ya salió de
+    la ventana).
+
+    Un día en el ancla o posterior solo alarga la racha actual, así que basta
+    con compararla con la más larga guardada. Solo un día anterior al ancla
+    (un cliente que sincroniza tarde) puede unir dos rachas pasadas, y
+    entonces se recorre el bitmap.
+    """
+    previous_anchor = _as_date(getattr(existing, 'study_anchor', None))
+    study_days, study_anchor = record_study_day(
+        getattr(existing, 'study_days', 0), previous_anchor, day)
+    streak = current_streak(study_days, study_anchor, day)
+    longest = max(getattr(existing, 'longest_streak', 0) or 0, streak)
+    if previous_anchor is not None and _as_date(day) < previous_anchor:
+        longest = max(longest, longest_streak(study_days))
+    return {
+        'study_days': study_days,
+        'study_anchor': study_anchor,
+        'streak': streak,
+        'longest_streak': longest,
+    }
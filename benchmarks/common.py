@@ -0,0 +1,77 @@
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, UTC
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+
+
+def measure(func, *args, repeat=5):
+    """
+    Mejor tiempo de `repeat` ejecuciones de func(*args), en segundos
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Percentil por el método del rango más cercano sobre muestras ya ordenadas
+    """
+    if not sorted_samples:
+        return None
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def latency_summary(samples, elapsed):
+    """
+    p50/p95/p99 (ms) y peticiones por segundo de una lista de latencias en segundos
+    """
+    ordered = sorted(samples)
+    to_ms = (lambda value: round(value * 1000, 3) if value is not None else None)
+    return {
+        'requests': len(ordered),
+        'rps': round(len(ordered) / elapsed, 1) if elapsed > 0 else None,
+        'p50_ms': to_ms(percentile(ordered, 0.50)),
+        'p95_ms': to_ms(percentile(ordered, 0.95)),
+        'p99_ms': to_ms(percentile(ordered, 0.99)),
+        'max_ms': to_ms(ordered[-1] if ordered else None),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': datetime.now(UTC).isoformat(),
+    }
+
+
+def save_results(results, path=None):
+    """
+    Guardar los resultados en JSON (por defecto en benchmarks/results/<commit>-<fecha>.json)
+    """
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(UTC).strftime('%Y%m%dT%H%M%S')
+        path = os.path.join(RESULTS_DIR, f"{results['environment']['commit'] or 'local'}-{stamp}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return path
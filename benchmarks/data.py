@@ -0,0 +1,71 @@
+import random
+from datetime import datetime, timedelta, UTC
+
+from app.repositories.backends import MAX_BATCH_SIZE, WriteOp
+from app.repositories.progress_repository import PROGRESS_COLLECTION, progress_doc_id
+from app.repositories.topic_repository import TOPICS_COLLECTION
+
+STATUSES = ('not-started', 'in-progress', 'completed')
+# Peso de cada status en un historial realista: la mayoría está en curso o completado
+STATUS_WEIGHTS = (1, 3, 4)
+
+
+def generate_topics(count, categories=20, seed=0):
+    """
+    Temas sintéticos: [(id, data)] repartidos entre `categories` categorías
+    """
+    rng = random.Random(seed)
+    topics = []
+    for i in range(count):
+        details = [f'Detalle {i}.{j}: ' + 'lorem ipsum ' * rng.randint(1, 6)
+                   for j in range(rng.randint(1, 8))]
+        topics.append((f'topic-{i:06d}', {
+            'title': f'Tema {i}',
+            'category_id': f'categoria-{i % categories}',
+            'details': details,
+        }))
+    return topics
+
+
+def generate_progress(user_ids, topic_ids, studied_fraction=0.3, seed=0, now=None):
+    """
+    Historiales de progreso: cada usuario estudió una fracción del catálogo,
+    con revisiones repartidas en los últimos 90 días
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(UTC)
+    records = []
+    per_user = max(0, min(len(topic_ids), round(len(topic_ids) * studied_fraction)))
+    for user_id in user_ids:
+        for topic_id in rng.sample(topic_ids, per_user):
+            reviewed_at = now - timedelta(days=rng.uniform(0, 90))
+            created_at = reviewed_at - timedelta(days=rng.uniform(0, 30))
+            records.append((progress_doc_id(user_id, topic_id), {
+                'user_id': user_id,
+                'topic_id': topic_id,
+                'status': rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                'notes': '',
+                'confidence_level': rng.randint(1, 5),
+                'streak': rng.randint(0, 12),
+                'last_reviewed_at': reviewed_at,
+                'created_at': created_at,
+                'updated_at': reviewed_at,
+            }))
+    return records
+
+
+def populate(backend, users=100, topics=1000, studied_fraction=0.3, seed=0):
+    """
+    Poblar un backend síncrono con datos sintéticos. Devuelve (user_ids, topic_ids).
+    """
+    topic_docs = generate_topics(topics, seed=seed)
+    user_ids = [f'user-{i:05d}' for i in range(users)]
+    topic_ids = [doc_id for doc_id, _ in topic_docs]
+    progress_docs = generate_progress(user_ids, topic_ids, studied_fraction, seed=seed)
+
+    operations = [WriteOp('set', TOPICS_COLLECTION, doc_id, data) for doc_id, data in topic_docs]
+    operations += [WriteOp('set', PROGRESS_COLLECTION, doc_id, data)
+                   for doc_id, data in progress_docs]
+    for start in range(0, len(operations), MAX_BATCH_SIZE):
+        backend.write_batch(operations[start:start + MAX_BATCH_SIZE])
+    return user_ids, topic_ids
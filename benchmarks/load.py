@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import random
+import time
+
+import httpx
+from fastapi import Request
+
+from app.core import config
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.repositories.backends import (AsyncMemoryBackend, MemoryBackend, set_async_backend,
+                                       set_backend)
+from app.repositories.topic_repository import get_catalog
+from benchmarks.common import latency_summary
+from benchmarks.data import populate
+
+# Cabecera con la que el driver indica el usuario (sustituye al ID token)
+USER_HEADER = 'X-Benchmark-User'
+
+
+def _benchmark_user(request: Request):
+    return {'uid': request.headers[USER_HEADER]}
+
+
+def _get_topics(rng, user_id, topic_ids):
+    return 'GET', '/api/v1/topics', None
+
+
+def _session_today(rng, user_id, topic_ids):
+    return 'POST', '/api/v1/sessions/today', {'user_id': user_id, 'topic_ids': []}
+
+
+def _record_progress(rng, user_id, topic_ids):
+    return 'POST', '/api/v1/progress', {
+        'user_id': user_id, 'topic_id': rng.choice(topic_ids),
+        'status': rng.choice(['in-progress', 'completed']),
+        'confidence_level': rng.randint(1, 5)}
+
+
+SCENARIOS = {
+    'topics': _get_topics,
+    'session': _session_today,
+    'progress': _record_progress,
+}
+
+
+class LoadEnvironment:
+    """
+    La aplicación real sobre un backend en memoria poblado con datos sintéticos
+    y con la autenticación sustituida por una cabecera. El control de
+    admisión se desactiva: se mide la aplicación, no el limitador.
+    """
+
+    def __init__(self, users=100, topics=1000, studied_fraction=0.3, seed=0):
+        self.backend = MemoryBackend()
+        self.user_ids, self.topic_ids = populate(self.backend, users, topics,
+                                                 studied_fraction, seed)
+
+    def __enter__(self):
+        set_backend(self.backend)
+        set_async_backend(AsyncMemoryBackend(self.backend))
+        get_catalog().stop()
+        get_catalog().invalidate()
+        app.dependency_overrides[get_current_user] = _benchmark_user
+        self._admission_enabled, config.admission_enabled = config.admission_enabled, False
+        return self
+
+    def __exit__(self, *exc):
+        app.dependency_overrides.pop(get_current_user, None)
+        config.admission_enabled = self._admission_enabled
+        get_catalog().stop()
+        get_catalog().invalidate()
+        set_async_backend(None)
+        set_backend(None)
+
+
+async def run_scenario(env, scenario, requests=1000, concurrency=20, seed=0):
+    """
+    Lanzar `requests` peticiones del escenario con `concurrency` clientes
+    concurrentes. Devuelve las latencias resumidas y los errores.
+    """
+    build = SCENARIOS[scenario]
+    rng = random.Random(seed)
+    pending = itertools.count()
+    latencies = []
+    errors = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        async def worker():
+            while next(pending) < requests:
+                user_id = rng.choice(env.user_ids)
+                method, url, payload = build(rng, user_id, env.topic_ids)
+                start = time.perf_counter()
+                response = await client.request(method, url, json=payload,
+                                                headers={USER_HEADER: user_id})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+        # Una petición previa para cargar el catálogo fuera de la medición
+        await client.get('/api/v1/topics?limit=1')
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {**latency_summary(latencies, elapsed), 'concurrency': concurrency, 'errors': errors}
+
+
+def run(scenarios=tuple(SCENARIOS), users=100, topics=1000, requests=1000, concurrency=20,
+        seed=0):
+    with LoadEnvironment(users, topics, seed=seed) as env:
+        return {scenario: asyncio.run(run_scenario(env, scenario, requests, concurrency, seed))
+                for scenario in scenarios}
@@ -0,0 +1,48 @@
+from datetime import datetime, UTC
+
+from app.models.converters import progress_from_document, topic_from_document
+from app.repositories.topic_repository import TopicCatalogCache
+from app.services.recommendation_service import (build_due_queue, rank_topics,
+                                                 rank_topics_vectorized, select_due_topics,
+                                                 select_top_topics)
+from benchmarks import serialization
+from benchmarks.common import measure
+from benchmarks.data import generate_progress, generate_topics
+
+
+def scoring_benchmarks(topics=10000, studied_fraction=0.3, limit=5, repeat=5, seed=0):
+    """
+    Tiempo de elegir la sesión de un usuario con cada estrategia, en segundos
+    """
+    now = datetime.now(UTC)
+    topic_docs = generate_topics(topics, seed=seed)
+    topic_list = [topic_from_document(doc_id, data) for doc_id, data in topic_docs]
+    progress_map = {
+        data['topic_id']: progress_from_document(doc_id, data)
+        for doc_id, data in generate_progress(['user-00000'], [t.id for t in topic_list],
+                                              studied_fraction, seed=seed, now=now)
+    }
+    catalog = TopicCatalogCache(listen=False)
+    catalog._replace(topic_docs)
+    due_queue = build_due_queue(progress_map.values())
+
+    return {
+        'topics': topics,
+        'progress': len(progress_map),
+        'seconds': {
+            'rank_reference': measure(rank_topics, topic_list, progress_map, now, repeat=repeat),
+            'rank_vectorized': measure(rank_topics_vectorized, topic_list, progress_map, now,
+                                       repeat=repeat),
+            'select_top_heap': measure(select_top_topics, topic_list, progress_map, limit, now,
+                                       repeat=repeat),
+            'select_due_queue': measure(select_due_topics, due_queue, catalog, limit, now,
+                                        repeat=repeat),
+        },
+    }
+
+
+def run(topics=10000, repeat=5):
+    return {
+        'scoring': scoring_benchmarks(topics, repeat=repeat),
+        'serialization': serialization.run(topics, repeat),
+    }
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+
+# Añadir parent directory al path para importar app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logging
+
+from benchmarks import load, micro
+from benchmarks.common import environment, save_results
+
+# Métricas en las que un valor mayor es una regresión
+LOWER_IS_BETTER = ('seconds', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de las rutas críticas de la API (micro + carga)")
+    parser.add_argument('--users', type=int, default=100, help="Usuarios sintéticos")
+    parser.add_argument('--topics', type=int, default=1000, help="Temas sintéticos")
+    parser.add_argument('--requests', type=int, default=1000, help="Peticiones por escenario")
+    parser.add_argument('--concurrency', type=int, default=20, help="Clientes concurrentes")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones de los micro-benchmarks")
+    parser.add_argument('--scenarios', default=','.join(load.SCENARIOS),
+                        help="Escenarios de carga separados por comas")
+    parser.add_argument('--skip-micro', action='store_true', help="No correr los micro-benchmarks")
+    parser.add_argument('--skip-load', action='store_true', help="No correr la prueba de carga")
+    parser.add_argument('--output', help="Ruta del JSON de resultados")
+    parser.add_argument('--compare', help="JSON de una ejecución anterior para comparar")
+    return parser.parse_args(argv)
+
+
+def _flatten(data, prefix=''):
+    for key, value in data.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            yield from _flatten(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, value
+
+
+def compare(current, previous):
+    """
+    Cambios relativos de las métricas comparables entre dos ejecuciones.
+    Devuelve [(métrica, anterior, actual, cambio en %)].
+    """
+    before = dict(_flatten({k: previous.get(k, {}) for k in ('micro', 'load')}))
+    changes = []
+    for path, value in _flatten({k: current.get(k, {}) for k in ('micro', 'load')}):
+        old = before.get(path)
+        leaf = path.rsplit('.', 1)[-1]
+        tracked = leaf in LOWER_IS_BETTER or leaf == 'rps' or '.seconds.' in path
+        if old and tracked:
+            changes.append((path, old, value, round((value - old) / old * 100, 1)))
+    return changes
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Importar la aplicación configura el logging en INFO: aquí solo interesan avisos
+    logging.getLogger().setLevel(logging.WARNING)
+    results = {
+        'environment': environment(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+    }
+
+    if not args.skip_micro:
+        print("⏱️  Micro-benchmarks...")
+        results['micro'] = micro.run(args.topics, args.repeat)
+        for group, data in results['micro'].items():
+            for name, seconds in data['seconds'].items():
+                print(f"   - {group}.{name:<18} {seconds * 1000:9.3f} ms")
+
+    if not args.skip_load:
+        scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+        print(f"\n🚦 Carga: {args.requests} peticiones x escenario, concurrencia {args.concurrency}...")
+        results['load'] = load.run(scenarios, args.users, args.topics, args.requests,
+                                   args.concurrency)
+        for scenario, summary in results['load'].items():
+            print(f"   - {scenario:<9} {summary['rps']:>8} rps  p50 {summary['p50_ms']} ms  "
+                  f"p95 {summary['p95_ms']} ms  p99 {summary['p99_ms']} ms  "
+                  f"errores {summary['errors'] or 0}")
+
+    path = save_results(results, args.output)
+    print(f"\n💾 Resultados guardados en {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        print(f"\n📊 Comparación con {previous.get('environment', {}).get('commit')}:")
+        for metric, old, new, change in compare(results, previous):
+            print(f"   - {metric:<45} {old:>12.4f} -> {new:>12.4f} ({change:+.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, UTC
+
+# Añadir parent directory al path para importar app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.converters import topic_from_document
+from app.models.topic import TopicResponse
+from benchmarks.common import measure
+
+# El campo de respuesta que FastAPI crea para response_model=list[TopicResponse]
+RESPONSE_FIELD = create_model_field('Response', list[TopicResponse], mode='serialization')
+
+
+def make_documents(size):
+    """
+    Documentos de temas como los devuelve Firestore (to_dict() + id)
+    """
+    now = datetime.now(UTC)
+    return [(f'topic-{i:06d}', {
+        'title': f'Tema {i}',
+        'category_id': f'categoria-{i % 20}',
+        'details': [f'Detalle {i}.{j} con algo de texto de ejemplo' for j in range(5)],
+        'created_at': now,
+        'updated_at': now,
+    }) for i in range(size)]
+
+
+def render(topics, response_class):
+    """
+    Lo que hace FastAPI con lo que devuelve el endpoint: validarlo contra el
+    response_model, volcarlo a tipos JSON y renderizarlo con la clase de respuesta
+    """
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=topics))
+    return response_class(content).body
+
+
+def legacy_path(documents):
+    """
+    Validación completa de cada documento + JSONResponse (json.dumps)
+    """
+    topics = [TopicResponse(id=doc_id, **{k: v for k, v in data.items()
+                                          if k in ('title', 'category_id', 'details')})
+              for doc_id, data in documents]
+    return render(topics, JSONResponse)
+
+
+def app_path(documents):
+    """
+    model_construct sobre datos de confianza + ORJSONResponse (la respuesta por defecto de la app)
+    """
+    topics = [topic_from_document(doc_id, data) for doc_id, data in documents]
+    return render(topics, ORJSONResponse)
+
+
+def run(size=10000, repeat=5):
+    documents = make_documents(size)
+    assert json.loads(legacy_path(documents)) == json.loads(app_path(documents))
+    results = {name: measure(func, documents, repeat=repeat) for name, func in (
+        ('legacy', legacy_path), ('app', app_path))}
+    return {'size': size, 'repeat': repeat, 'seconds': results,
+            'speedup': {name: results['legacy'] / seconds for name, seconds in results.items()}}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Comparar la conversión y serialización de una lista grande de temas")
+    parser.add_argument('--size', type=int, default=10000, help="Número de temas")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por variante")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = run(args.size, args.repeat)
+    print(f"📏 {result['size']} temas, mejor de {result['repeat']} ejecuciones\n")
+    for name, seconds in result['seconds'].items():
+        print(f"   - {name:<7} {seconds * 1000:9.2f} ms  (x{result['speedup'][name]:.1f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# Añadir parent directory al path para importar app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import configure_logging
+from app.repositories import progress_repository
+from app.repositories.backends import close_async_backend
+from app.services.streak_service import longest_streak, record_study_day
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Construir los bitmaps de días de estudio desde las fechas del progreso")
+    parser.add_argument('--user', action='append', dest='users', default=None,
+                        help="Procesar solo este usuario (se puede repetir)")
+    parser.add_argument('--force', action='store_true',
+                        help="Recalcular también los progresos que ya tienen bitmap")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Contar lo que se actualizaría sin escribir nada")
+    return parser.parse_args(argv)
+
+
+def streak_fields_from_history(progress):
+    """
+    Bitmap a partir de las únicas fechas que guarda el progreso (creación,
+    última revisión y última actualización). La racha actual no se toca:
+    es la que se calculó al escribir y se recalcula en la siguiente escritura.
+    """
+    study_days, study_anchor = 0, None
+    for moment in (progress.created_at, progress.last_reviewed_at, progress.updated_at):
+        if moment is not None:
+            study_days, study_anchor = record_study_day(study_days, study_anchor, moment)
+    return {
+        'study_days': study_days,
+        'study_anchor': study_anchor,
+        'longest_streak': max(progress.longest_streak, progress.streak,
+                              longest_streak(study_days)),
+    }
+
+
+async def backfill(users=None, force=False, dry_run=False):
+    """
+    Rellenar study_days, study_anchor y longest_streak. Devuelve
+    {user_id: progresos actualizados}.
+    """
+    users = users or await progress_repository.list_users_with_progress()
+    updated = {}
+    for user_id in users:
+        updates = {progress.topic_id: streak_fields_from_history(progress)
+                   for progress in await progress_repository.get_user_progress(user_id)
+                   if force or progress.study_anchor is None}
+        if updates and not dry_run:
+            failed = await progress_repository.save_progress_many(user_id, updates)
+            if failed:
+                raise RuntimeError(f"{len(failed)} progresos sin escribir para {user_id}")
+        updated[user_id] = len(updates)
+        print(f"✔️ {user_id}: {len(updates)} progresos")
+
+    write_buffer = progress_repository.get_write_buffer()
+    if write_buffer is not None:
+        await write_buffer.close()
+    return updated
+
+
+async def _run(args):
+    try:
+        return await backfill(args.users, args.force, args.dry_run)
+    finally:
+        await close_async_backend()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
+    mode = " (simulación)" if args.dry_run else ""
+    print(f"📅 Construyendo bitmaps de días de estudio{mode}...\n")
+    try:
+        updated = asyncio.run(_run(args))
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        return 1
+    print(f"\n✅ {sum(updated.values())} progresos actualizados de {len(updated)} usuarios.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
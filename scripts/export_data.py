@@ -0,0 +1,426 @@
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import os
+import re
+import time
+from datetime import date, datetime
+
+import orjson
+
+# Añadir parent directory al path para importar app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core import config
+from app.core.config import configure_logging
+from app.repositories.backends import DOCUMENT_ID, close_async_backend, get_async_backend
+from app.repositories.progress_repository import (PROGRESS_COLLECTION, USER_MAP_LAYOUT,
+                                                  USER_PROGRESS_COLLECTION, progress_doc_id)
+from scripts.seed import positive_int
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional: sin él solo se exporta NDJSON
+    pa = pq = None
+
+DEFAULT_OUTPUT_DIR = 'exports'
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_ROW_GROUP_SIZE = 10000
+# Un fichero Parquet solo es legible una vez cerrado: se cierra uno cada tantos row groups
+DEFAULT_ROW_GROUPS_PER_FILE = 10
+CHECKPOINT_FILE = 'checkpoint.json'
+# Columna con los campos que no estaban en el esquema del primer row group
+EXTRA_COLUMN = '_extra'
+# Ficheros que escribe ParquetWriter; cualquier otro del directorio se ignora
+PART_FILE = re.compile(r'part-(\d{5})\.parquet')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Exportar colecciones a NDJSON o Parquet por páginas, con checkpoints")
+    parser.add_argument('--collection', action='append', dest='collections', default=None,
+                        help="Colección a exportar (se puede repetir; por defecto el "
+                             "progreso del layout activo y sessions)")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help="Directorio de salida")
+    parser.add_argument('--format', choices=('auto', 'ndjson', 'parquet'), default='auto',
+                        help="auto = Parquet si pyarrow está instalado, si no NDJSON")
+    parser.add_argument('--page-size', type=positive_int, default=DEFAULT_PAGE_SIZE,
+                        help="Documentos leídos por consulta")
+    parser.add_argument('--row-group-size', type=positive_int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help="Filas por row group (y por checkpoint)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continuar desde el último checkpoint")
+    return parser.parse_args(argv)
+
+
+def default_collections():
+    """
+    El progreso del layout activo (PROGRESS_LAYOUT) y las sesiones
+    """
+    if config.progress_layout == USER_MAP_LAYOUT:
+        return (USER_PROGRESS_COLLECTION, 'sessions')
+    return (PROGRESS_COLLECTION, 'sessions')
+
+
+def resolve_format(name):
+    if name == 'auto':
+        return 'parquet' if pa is not None else 'ndjson'
+    if name == 'parquet' and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    return name
+
+
+# Pipeline: páginas -> registros -> row groups
+
+async def iter_documents(backend, collection, page_size, start_after=None):
+    """
+    Documentos de la colección ordenados por ID, leyendo una página cada vez
+    con el cursor del último documento
+    """
+    cursor = start_after
+    while True:
+        docs = await backend.query(collection, order_by=DOCUMENT_ID, limit=page_size,
+                                   start_after=cursor)
+        for doc in docs:
+            yield doc
+        if len(docs) < page_size:
+            return
+        cursor = docs[-1].id
+
+
+def document_rows(collection, doc):
+    """
+    Filas de un documento. Un documento de user_progress se aplana en una
+    fila por tema, con las mismas columnas que el layout 'documents'.
+    """
+    if collection == USER_PROGRESS_COLLECTION:
+        return [{'id': progress_doc_id(doc.id, topic_id), 'user_id': doc.id,
+                 'topic_id': topic_id, **entry}
+                for topic_id, entry in sorted(doc.data.get('topics', {}).items())]
+    return [{'id': doc.id, **doc.data}]
+
+
+async def iter_records(docs, collection):
+    """
+    (document ID, filas del documento) por cada documento
+    """
+    async for doc in docs:
+        yield doc.id, document_rows(collection, doc)
+
+
+async def iter_row_groups(records, size):
+    """
+    Agrupar las filas en listas de al menos `size` (la única parte que se
+    tiene en memoria a la vez) sin partir un documento entre dos grupos.
+    Devuelve (filas, ID del último documento), que es el cursor para reanudar.
+    """
+    rows, cursor = [], None
+    async for doc_id, doc_rows in records:
+        rows.extend(doc_rows)
+        cursor = doc_id
+        if len(rows) >= size:
+            yield rows, cursor
+            rows = []
+    if rows:
+        yield rows, cursor
+
+
+# Escritores
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class NdjsonWriter:
+    """
+    Un fichero .ndjson por colección. El checkpoint guarda el tamaño del
+    fichero: al reanudar se trunca ahí y se descarta lo escrito después.
+    """
+
+    extension = '.ndjson'
+
+    def __init__(self, path, state=None):
+        self.path = path
+        offset = (state or {}).get('offset')
+        if offset is None:
+            self._file = open(path, 'wb')
+        else:
+            self._file = open(path, 'r+b')
+            self._file.truncate(offset)
+            self._file.seek(offset)
+        self.bytes_written = 0
+
+    def write(self, rows):
+        """
+        Escribir un row group; devuelve el estado a guardar en el checkpoint
+        """
+        data = b''.join(orjson.dumps(row, default=_json_default) + b'\n' for row in rows)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.bytes_written += len(data)
+        return {'offset': self._file.tell()}
+
+    def close(self):
+        self._file.close()
+        return {'offset': os.path.getsize(self.path)}
+
+
+def _parquet_value(value):
+    # Mapas y listas (p. ej. los topics de una sesión) van como JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    return value
+
+
+# Comprobación en Python de que un valor cabe en una columna, por tipo de Arrow
+_KIND_CHECKS = {
+    'int': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'float': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'bool': lambda v: isinstance(v, bool),
+    'string': lambda v: isinstance(v, str),
+    'timestamp': lambda v: isinstance(v, datetime),
+    'date': lambda v: isinstance(v, date) and not isinstance(v, datetime),
+}
+
+
+def _arrow_kind(arrow_type):
+    checks = (('int', pa.types.is_integer), ('float', pa.types.is_floating),
+              ('bool', pa.types.is_boolean), ('string', pa.types.is_string),
+              ('string', pa.types.is_large_string), ('timestamp', pa.types.is_timestamp),
+              ('date', pa.types.is_date))
+    return next((kind for kind, check in checks if check(arrow_type)), None)
+
+
+def conform_row(row, kinds):
+    """
+    Ajustar una fila a las columnas {nombre: tipo} del esquema: los campos
+    que no están en el esquema o cuyo valor no es de su tipo (colecciones
+    sin esquema: un float donde se infirió int, un texto donde había fecha)
+    pasan a EXTRA_COLUMN como JSON y su columna queda vacía
+    """
+    extra = {}
+    conformed = {}
+    for key, value in row.items():
+        if key not in kinds:
+            extra[key] = value
+            continue
+        check = _KIND_CHECKS.get(kinds[key])
+        if value is not None and check is not None and not check(value):
+            extra[key] = value
+            value = None
+        conformed[key] = value
+    conformed[EXTRA_COLUMN] = json.dumps(extra, default=_json_default) if extra else None
+    return conformed
+
+
+class ParquetWriter:
+    """
+    Un directorio por colección con ficheros part-NNNNN.parquet de
+    `row_groups_per_file` row groups. El esquema sale del primer row group;
+    los campos nuevos o con otro tipo van en la columna _extra como JSON
+    (ver conform_row). El checkpoint
+    avanza cuando se cierra un fichero; al reanudar se borran los ficheros
+    a medio escribir.
+    """
+
+    extension = ''
+
+    def __init__(self, path, state=None, row_groups_per_file=DEFAULT_ROW_GROUPS_PER_FILE):
+        self.path = path
+        self.row_groups_per_file = row_groups_per_file
+        state = state or {}
+        self._parts = state.get('parts', 0)
+        self._schema = None
+        if state.get('schema'):
+            self._schema = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(state['schema'])))
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            match = PART_FILE.fullmatch(name)
+            if match is not None and int(match.group(1)) >= self._parts:
+                os.remove(os.path.join(path, name))
+        self._writer = None
+        self._groups = 0
+        self.bytes_written = 0
+
+    def _table(self, rows):
+        rows = [{key: _parquet_value(value) for key, value in row.items()} for row in rows]
+        if self._schema is None:
+            # Las columnas sin ningún valor no tienen tipo: van a _extra
+            inferred = [field for field in pa.Table.from_pylist(rows).schema
+                        if not pa.types.is_null(field.type)]
+            self._schema = pa.schema([*inferred, pa.field(EXTRA_COLUMN, pa.string())])
+        kinds = {field.name: _arrow_kind(field.type) for field in self._schema
+                 if field.name != EXTRA_COLUMN}
+        return pa.Table.from_pylist([conform_row(row, kinds) for row in rows],
+                                    schema=self._schema)
+
+    def _state(self):
+        schema = base64.b64encode(self._schema.serialize().to_pybytes()).decode()
+        return {'parts': self._parts, 'schema': schema}
+
+    def _close_part(self):
+        self._writer.close()
+        self.bytes_written += os.path.getsize(self._part_path)
+        self._writer = None
+        self._groups = 0
+        self._parts += 1
+
+    def write(self, rows):
+        table = self._table(rows)
+        if self._writer is None:
+            self._part_path = os.path.join(self.path, f'part-{self._parts:05d}.parquet')
+            self._writer = pq.ParquetWriter(self._part_path, self._schema)
+        self._writer.write_table(table, row_group_size=len(rows))
+        self._groups += 1
+        if self._groups < self.row_groups_per_file:
+            return None
+        self._close_part()
+        return self._state()
+
+    def close(self):
+        if self._writer is not None:
+            self._close_part()
+        return self._state() if self._schema is not None else {'parts': self._parts}
+
+
+WRITERS = {'ndjson': NdjsonWriter, 'parquet': ParquetWriter}
+
+
+# Checkpoints
+
+class Checkpoint:
+    """
+    Progreso de la exportación por colección (cursor, filas, estado del
+    escritor), guardado de forma atómica cada vez que el escritor deja los
+    datos en disco: cada row group en NDJSON, cada fichero en Parquet
+    """
+
+    def __init__(self, path, output_format, data=None):
+        self.path = path
+        self.format = output_format
+        self.collections = (data or {}).get('collections', {})
+
+    @classmethod
+    def load(cls, path, output_format):
+        if not os.path.exists(path):
+            return cls(path, output_format)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != output_format:
+            raise RuntimeError(f"Checkpoint format is {data.get('format')}, not {output_format}")
+        return cls(path, output_format, data)
+
+    def get(self, collection):
+        return self.collections.get(collection, {})
+
+    def save(self, collection, **state):
+        self.collections[collection] = {**self.get(collection), **state}
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': self.format, 'collections': self.collections}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+# Exportación
+
+async def export_collection(backend, collection, output_dir, output_format, checkpoint,
+                            page_size=DEFAULT_PAGE_SIZE, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Exportar una colección desde su checkpoint. Devuelve filas, bytes,
+    segundos y throughput de esta ejecución.
+    """
+    state = checkpoint.get(collection)
+    if state.get('done'):
+        return {'rows': 0, 'bytes': 0, 'seconds': 0.0, 'rows_per_second': 0.0,
+                'skipped': True}
+
+    writer_class = WRITERS[output_format]
+    writer = writer_class(os.path.join(output_dir, collection + writer_class.extension),
+                          state.get('writer'))
+    rows_total = state.get('rows', 0)
+    cursor = state.get('cursor')
+    rows = 0
+    start = time.perf_counter()
+    documents = iter_documents(backend, collection, page_size, cursor)
+    async for group, cursor in iter_row_groups(iter_records(documents, collection),
+                                               row_group_size):
+        writer_state = writer.write(group)
+        rows += len(group)
+        # Lo escrito después del último checkpoint se repite al reanudar
+        if writer_state is not None:
+            checkpoint.save(collection, cursor=cursor, rows=rows_total + rows,
+                            writer=writer_state)
+    checkpoint.save(collection, cursor=cursor, rows=rows_total + rows,
+                    writer=writer.close(), done=True)
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'bytes': writer.bytes_written,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else 0.0,
+        'skipped': False,
+    }
+
+
+async def export(collections=None, output_dir=DEFAULT_OUTPUT_DIR,
+                 output_format='auto', page_size=DEFAULT_PAGE_SIZE,
+                 row_group_size=DEFAULT_ROW_GROUP_SIZE, resume=False):
+    """
+    Exportar las colecciones una tras otra (por defecto las de
+    default_collections()). Sin `resume` se empieza de cero.
+    """
+    collections = collections or default_collections()
+    output_format = resolve_format(output_format)
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if resume:
+        checkpoint = Checkpoint.load(checkpoint_path, output_format)
+    else:
+        checkpoint = Checkpoint(checkpoint_path, output_format)
+
+    backend = get_async_backend()
+    report = {}
+    for collection in collections:
+        report[collection] = await export_collection(
+            backend, collection, output_dir, output_format, checkpoint, page_size, row_group_size)
+        data = report[collection]
+        print(f"✔️ {collection}: {data['rows']} filas, {data['bytes'] / 1e6:.2f} MB "
+              f"en {data['seconds']}s ({data['rows_per_second']} filas/s)")
+    return {'format': output_format, 'collections': report}
+
+
+async def _run(args):
+    try:
+        return await export(args.collections, args.output_dir,
+                            args.format, args.page_size, args.row_group_size, args.resume)
+    finally:
+        await close_async_backend()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
+    print(f"📦 Exportando a {args.output_dir}...\n")
+    try:
+        result = asyncio.run(_run(args))
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        print("👉 Vuelve a lanzar con --resume para continuar desde el último checkpoint.")
+        return 1
+    rows = sum(data['rows'] for data in result['collections'].values())
+    seconds = sum(data['seconds'] for data in result['collections'].values())
+    rate = f" ({rows / seconds:.1f} filas/s)" if seconds else ''
+    print(f"\n✅ {rows} filas exportadas en formato {result['format']}{rate}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# Añadir parent directory al path para importar app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import configure_logging
+from app.repositories.backends import (DOCUMENT_ID, MAX_BATCH_SIZE, WriteOp, close_async_backend,
+                                       get_async_backend)
+from app.repositories.progress_repository import (PROGRESS_COLLECTION, USER_PROGRESS_COLLECTION,
+                                                  user_map_entry)
+from scripts.seed import positive_int
+
+DEFAULT_PAGE_SIZE = 500
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Migrar el progreso de 'progress' (un documento por tema) a "
+                    "'user_progress' (un documento por usuario)")
+    parser.add_argument('--page-size', type=positive_int, default=DEFAULT_PAGE_SIZE,
+                        help="Documentos de progreso leídos por página")
+    parser.add_argument('--delete-source', action='store_true',
+                        help="Borrar los documentos de 'progress' ya migrados")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Contar lo que se migraría sin escribir nada")
+    return parser.parse_args(argv)
+
+
+def _is_newer(entry, existing):
+    """
+    La entrada de origen no pisa una del mapa escrita después (por la API
+    con el nuevo layout ya activo)
+    """
+    if existing is None:
+        return True
+    current, incoming = existing.get('updated_at'), entry.get('updated_at')
+    return current is None or incoming is None or incoming > current
+
+
+async def _delete(doc_ids):
+    for start in range(0, len(doc_ids), MAX_BATCH_SIZE):
+        await get_async_backend().write_batch(
+            [WriteOp('delete', PROGRESS_COLLECTION, doc_id)
+             for doc_id in doc_ids[start:start + MAX_BATCH_SIZE]])
+
+
+async def _migrate_user(backend, user_id, entries, dry_run):
+    """
+    Leer, comparar y escribir el mapa del usuario en una transacción, para
+    que una escritura de la API que llegue entre medias no se pise con una
+    entrada más antigua. Devuelve los topic_id migrados.
+    """
+    migrated = set()
+
+    def apply(current):
+        # La transacción puede repetirse: se recalcula todo en cada intento
+        topics = (current or {}).get('topics', {})
+        newer = {topic_id: entry for topic_id, entry in entries.items()
+                 if _is_newer(entry, topics.get(topic_id))}
+        migrated.clear()
+        migrated.update(newer)
+        if not newer or dry_run:
+            return None
+        return {'user_id': user_id, 'topics': newer}
+
+    if dry_run:
+        apply(await backend.get(USER_PROGRESS_COLLECTION, user_id))
+    else:
+        await backend.transform(USER_PROGRESS_COLLECTION, user_id, apply)
+    return migrated
+
+
+async def migrate(page_size=DEFAULT_PAGE_SIZE, delete_source=False, dry_run=False):
+    """
+    Copiar cada documento de progreso a la entrada de su tema en el mapa del
+    usuario. Se recorre 'progress' por páginas y cada mapa se escribe en una
+    transacción, así que se puede interrumpir y volver a lanzar.
+
+    Con `delete_source` solo se borran los documentos migrados y los que el
+    mapa ya tenía más recientes; los que no tienen user_id o topic_id se
+    conservan y se devuelven en 'invalid_ids'.
+    """
+    backend = get_async_backend()
+    totals = {'documents': 0, 'migrated': 0, 'skipped': 0, 'invalid': 0, 'deleted': 0}
+    invalid_ids = []
+    users = set()
+    cursor = None
+    while True:
+        docs = await backend.query(PROGRESS_COLLECTION, order_by=DOCUMENT_ID,
+                                   limit=page_size, start_after=cursor)
+        if not docs:
+            break
+        # El cursor por ID sigue valiendo aunque ese documento se borre
+        cursor = docs[-1].id
+        totals['documents'] += len(docs)
+
+        by_user: dict[str, dict] = {}
+        resolved = []
+        for doc in docs:
+            user_id, topic_id = doc.data.get('user_id'), doc.data.get('topic_id')
+            if not user_id or not topic_id:
+                totals['invalid'] += 1
+                invalid_ids.append(doc.id)
+                continue
+            by_user.setdefault(user_id, {})[topic_id] = user_map_entry(doc.data)
+            # Se migra o el mapa ya tiene algo más reciente: en los dos casos se puede borrar
+            resolved.append(doc.id)
+
+        migrated = await asyncio.gather(*(_migrate_user(backend, user_id, entries, dry_run)
+                                          for user_id, entries in by_user.items()))
+        for (user_id, entries), topic_ids in zip(by_user.items(), migrated):
+            users.add(user_id)
+            totals['migrated'] += len(topic_ids)
+            totals['skipped'] += len(entries) - len(topic_ids)
+
+        if delete_source:
+            if not dry_run:
+                await _delete(resolved)
+            totals['deleted'] += len(resolved)
+        print(f"   ... {totals['documents']} documentos leídos")
+
+    if invalid_ids:
+        print(f"⚠️ {len(invalid_ids)} documentos sin user_id o topic_id (no se migran ni se "
+              f"borran): {', '.join(invalid_ids[:20])}{' ...' if len(invalid_ids) > 20 else ''}")
+    return {**totals, 'users': len(users), 'invalid_ids': invalid_ids}
+
+
+async def _run(args):
+    try:
+        return await migrate(args.page_size, args.delete_source, args.dry_run)
+    finally:
+        await close_async_backend()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
+    mode = " (simulación)" if args.dry_run else ""
+    print(f"🚚 Migrando progreso a '{USER_PROGRESS_COLLECTION}'{mode}...\n")
+    try:
+        totals = asyncio.run(_run(args))
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        return 1
+    print(f"\n✅ {totals['migrated']} entradas migradas para {totals['users']} usuarios "
+          f"({totals['skipped']} omitidas, {totals['invalid']} no válidas, "
+          f"{totals['deleted']} documentos borrados).")
+    if not args.dry_run:
+        print("👉 Activa PROGRESS_LAYOUT=user_map para leer el nuevo layout.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
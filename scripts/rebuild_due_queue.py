@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# Añadir parent directory al path para importar app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import configure_logging
+from app.repositories.backends import close_async_backend
+from app.repositories.progress_repository import list_users_with_progress
+from app.services.recommendation_service import rebuild_due_queue
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Reconstruir las colas de repaso (due_queues) desde el progreso")
+    parser.add_argument('--user', action='append', dest='users', default=None,
+                        help="Reconstruir solo este usuario (se puede repetir)")
+    return parser.parse_args(argv)
+
+
+async def rebuild(users=None):
+    """
+    Reconstruir las colas indicadas (o todas). Devuelve {user_id: temas en la cola}.
+    """
+    users = users or await list_users_with_progress()
+    rebuilt = {}
+    for user_id in users:
+        rebuilt[user_id] = len(await rebuild_due_queue(user_id))
+        print(f"✔️ Cola reconstruida: {user_id} ({rebuilt[user_id]} temas)")
+    return rebuilt
+
+
+async def _run(users):
+    try:
+        return await rebuild(users)
+    finally:
+        await close_async_backend()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
+    print("🔁 Reconstruyendo colas de repaso...\n")
+    try:
+        rebuilt = asyncio.run(_run(args.users))
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+        return 1
+    print(f"\n✅ {len(rebuilt)} colas reconstruidas.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,27 @@
+import argparse
+import hashlib
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 
 # Añadir parent directory al path para importar config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.core.config import initialize_firebase
+from app.core.config import configure_logging, initialize_firebase
 from datetime import datetime, timezone
 
 # Obtenemos la ruta raiz
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
+# Firestore admite como máximo 500 operaciones por WriteBatch
+MAX_BATCH_SIZE = 500
+
+# Campos que se siembran por colección (el "id" va como document ID)
+CATEGORY_FIELDS = ('name', 'icon')
+TOPIC_FIELDS = ('title', 'category_id', 'details')
+
 # Función para cargar el archivo JSON en "app/seeds/topics.json"
 def load_json(filepath):
     """
@@ -70,9 +80,127 @@ def seed_topics(db, topics_data):
         print(f"✔️ Topic sembrado: {topic['title']} (ID: {topic['id']})")
 
     print(f"\n ✅ conteo de semilla: {count} - Topics sembrados de manera satisfactoria.")
-        
+
+
+def content_hash(record, fields):
+    """
+    Hash estable del contenido sembrable de un documento
+    """
+    payload = json.dumps({field: record[field] for field in fields},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def chunked(items, size):
+    """
+    Dividir una lista en bloques de tamaño `size`
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fetch_existing_hashes(db, collection_name):
+    """
+    Leer en una sola pasada el content_hash de los documentos actuales.
+    Se usa select() para no descargar el resto de los campos.
+    """
+    docs = db.collection(collection_name).select(['content_hash']).stream()
+    return {doc.id: (doc.to_dict() or {}).get('content_hash') for doc in docs}
+
+
+def fetch_existing_ids(db, collection_name):
+    """
+    Leer solo los document IDs (select sin campos), para saber qué
+    documentos ya existen sin descargar su contenido
+    """
+    return {doc.id for doc in db.collection(collection_name).select([]).stream()}
+
+
+def plan_writes(records, fields, existing_hashes, force=False):
+    """
+    Devolver los documentos a escribir: nuevos o con contenido distinto (con
+    `force`, todos). Cada elemento es (doc_id, data, is_new).
+    """
+    writes = []
+    for record in records:
+        digest = content_hash(record, fields)
+        is_new = record['id'] not in existing_hashes
+        if not force and not is_new and existing_hashes[record['id']] == digest:
+            continue
+
+        data = {field: record[field] for field in fields}
+        data['content_hash'] = digest
+        writes.append((record['id'], data, is_new))
+    return writes
+
+
+def commit_in_batches(db, collection_name, writes, chunk_size=MAX_BATCH_SIZE, workers=4):
+    """
+    Escribir los documentos en WriteBatch de `chunk_size`, con como máximo
+    `workers` commits en paralelo. Devuelve el número de documentos escritos.
+    """
+    collection_ref = db.collection(collection_name)
+    now = datetime.now(UTC)
+
+    def commit(chunk):
+        batch = db.batch()
+        for doc_id, data, is_new in chunk:
+            data = {**data, 'updated_at': now}
+            if is_new:
+                data['created_at'] = now
+            # merge=True conserva created_at de los documentos existentes
+            batch.set(collection_ref.document(doc_id), data, merge=True)
+        batch.commit()
+        return len(chunk)
+
+    chunk_size = min(chunk_size, MAX_BATCH_SIZE)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(commit, chunked(writes, chunk_size)))
+
+
+def seed_collection_bulk(db, collection_name, records, fields, chunk_size=MAX_BATCH_SIZE,
+                         workers=4, force=False):
+    """
+    Sembrar una colección en modo bulk: una lectura para comparar hashes y
+    escrituras en lotes solo de los documentos que cambiaron
+    """
+    if force:
+        # Sin comparar hashes, pero hay que saber qué existe para no pisar created_at
+        existing_hashes = dict.fromkeys(fetch_existing_ids(db, collection_name))
+    else:
+        existing_hashes = fetch_existing_hashes(db, collection_name)
+    writes = plan_writes(records, fields, existing_hashes, force)
+    written = commit_in_batches(db, collection_name, writes, chunk_size, workers)
+
+    unchanged = len(records) - len(writes)
+    print(f" ✅ {collection_name}: {written} escritos, {unchanged} sin cambios.")
+    return written
+
+
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que 0: {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Sembrar categorias y topics en Firestore')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Usar escrituras en lotes y omitir documentos sin cambios')
+    parser.add_argument('--force', action='store_true',
+                        help='En modo bulk, reescribir todos los documentos sin comparar hashes')
+    parser.add_argument('--chunk-size', type=positive_int, default=MAX_BATCH_SIZE,
+                        help='Documentos por WriteBatch (máximo 500)')
+    parser.add_argument('--workers', type=positive_int, default=4,
+                        help='Commits de lotes en paralelo')
+    return parser.parse_args(argv)
+
+
 # Función principal para ejecutar el seed
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
     print("🌱 Iniciando proceso de siembra...\n")
 
     try:
@@ -87,13 +215,19 @@ def main():
         if 'categories' not in data or 'topics' not in data:
             raise ValueError("❌ Error: El archivo JSON debe contener 'categories' y 'topics'.")
         
-        # Seed de categorias
-        print("\nSembrando categorias...")
-        seed_categories(db, data['categories'])
-
-        # Seed de topics
-        print("\nSembrando topics...")
-        seed_topics(db, data['topics'])
+        if args.bulk:
+            print("\nSembrando en modo bulk...")
+            options = {'chunk_size': args.chunk_size, 'workers': args.workers, 'force': args.force}
+            seed_collection_bulk(db, 'categories', data['categories'], CATEGORY_FIELDS, **options)
+            seed_collection_bulk(db, 'topics', data['topics'], TOPIC_FIELDS, **options)
+        else:
+            # Seed de categorias
+            print("\nSembrando categorias...")
+            seed_categories(db, data['categories'])
+
+            # Seed de topics
+            print("\nSembrando topics...")
+            seed_topics(db, data['topics'])
 
         print("\n🌱 Proceso de siembra completado exitosamente.")
         return 0
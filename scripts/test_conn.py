@@ -1,35 +1,148 @@
+import argparse
+import asyncio
+import json
 import sys
 import os
+import time
 
 # Añadir parent directory al path para importar app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.core.config import initialize_firebase
+from app.core import config
+from app.core.config import configure_logging
+from app.repositories.backends import close_async_backend, get_async_backend
+from app.repositories.progress_repository import (PROGRESS_COLLECTION, USER_MAP_LAYOUT,
+                                                  USER_PROGRESS_COLLECTION)
 
-def test_firestore_connection():
+# Documentos leídos por colección para estimar el tamaño medio
+DEFAULT_SAMPLE_SIZE = 50
+
+
+def estimate_document_size(doc_id, data):
     """
-    Test de conexion a Firestore
+    Tamaño aproximado de un documento en bytes (ID + campos en JSON). No es
+    el cálculo exacto de Firestore, pero sirve para comparar y planificar.
     """
-    try:
-        # Inicializar Firebase
-        db = initialize_firebase()
+    encoded = json.dumps(data, default=str, ensure_ascii=False).encode()
+    return len(doc_id.encode()) + len(encoded)
+
+
+async def collection_stats(backend, collection, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Conteo con una agregación count() y tamaño medio sobre una muestra
+    """
+    count, sample = await asyncio.gather(
+        backend.count(collection),
+        backend.query(collection, limit=sample_size),
+    )
+    sizes = [estimate_document_size(doc.id, doc.data) for doc in sample]
+    average = round(sum(sizes) / len(sizes)) if sizes else None
+    return {
+        'count': count,
+        'sampled': len(sizes),
+        'avg_document_bytes': average,
+        'estimated_total_bytes': average * count if average is not None else None,
+    }
+
+
+async def topic_counts_by_category(backend):
+    """
+    Temas por categoría: una agregación count() por categoría, en paralelo
+    """
+    categories = [doc.id for doc in await backend.query('categories', select=[])]
+    counts = await asyncio.gather(*(backend.count('topics', [('category_id', '==', category)])
+                                    for category in categories))
+    return dict(zip(categories, counts))
+
+
+async def count_users_with_progress(backend):
+    """
+    Usuarios distintos con progreso. Con el layout user_map hay un documento
+    por usuario y basta un count(). Con un documento por tema se lee uno por
+    usuario, saltando cada vez al siguiente valor de user_id en lugar de
+    recorrer todos los documentos.
+    """
+    if config.progress_layout == USER_MAP_LAYOUT:
+        return await backend.count(USER_PROGRESS_COLLECTION)
+    users = 0
+    last_user = None
+    while True:
+        filters = [('user_id', '>', last_user)] if last_user is not None else []
+        docs = await backend.query(PROGRESS_COLLECTION, filters, order_by='user_id', limit=1,
+                                   select=['user_id'])
+        if not docs:
+            return users
+        users += 1
+        last_user = docs[0].data['user_id']
 
-        # Intentar obtener una coleccion de prueba
-        collections = db.collections()
-        collection_names = [col.id for col in collections]
 
-        print("✅ Conexion a Firestore exitosa.")
-        print(f"📚 Colecciones disponibles: {collection_names if collection_names else '(ninguna aún)'}")
-        
-        # Si hay colecciones, contar documentos
-        for col_name in collection_names:
-            count = len(list(db.collection(col_name).stream()))
-            print(f"   - {col_name}: {count} documentos")
+async def gather_stats(backend, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Estadísticas de todas las colecciones, calculadas en paralelo
+    """
+    start = time.perf_counter()
+    names = await backend.collections()
+    per_collection, by_category, users = await asyncio.gather(
+        asyncio.gather(*(collection_stats(backend, name, sample_size) for name in names)),
+        topic_counts_by_category(backend),
+        count_users_with_progress(backend),
+    )
+    return {
+        'collections': dict(zip(names, per_collection)),
+        'topics_by_category': by_category,
+        'users_with_progress': users,
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def print_report(stats):
+    print("✅ Conexion a Firestore exitosa.")
+    names = list(stats['collections'])
+    print(f"📚 Colecciones disponibles: {names if names else '(ninguna aún)'}")
+    for name, data in stats['collections'].items():
+        size = f", ~{data['avg_document_bytes']} bytes/doc" if data['avg_document_bytes'] else ''
+        print(f"   - {name}: {data['count']} documentos{size}")
+
+    if stats['topics_by_category']:
+        print("\n🗂️  Temas por categoría:")
+        for category, count in stats['topics_by_category'].items():
+            print(f"   - {category}: {count}")
+
+    print(f"\n👤 Usuarios con progreso: {stats['users_with_progress']}")
+    print(f"⏱️  Estadísticas calculadas en {stats['elapsed_seconds']}s")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Comprobar la conexión y mostrar estadísticas de las colecciones")
+    parser.add_argument('--json', action='store_true', help="Salida en JSON")
+    parser.add_argument('--sample-size', type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help="Documentos por colección para estimar el tamaño medio")
+    return parser.parse_args(argv)
 
+
+async def _run(sample_size):
+    try:
+        return await gather_stats(get_async_backend(), sample_size)
+    finally:
+        await close_async_backend()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
+    try:
+        stats = asyncio.run(_run(args.sample_size))
     except Exception as e:
         print(f"❌ Error al conectar a Firestore: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
+        return 1
+
+    if args.json:
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+    else:
+        print_report(stats)
+    return 0
+
 
 if __name__ == "__main__":
-    test_firestore_connection()
\ No newline at end of file
+    sys.exit(main())
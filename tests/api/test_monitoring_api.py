@@ -0,0 +1,88 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (HTTP_REQUEST_DURATION, HTTP_REQUEST_STORAGE_DOCUMENTS_WRITTEN,
+                              HTTP_REQUEST_STORAGE_READS, HTTP_REQUEST_STORAGE_SECONDS,
+                              HTTP_REQUEST_STORAGE_WRITES)
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.repositories.backends import AsyncMemoryBackend, InstrumentedBackend, set_async_backend
+from app.services.health_service import DependencyProber, get_prober, set_prober
+
+
+def test_metrics_endpoint_reports_route_latency_and_reads(memory_backend):
+    """
+    Test para verificar que /metrics expone la latencia por plantilla de ruta y las lecturas por petición
+    """
+    set_async_backend(InstrumentedBackend(AsyncMemoryBackend(memory_backend)))
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    client = TestClient(app)
+    route = '/api/v1/progress/{topic_id}'
+    before = HTTP_REQUEST_DURATION.count(method='PATCH', route=route, status=401)
+
+    client.patch('/api/v1/progress/topic-1', json={'notes': 'x'})
+    client.get('/api/v1/topics')
+    assert HTTP_REQUEST_DURATION.count(method='PATCH', route=route, status=401) == before + 1
+
+    body = client.get('/api/v1/monitoring/metrics').text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/topics"' in body
+    assert 'storage_operations_total{operation="stream",collection="topics"}' in body
+    assert 'topic_catalog_size 1' in body
+    assert HTTP_REQUEST_STORAGE_READS.count(route='/api/v1/topics') >= 1
+
+
+def test_metrics_track_writes_and_storage_time_per_route(memory_backend):
+    """
+    Test para verificar que se registran escrituras, documentos escritos y tiempo de backend por ruta
+    """
+    set_async_backend(InstrumentedBackend(AsyncMemoryBackend(memory_backend)))
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    app.dependency_overrides[get_current_user] = lambda: {'uid': 'user123'}
+    route = '/api/v1/progress'
+    histograms = (HTTP_REQUEST_STORAGE_WRITES, HTTP_REQUEST_STORAGE_DOCUMENTS_WRITTEN,
+                  HTTP_REQUEST_STORAGE_SECONDS)
+    before = {histogram: (histogram.count(route=route), histogram.sum(route=route))
+              for histogram in histograms}
+    try:
+        response = TestClient(app).post(route, json={
+            'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'completed'})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    for histogram, (count, total) in before.items():
+        assert histogram.count(route=route) == count + 1
+        assert histogram.sum(route=route) > total
+
+    body = TestClient(app).get('/api/v1/monitoring/metrics').text
+    assert 'http_request_storage_writes_count{route="/api/v1/progress"}' in body
+    assert 'http_request_storage_seconds_sum{route="/api/v1/progress"}' in body
+
+
+def test_readiness_serves_cached_probe_result(memory_backend):
+    """
+    Test para verificar /live y /ready con el resultado del prober, sin llamadas por petición
+    """
+    calls = []
+
+    async def counting_check():
+        calls.append(1)
+
+    original, prober = get_prober(), DependencyProber({'storage': counting_check})
+    set_prober(prober)
+    client = TestClient(app)
+    try:
+        assert client.get('/api/v1/monitoring/live').json() == {'status': 'alive'}
+        assert client.get('/api/v1/monitoring/ready').status_code == 503
+
+        asyncio.run(prober.run_once())
+        for _ in range(3):
+            response = client.get('/api/v1/monitoring/ready')
+        assert response.status_code == 200
+        assert response.json()['dependencies']['storage']['ok'] is True
+        assert len(calls) == 1
+    finally:
+        set_prober(original)
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+from app.models.progress import ProgressCreate
+from app.middleware.auth import get_current_user
+from app.repositories import progress_repository
+from app.repositories.progress_write_buffer import ProgressWriteBuffer
+from app.services import progress_service
+
+
+@pytest.fixture
+def client(memory_backend):
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    app.dependency_overrides[get_current_user] = lambda: {'uid': 'user123'}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_record_progress_creates_and_updates(client, memory_backend):
+    """
+    Test para verificar que registrar progreso crea el documento y luego lo actualiza
+    """
+    payload = {'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'in-progress'}
+    first = client.post('/api/v1/progress', json=payload)
+    assert first.status_code == 200
+    assert first.json()['id'] == 'user123_topic-1'
+
+    second = client.post('/api/v1/progress', json={**payload, 'status': 'completed'})
+    assert second.json()['status'] == 'completed'
+    assert second.json()['created_at'] == first.json()['created_at']
+    assert memory_backend.get('progress', 'user123_topic-1')['status'] == 'completed'
+
+
+def test_record_progress_computes_server_fields(client):
+    """
+    Test para verificar que la racha enviada por el cliente se ignora y no aparece en el esquema
+    """
+    response = client.post('/api/v1/progress', json={
+        'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'in-progress',
+        'streak': 99, 'last_reviewed_at': '2000-01-01T00:00:00Z'})
+    assert response.json()['streak'] == 1
+    assert response.json()['last_reviewed_at'] != '2000-01-01T00:00:00Z'
+
+    schemas = client.get('/openapi.json').json()['components']['schemas']
+    assert 'streak' not in schemas['ProgressCreate']['properties']
+    assert 'streak' in schemas['ProgressResponse']['properties']
+
+
+def test_record_progress_errors(client):
+    """
+    Test para verificar los errores por tema inexistente y por usuario ajeno
+    """
+    response = client.post('/api/v1/progress', json={
+        'user_id': 'user123', 'topic_id': 'no-existe', 'status': 'completed'})
+    assert response.status_code == 404
+
+    response = client.post('/api/v1/progress', json={
+        'user_id': 'otro', 'topic_id': 'topic-1', 'status': 'completed'})
+    assert response.status_code == 403
+
+
+def test_update_progress(client):
+    """
+    Test para verificar la actualización parcial y el 404 si no hay progreso previo
+    """
+    assert client.patch('/api/v1/progress/topic-1', json={'notes': 'x'}).status_code == 404
+
+    client.post('/api/v1/progress', json={
+        'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'in-progress'})
+    response = client.patch('/api/v1/progress/topic-1', json={'confidence_level': 4})
+    assert response.status_code == 200
+    assert response.json()['confidence_level'] == 4
+    assert response.json()['status'] == 'in-progress'
+
+
+def test_write_behind_reads_own_writes(memory_backend):
+    """
+    Test para verificar que con write-behind las lecturas ven lo pendiente antes del flush
+    """
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    buffer = ProgressWriteBuffer('progress', window_seconds=60)
+    progress_repository.set_write_buffer(buffer)
+
+    async def scenario():
+        await progress_service.record_progress(ProgressCreate(
+            user_id='user123', topic_id='topic-1', status='completed'))
+        assert memory_backend.get('progress', 'user123_topic-1') is None
+        single = await progress_repository.get_progress_by_topic('user123', 'topic-1')
+        listed = await progress_repository.get_user_progress_map('user123')
+        await buffer.close()
+        return single, listed
+
+    try:
+        single, listed = asyncio.run(scenario())
+    finally:
+        progress_repository.set_write_buffer(None)
+    assert single.status == 'completed'
+    assert listed['topic-1'].status == 'completed'
+    assert memory_backend.get('progress', 'user123_topic-1')['status'] == 'completed'
+
+
+def test_bulk_sync_returns_per_item_results(client, memory_backend):
+    """
+    Test para verificar la sincronización masiva: combina por tema y devuelve un resultado por elemento
+    """
+    client.post('/api/v1/progress', json={
+        'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'in-progress'})
+    memory_backend.set('topics', 'topic-2', {
+        'title': 'Tema 2', 'category_id': 'python', 'details': ['Detalle']})
+
+    response = client.post('/api/v1/progress/bulk', json={'user_id': 'user123', 'items': [
+        {'topic_id': 'topic-1', 'notes': 'repaso'},
+        {'topic_id': 'topic-2', 'status': 'in-progress'},
+        {'topic_id': 'topic-2', 'status': 'completed', 'confidence_level': 3},
+        {'topic_id': 'no-existe', 'status': 'completed'},
+        {'topic_id': 'topic-3', 'notes': 'sin status'},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [r['result'] for r in body['results']] == ['updated', 'created', 'created', 'error', 'error']
+    assert (body['created'], body['updated'], body['failed']) == (2, 1, 2)
+    assert memory_backend.get('progress', 'user123_topic-1')['notes'] == 'repaso'
+    stored = memory_backend.get('progress', 'user123_topic-2')
+    assert (stored['status'], stored['confidence_level']) == ('completed', 3)
+
+
+def test_bulk_sync_validates_topics_with_one_read(client, memory_backend, monkeypatch):
+    """
+    Test para verificar que sin cache de temas el bulk valida todos los temas con un solo get_many
+    """
+    monkeypatch.setattr(config, 'topics_cache_enabled', False)
+    memory_backend.set('topics', 'topic-2', {
+        'title': 'Tema 2', 'category_id': 'python', 'details': ['Detalle']})
+    calls = []
+    get, get_many = memory_backend.get, memory_backend.get_many
+
+    def counting_get(collection, doc_id):
+        calls.append(('get', collection))
+        return get(collection, doc_id)
+
+    def counting_get_many(collection, doc_ids):
+        calls.append(('get_many', collection))
+        return get_many(collection, doc_ids)
+
+    monkeypatch.setattr(memory_backend, 'get', counting_get)
+    monkeypatch.setattr(memory_backend, 'get_many', counting_get_many)
+    response = client.post('/api/v1/progress/bulk', json={'user_id': 'user123', 'items': [
+        {'topic_id': topic_id, 'status': 'completed'}
+        for topic_id in ('topic-1', 'topic-2', 'no-existe')]})
+
+    assert response.json()['failed'] == 1
+    assert [call for call in calls if call[1] == 'topics'] == [('get_many', 'topics')]
+
+
+def test_bulk_sync_rejects_other_users(client):
+    """
+    Test para verificar que no se puede sincronizar el progreso de otro usuario
+    """
+    response = client.post('/api/v1/progress/bulk', json={
+        'user_id': 'otro', 'items': [{'topic_id': 'topic-1', 'status': 'completed'}]})
+    assert response.status_code == 403
+
+
+def test_progress_writes_update_due_queue(client, memory_backend, monkeypatch):
+    """
+    Test para verificar que cada escritura de progreso actualiza su entrada en la cola de repaso
+    """
+    monkeypatch.setattr(config, 'due_queue_enabled', True)
+    client.post('/api/v1/progress', json={
+        'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'completed'})
+    first = memory_backend.get('due_queues', 'user123')['topics']['topic-1']
+
+    client.patch('/api/v1/progress/topic-1', json={'confidence_level': 5})
+    assert memory_backend.get('due_queues', 'user123')['topics']['topic-1'] > first
+
@@ -0,0 +1,173 @@
+import json
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.middleware.auth import get_current_user
+
+
+@pytest.fixture
+def client(memory_backend):
+    for i in range(8):
+        memory_backend.set('topics', f'topic-{i}', {
+            'title': f'Tema {i}', 'category_id': 'python', 'details': [f'Detalle {i}']})
+    reviewed = datetime.now(UTC) - timedelta(days=1)
+    memory_backend.set('progress', 'user123_topic-0', {
+        'user_id': 'user123', 'topic_id': 'topic-0', 'status': 'completed',
+        'confidence_level': 5, 'created_at': reviewed, 'updated_at': reviewed})
+    app.dependency_overrides[get_current_user] = lambda: {'uid': 'user123'}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_today_session_returns_top_topics(client):
+    """
+    Test para verificar la sesión diaria en una sola respuesta JSON
+    """
+    response = client.post('/api/v1/sessions/today?limit=3',
+                           json={'user_id': 'user123', 'topic_ids': []})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['user_id'] == 'user123'
+    assert [t['topic_id'] for t in body['topics']] == ['topic-1', 'topic-2', 'topic-3']
+
+
+def test_today_session_restricted_to_topic_ids(client):
+    """
+    Test para verificar que topic_ids limita los temas candidatos
+    """
+    response = client.post('/api/v1/sessions/today',
+                           json={'user_id': 'user123', 'topic_ids': ['topic-0', 'topic-5']})
+    assert [t['topic_id'] for t in response.json()['topics']] == ['topic-5', 'topic-0']
+
+
+def test_today_session_unknown_topic_returns_400(client):
+    """
+    Test para verificar el error con temas inexistentes, también en modo streaming
+    """
+    payload = {'user_id': 'user123', 'topic_ids': ['no-existe']}
+    assert client.post('/api/v1/sessions/today', json=payload).status_code == 400
+    assert client.post('/api/v1/sessions/today?stream=true', json=payload).status_code == 400
+
+
+def test_today_session_streams_ndjson(client):
+    """
+    Test para verificar el modo streaming NDJSON
+    """
+    response = client.post('/api/v1/sessions/today?limit=2',
+                           json={'user_id': 'user123', 'topic_ids': []},
+                           headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert response.headers['x-session-id']
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [item['topic_id'] for item in lines] == ['topic-1', 'topic-2']
+
+
+def test_today_session_for_another_user_returns_403(client):
+    """
+    Test para verificar que no se puede pedir la sesión de otro usuario
+    """
+    response = client.post('/api/v1/sessions/today',
+                           json={'user_id': 'otro-usuario', 'topic_ids': []})
+    assert response.status_code == 403
+
+
+def test_today_session_requires_token(client):
+    """
+    Test para verificar que sin token se responde 401
+    """
+    app.dependency_overrides.clear()
+    response = client.post('/api/v1/sessions/today',
+                           json={'user_id': 'user123', 'topic_ids': []})
+    assert response.status_code == 401
+
+
+def test_today_session_is_memoized_for_the_day(client, memory_backend):
+    """
+    Test para verificar que la sesión del día se genera una vez y se persiste
+    """
+    payload = {'user_id': 'user123', 'topic_ids': []}
+    first = client.post('/api/v1/sessions/today?limit=3', json=payload).json()
+    second = client.post('/api/v1/sessions/today?limit=3', json=payload).json()
+    assert second == first
+    assert memory_backend.get('sessions', first['session_id'])['user_id'] == 'user123'
+
+    streamed = client.post('/api/v1/sessions/today?limit=3&stream=true', json=payload)
+    assert streamed.headers['x-session-id'] == first['session_id']
+
+    other = client.post('/api/v1/sessions/today?limit=2', json=payload).json()
+    assert other['session_id'] != first['session_id']
+
+
+def test_today_session_streams_and_persists_on_first_request(client, memory_backend):
+    """
+    Test para verificar que con el memo activo la primera sesión del día también se envía en streaming
+    """
+    payload = {'user_id': 'user123', 'topic_ids': []}
+    streamed = client.post('/api/v1/sessions/today?limit=3&stream=true', json=payload)
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert len(lines) == 3
+
+    stored = memory_backend.get('sessions', streamed.headers['x-session-id'])
+    assert [item['topic_id'] for item in stored['topics']] == [item['topic_id'] for item in lines]
+    again = client.post('/api/v1/sessions/today?limit=3', json=payload).json()
+    assert again['session_id'] == streamed.headers['x-session-id']
+    assert again['topics'] == lines
+
+
+def test_today_session_invalidated_by_progress(client):
+    """
+    Test para verificar que registrar progreso invalida la sesión memorizada
+    """
+    payload = {'user_id': 'user123', 'topic_ids': []}
+    first = client.post('/api/v1/sessions/today?limit=3', json=payload).json()
+    response = client.post('/api/v1/progress', json={
+        'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'completed',
+        'confidence_level': 5})
+    assert response.status_code in (200, 201)
+
+    second = client.post('/api/v1/sessions/today?limit=3', json=payload).json()
+    assert 'topic-1' in [t['topic_id'] for t in first['topics']]
+    assert 'topic-1' not in [t['topic_id'] for t in second['topics']]
+
+
+def test_today_session_invalid_timezone_returns_400(client):
+    """
+    Test para verificar que una zona horaria desconocida se rechaza
+    """
+    response = client.post('/api/v1/sessions/today',
+                           json={'user_id': 'user123', 'topic_ids': [], 'timezone': 'Marte/Olympus'})
+    assert response.status_code == 400
+
+
+def test_today_session_batches_topic_and_progress_reads(client, memory_backend, monkeypatch):
+    """
+    Test para verificar que los topic_ids se leen con un número fijo de lecturas agrupadas
+    """
+    from app.core import config
+    from app.repositories.backends import AsyncMemoryBackend, set_async_backend
+
+    calls = []
+
+    class CountingBackend(AsyncMemoryBackend):
+        async def get(self, collection, doc_id):
+            calls.append(('get', collection))
+            return await super().get(collection, doc_id)
+
+        async def get_many(self, collection, doc_ids):
+            calls.append(('get_many', collection))
+            return await super().get_many(collection, doc_ids)
+
+    monkeypatch.setattr(config, 'topics_cache_enabled', False)
+    monkeypatch.setattr(config, 'session_memo_enabled', False)
+    set_async_backend(CountingBackend(memory_backend))
+
+    topic_ids = [f'topic-{i}' for i in range(8)] * 2
+    response = client.post('/api/v1/sessions/today?limit=3',
+                           json={'user_id': 'user123', 'topic_ids': topic_ids})
+    assert response.status_code == 200
+    assert [t['topic_id'] for t in response.json()['topics']] == ['topic-1', 'topic-2', 'topic-3']
+    assert sorted(calls) == [('get_many', 'progress'), ('get_many', 'topics')]
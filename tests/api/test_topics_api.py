@@ -0,0 +1,159 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+from app.repositories.topic_repository import get_catalog
+
+
+@pytest.fixture(params=[True, False], ids=['catalog', 'backend'])
+def client(request, memory_backend, monkeypatch):
+    monkeypatch.setattr(config, 'topics_cache_enabled', request.param)
+    for i in range(5):
+        category = 'python' if i % 2 == 0 else 'js-react'
+        memory_backend.set('topics', f'topic-{i}', {
+            'title': f'Tema {i}', 'category_id': category, 'details': [f'Detalle {i}']})
+    return TestClient(app)
+
+
+def test_list_topics_paginates_by_cursor(client):
+    """
+    Test para verificar la paginación por cursor sin details por defecto
+    """
+    first = client.get('/api/v1/topics?limit=2').json()
+    assert [t['id'] for t in first['items']] == ['topic-0', 'topic-1']
+    assert first['items'][0] == {'id': 'topic-0', 'title': 'Tema 0', 'category_id': 'python'}
+    assert first['next_cursor'] == 'topic-1'
+
+    second = client.get(f"/api/v1/topics?limit=2&cursor={first['next_cursor']}").json()
+    third = client.get(f"/api/v1/topics?limit=2&cursor={second['next_cursor']}").json()
+    assert [t['id'] for t in second['items']] == ['topic-2', 'topic-3']
+    assert [t['id'] for t in third['items']] == ['topic-4']
+    assert third['next_cursor'] is None
+
+
+def test_list_topics_projection_and_category(client):
+    """
+    Test para verificar la proyección de campos y el filtro por categoría
+    """
+    body = client.get('/api/v1/topics?category_id=python&fields=details').json()
+    assert body['items'] == [
+        {'id': 'topic-0', 'details': ['Detalle 0']},
+        {'id': 'topic-2', 'details': ['Detalle 2']},
+        {'id': 'topic-4', 'details': ['Detalle 4']},
+    ]
+
+    body = client.get('/api/v1/topics?category_id=python&limit=1&cursor=topic-0').json()
+    assert [t['id'] for t in body['items']] == ['topic-2']
+    assert body['next_cursor'] == 'topic-2'
+
+
+def test_list_topics_rejects_unknown_fields(client):
+    """
+    Test para verificar el error con campos de proyección desconocidos
+    """
+    response = client.get('/api/v1/topics?fields=title,secreto')
+    assert response.status_code == 400
+
+
+def test_conditional_get_returns_304(client):
+    """
+    Test para verificar el ETag y la respuesta 304 con If-None-Match
+    """
+    etag = client.get('/api/v1/topics').headers['etag']
+    again = client.get('/api/v1/topics', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.content == b''
+    other = client.get('/api/v1/topics?limit=1', headers={'If-None-Match': etag})
+    assert other.status_code == 200
+
+
+def test_etag_changes_when_catalog_changes(client, memory_backend):
+    """
+    Test para verificar que modificar el catálogo invalida el ETag anterior
+    """
+    etag = client.get('/api/v1/topics').headers['etag']
+    memory_backend.set('topics', 'topic-9', {
+        'title': 'Tema 9', 'category_id': 'python', 'details': ['Detalle 9']})
+    get_catalog().invalidate()
+
+    response = client.get('/api/v1/topics', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+
+
+def test_large_pages_are_served_gzipped(client, memory_backend):
+    """
+    Test para verificar que la respuesta se sirve comprimida si el cliente acepta gzip
+    """
+    for i in range(5, 30):
+        memory_backend.set('topics', f'topic-{i}', {
+            'title': f'Tema {i}', 'category_id': 'python', 'details': [f'Detalle {i}']})
+    response = client.get('/api/v1/topics?fields=details,title',
+                          headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert len(response.json()['items']) == 30
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['etag'].endswith('-gzip"')
+
+
+def test_304_echoes_the_etag_of_the_negotiated_encoding(client, memory_backend):
+    """
+    Test para verificar que el 304 lleva el mismo ETag que el 200 de esa codificación
+    """
+    for i in range(5, 30):
+        memory_backend.set('topics', f'topic-{i}', {
+            'title': f'Tema {i}', 'category_id': 'python', 'details': [f'Detalle {i}']})
+    url = '/api/v1/topics?fields=details,title'
+    gzip_etag = client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['etag']
+
+    again = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    assert again.status_code == 304
+    assert again.headers['etag'] == gzip_etag
+
+    # Sin gzip la representación es otra: el ETag comprimido no la valida
+    plain = client.get(url, headers={'Accept-Encoding': 'identity',
+                                     'If-None-Match': gzip_etag})
+    assert plain.status_code == 200
+    assert plain.headers['etag'] != gzip_etag
+    assert 'content-encoding' not in plain.headers
+
+
+def test_search_topics_accents_prefix_and_category(client, memory_backend):
+    """
+    Test para verificar la búsqueda sin acentos, por prefijo y filtrada por categoría
+    """
+    memory_backend.set('topics', 'py-funciones', {
+        'title': 'Funciones lambda', 'category_id': 'python',
+        'details': ['Una función anónima de una sola expresión.']})
+    memory_backend.set('topics', 'js-closures', {
+        'title': 'Scope y closures', 'category_id': 'js-react',
+        'details': ['Una función interna accede al scope de la externa.']})
+
+    body = client.get('/api/v1/topics/search?q=FUNCION').json()
+    assert body['query'] == 'FUNCION'
+    assert [t['id'] for t in body['items']] == ['py-funciones', 'js-closures']
+    assert body['items'][0]['score'] > body['items'][1]['score']
+
+    body = client.get('/api/v1/topics/search?q=clos').json()
+    assert [t['id'] for t in body['items']] == ['js-closures']
+
+    body = client.get('/api/v1/topics/search?q=función&category_id=js-react').json()
+    assert [t['id'] for t in body['items']] == ['js-closures']
+
+
+def test_search_topics_follows_catalog_changes(client, memory_backend):
+    """
+    Test para verificar que el índice se actualiza al cambiar el catálogo
+    """
+    assert client.get('/api/v1/topics/search?q=detalle').json()['items']
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Índices compuestos', 'category_id': 'sql', 'details': ['Orden de campos']})
+    memory_backend.delete('topics', 'topic-2')
+    get_catalog().invalidate()
+
+    ids = [t['id'] for t in client.get('/api/v1/topics/search?q=indices').json()['items']]
+    assert ids == ['topic-1']
+    ids = {t['id'] for t in client.get('/api/v1/topics/search?q=detalle').json()['items']}
+    assert ids == {'topic-0', 'topic-3', 'topic-4'}
+    assert client.get('/api/v1/topics/search?q=').status_code == 422
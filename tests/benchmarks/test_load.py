@@ -0,0 +1,45 @@
+from benchmarks import load, run
+from benchmarks.common import latency_summary
+from benchmarks.data import generate_progress, generate_topics
+
+
+def test_generators_are_deterministic():
+    """
+    Test para verificar que los generadores sintéticos son reproducibles con la misma semilla
+    """
+    topics = generate_topics(20, seed=1)
+    assert topics == generate_topics(20, seed=1)
+    topic_ids = [doc_id for doc_id, _ in topics]
+    progress = generate_progress(['u1', 'u2'], topic_ids, studied_fraction=0.5, seed=1)
+    assert len(progress) == 20
+    assert {data['user_id'] for _, data in progress} == {'u1', 'u2'}
+
+
+def test_latency_summary_percentiles():
+    """
+    Test para verificar p50/p95/p99 y rps del resumen de latencias
+    """
+    summary = latency_summary([i / 1000 for i in range(1, 101)], elapsed=2.0)
+    assert (summary['p50_ms'], summary['p95_ms'], summary['p99_ms']) == (50, 95, 99)
+    assert summary['rps'] == 50
+
+
+def test_load_driver_runs_every_scenario():
+    """
+    Test para verificar que el driver de carga ejecuta los escenarios contra la app real sin errores
+    """
+    results = load.run(users=3, topics=20, requests=12, concurrency=3)
+    assert set(results) == set(load.SCENARIOS)
+    for summary in results.values():
+        assert summary['requests'] == 12
+        assert summary['errors'] == {}
+
+
+def test_compare_reports_relative_changes():
+    """
+    Test para verificar la comparación entre dos ejecuciones guardadas
+    """
+    previous = {'load': {'topics': {'p95_ms': 10.0, 'rps': 100, 'requests': 5}}}
+    current = {'load': {'topics': {'p95_ms': 12.0, 'rps': 90, 'requests': 5}}}
+    changes = {metric: change for metric, _, _, change in run.compare(current, previous)}
+    assert changes == {'load.topics.p95_ms': 20.0, 'load.topics.rps': -10.0}
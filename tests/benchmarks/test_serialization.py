@@ -0,0 +1,10 @@
+from benchmarks import serialization
+
+
+def test_serialization_benchmark_paths_agree():
+    """
+    Test para verificar que las variantes del benchmark producen el mismo JSON
+    """
+    result = serialization.run(size=50, repeat=1)
+    assert set(result['seconds']) == {'legacy', 'app'}
+    assert result['speedup']['legacy'] == 1
@@ -0,0 +1,44 @@
+import pytest
+from app.middleware.admission import get_admission_controller
+from app.repositories.backends import (AsyncMemoryBackend, MemoryBackend, set_async_backend,
+                                       set_backend)
+from app.repositories.topic_repository import get_catalog
+from app.services.session_service import get_session_memo
+
+
+class FakeClock:
+    """
+    Reloj manual para los componentes que reciben `clock`: se avanza con `now`
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def memory_backend():
+    """
+    Backend en memoria instalado como backend del proceso (vía síncrona y async)
+    """
+    backend = MemoryBackend()
+    set_backend(backend)
+    set_async_backend(AsyncMemoryBackend(backend))
+    catalog = get_catalog()
+    catalog.stop()
+    catalog.invalidate()
+    get_session_memo().clear()
+    get_admission_controller().reset()
+    yield backend
+    catalog.stop()
+    catalog.invalidate()
+    get_session_memo().clear()
+    set_async_backend(None)
+    set_backend(None)
@@ -0,0 +1,63 @@
+import gzip
+
+from app.core.http_cache import (ResponseCache, choose_encoding, etag_matches,
+                                 prepare_response)
+
+
+def test_prepare_response_compresses_once():
+    """
+    Test para verificar que el cuerpo se comprime y cada codificación tiene su ETag
+    """
+    body = b'{"items": []}' * 100
+    prepared = prepare_response('abc', body)
+    assert gzip.decompress(prepared.encoded['gzip']) == body
+    assert prepared.for_encoding('gzip')[1] == '"abc-gzip"'
+    assert prepared.for_encoding(None) == (body, '"abc"')
+    assert prepare_response('abc', b'{}').encoded == {}
+
+
+def test_choose_encoding_respects_quality():
+    """
+    Test para verificar la negociación de Accept-Encoding
+    """
+    available = {'gzip': b''}
+    assert choose_encoding('gzip, deflate', available) == 'gzip'
+    assert choose_encoding('gzip;q=0', available) is None
+    assert choose_encoding('*', available) == 'gzip'
+    assert choose_encoding(None, available) is None
+
+
+def test_wildcard_does_not_pick_refused_encodings():
+    """
+    Test para verificar que `*` no elige una codificación rechazada con q=0
+    """
+    available = {'br': b'', 'gzip': b''}
+    assert choose_encoding('br;q=0, *', available) == 'gzip'
+    assert choose_encoding('*, gzip;q=0, br;q=0', available) is None
+    assert choose_encoding('br;q=0, gzip', available) == 'gzip'
+
+
+def test_etag_matches_only_the_same_encoding():
+    """
+    Test para verificar If-None-Match con listas, variantes comprimidas y ETags débiles
+    """
+    assert etag_matches('"abc"', 'abc')
+    assert etag_matches('"zzz", W/"abc-gzip"', '"abc-gzip"')
+    assert not etag_matches('"abc-gzip"', '"abc"')
+    assert not etag_matches('"abc"', '"abc-gzip"')
+    assert etag_matches('*', 'abc')
+    assert not etag_matches('"abd"', 'abc')
+    assert not etag_matches(None, 'abc')
+
+
+def test_response_cache_drops_entries_on_new_version():
+    """
+    Test para verificar que el cache se vacía al cambiar la versión
+    """
+    cache = ResponseCache(max_entries=2)
+    assert cache.get('v1', 'a') is None
+    cache.put('v1', 'a', prepare_response('a', b'1'))
+    assert cache.get('v1', 'a') is not None
+    assert cache.get('v2', 'a') is None
+    cache.put('v1', 'b', prepare_response('b', b'2'))
+    assert cache.stats()['size'] == 0
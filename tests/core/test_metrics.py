@@ -0,0 +1,47 @@
+from app.core.metrics import MetricsRegistry, render_gauges
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    """
+    Test para verificar el formato de texto de Prometheus de contadores e histogramas
+    """
+    registry = MetricsRegistry()
+    calls = registry.counter('calls_total', 'Llamadas', ('route',))
+    latency = registry.histogram('latency_seconds', 'Latencia', ('route',), buckets=(0.1, 1.0))
+    calls.inc(route='/a')
+    calls.inc(2, route='/a')
+    latency.observe(0.05, route='/a')
+    latency.observe(0.5, route='/a')
+    latency.observe(3, route='/a')
+
+    lines = registry.render().splitlines()
+    assert '# TYPE calls_total counter' in lines
+    assert 'calls_total{route="/a"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+
+
+def test_registry_reuses_metrics_and_escapes_labels():
+    """
+    Test para verificar que registrar dos veces devuelve la misma métrica y que se escapan los labels
+    """
+    registry = MetricsRegistry()
+    first = registry.counter('calls_total', 'Llamadas', ('route',))
+    assert registry.counter('calls_total', 'Llamadas', ('route',)) is first
+    first.inc(route='a"b')
+    assert 'calls_total{route="a\\"b"} 1' in registry.render()
+
+
+def test_render_gauges_skips_non_numeric_values():
+    """
+    Test para verificar que solo se exportan los valores numéricos de unas stats
+    """
+    output = render_gauges('cache', {'hits': 3, 'listening': True, 'age_seconds': None,
+                                     'content_hash': 'abc'})
+    assert 'cache_hits 3' in output
+    assert 'cache_listening 1' in output
+    assert 'age_seconds' not in output
+    assert 'content_hash' not in output
@@ -0,0 +1,69 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from app.core.startup import StartupReport
+
+
+def test_startup_report_times_each_step(fake_clock):
+    """
+    Test para verificar el reporte de arranque: imports, pasos (con error) y total
+    """
+    report = StartupReport(clock=fake_clock)
+    fake_clock.now = 0.5
+    report.mark_app_created()
+    with report.step('topic_catalog'):
+        fake_clock.now = 0.75
+    with pytest.raises(RuntimeError):
+        with report.step('token_keys'):
+            fake_clock.now = 1.0
+            raise RuntimeError('sin red')
+    report.mark_ready()
+
+    assert report.report() == {
+        'import_seconds': 0.5,
+        'steps': [{'name': 'topic_catalog', 'seconds': 0.25, 'error': None},
+                  {'name': 'token_keys', 'seconds': 0.25, 'error': 'RuntimeError: sin red'}],
+        'total_seconds': 1.0,
+    }
+
+
+def test_importing_the_app_does_not_load_firebase():
+    """
+    Test para verificar que importar la aplicación no importa firebase_admin ni el cliente gRPC
+    """
+    code = ("import sys, app.main; "
+            "print('firebase_admin' in sys.modules, 'google.cloud.firestore' in sys.modules)")
+    result = subprocess.run([sys.executable, '-W', 'ignore', '-c', code],
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False False'
+
+
+def test_warmup_loads_catalog_and_survives_failures(memory_backend, monkeypatch):
+    """
+    Test para verificar que el warmup carga el catálogo y que un paso fallido no impide arrancar
+    """
+    from app import main
+    from app.middleware import auth
+
+    class BrokenKeyStore:
+        def start(self):
+            raise ConnectionError('sin red')
+
+    class Verifier:
+        key_store = BrokenKeyStore()
+
+    monkeypatch.setattr(auth, 'get_verifier', lambda: Verifier())
+    report = StartupReport()
+    monkeypatch.setattr(main, 'startup_report', report)
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+
+    asyncio.run(main.warmup())
+
+    steps = {step['name']: step['error'] for step in report.report()['steps']}
+    assert steps['topic_catalog'] is None
+    assert steps['token_keys'] == 'ConnectionError: sin red'
+    assert main.get_catalog().stats()['size'] == 1
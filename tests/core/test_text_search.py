@@ -0,0 +1,54 @@
+from collections import Counter
+
+from app.core.text_search import InvertedIndex, normalize, tokenize
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    """
+    Test para verificar la normalización sin acentos y sin palabras vacías
+    """
+    assert normalize('Función Año PINGÜINO') == 'funcion ano pinguino'
+    assert tokenize('La función de orden superior: map()') == [
+        'funcion', 'orden', 'superior', 'map']
+
+
+def test_bm25_ranks_frequent_and_rare_terms_higher():
+    """
+    Test para verificar que BM25 premia la frecuencia y los términos poco comunes
+    """
+    index = InvertedIndex()
+    index.upsert('a', Counter({'closure': 3, 'scope': 1}))
+    index.upsert('b', Counter({'closure': 1, 'scope': 1, 'hoisting': 1}))
+    index.upsert('c', Counter({'scope': 2}))
+
+    assert [doc_id for doc_id, _ in index.search('closure')] == ['a', 'b']
+    assert index.search('hoisting scope')[0][0] == 'b'
+    assert index.search('inexistente') == []
+
+
+def test_prefix_matching_and_exact_boost():
+    """
+    Test para verificar las coincidencias por prefijo, con menos peso que las exactas
+    """
+    index = InvertedIndex()
+    index.upsert('exacto', Counter({'map': 1}))
+    index.upsert('prefijo', Counter({'mapping': 1}))
+
+    assert [doc_id for doc_id, _ in index.search('map')] == ['exacto', 'prefijo']
+    assert [doc_id for doc_id, _ in index.search('map', prefix=False)] == ['exacto']
+    assert [doc_id for doc_id, _ in index.search('mapp')] == ['prefijo']
+
+
+def test_upsert_and_remove_keep_statistics():
+    """
+    Test para verificar que reemplazar y quitar documentos actualiza el índice
+    """
+    index = InvertedIndex()
+    index.upsert('a', Counter({'python': 1}))
+    index.upsert('a', Counter({'sql': 2}))
+    assert index.search('python') == []
+    assert index.stats() == {'documents': 1, 'terms': 1}
+
+    index.remove('a')
+    assert len(index) == 0 and index.search('sql') == []
+    assert index.stats() == {'documents': 0, 'terms': 0}
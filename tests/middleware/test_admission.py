@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import ADMISSION_DECISIONS
+from app.main import app
+from app.middleware.admission import (AdmissionController, TokenBucket,
+                                      get_admission_controller, route_cost,
+                                      set_admission_controller)
+from app.middleware.auth import get_current_user
+
+
+def test_token_bucket_refills_up_to_capacity():
+    """
+    Test para verificar el rellenado del bucket y la espera calculada
+    """
+    bucket = TokenBucket(rate=2, capacity=4, now=0)
+    assert bucket.wait_time(4, now=0) == 0
+    bucket.take(4)
+    assert bucket.wait_time(3, now=0.5) == 1.0
+    assert bucket.wait_time(1, now=100) == 0
+    assert bucket.tokens == 4
+
+
+def test_controller_limits_each_user_independently(fake_clock):
+    """
+    Test para verificar que un usuario sin tokens no afecta a los demás
+    """
+    controller = AdmissionController(user_rate=1, user_burst=3, global_rate=100,
+                                     global_burst=100, clock=fake_clock)
+    assert controller.acquire('ana', 3) == ('admitted', 0.0)
+    assert controller.acquire('ana', 1) == ('rejected_user', 1.0)
+    assert controller.acquire('luis', 3)[0] == 'admitted'
+    fake_clock.now = 1
+    assert controller.acquire('ana', 1)[0] == 'admitted'
+    assert controller.stats()['rejected_user'] == 1
+
+
+def test_controller_global_bucket_and_no_charge_on_rejection(fake_clock):
+    """
+    Test para verificar el bucket global y que un rechazo no consume tokens
+    """
+    controller = AdmissionController(user_rate=10, user_burst=10, global_rate=1,
+                                     global_burst=5, max_users=2, clock=fake_clock)
+    assert controller.acquire('ana', 4)[0] == 'admitted'
+    assert controller.acquire('luis', 4) == ('rejected_global', 3.0)
+    assert controller.acquire('luis', 1)[0] == 'admitted'
+    controller.acquire('eva', 1)
+    assert controller.stats()['tracked_users'] == 2
+
+
+@pytest.fixture
+def client(memory_backend, fake_clock):
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    original = get_admission_controller()
+    set_admission_controller(AdmissionController(user_rate=1, user_burst=8, global_rate=100,
+                                                  global_burst=100, clock=fake_clock))
+    app.dependency_overrides[get_current_user] = lambda: {'uid': 'user123'}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    set_admission_controller(original)
+
+
+def test_requests_over_budget_get_429_with_retry_after(client):
+    """
+    Test para verificar el 429 con Retry-After según el coste de la ruta
+    """
+    assert route_cost('POST', '/api/v1/sessions/today') == 3
+    payload = {'user_id': 'user123', 'topic_ids': []}
+    rejected = ADMISSION_DECISIONS.value(route='/api/v1/sessions/today', result='rejected_user')
+
+    assert client.post('/api/v1/sessions/today', json=payload).status_code == 200
+    assert client.post('/api/v1/sessions/today', json=payload).status_code == 200
+    response = client.post('/api/v1/sessions/today', json=payload)
+
+    assert response.status_code == 429
+    assert response.headers['retry-after'] == '1'
+    assert ADMISSION_DECISIONS.value(route='/api/v1/sessions/today',
+                                     result='rejected_user') == rejected + 1
+    # Las rutas públicas no pasan por el control de admisión
+    assert client.get('/api/v1/topics').status_code == 200
+
+
+def test_bulk_sync_is_charged_per_item(client, memory_backend):
+    """
+    Test para verificar que el coste del bulk crece con el número de elementos
+    """
+    assert route_cost('POST', '/api/v1/progress/bulk', {'items': [{}] * 3}) == 8
+    assert route_cost('POST', '/api/v1/progress/bulk', None) == 2
+
+    def bulk(count):
+        return client.post('/api/v1/progress/bulk', json={
+            'user_id': 'user123',
+            'items': [{'topic_id': 'topic-1', 'status': 'completed'}] * count})
+
+    assert bulk(3).status_code == 200
+    response = bulk(1)
+    assert response.status_code == 429
+    assert response.headers['retry-after'] == '4'
@@ -0,0 +1,286 @@
+import datetime
+import threading
+import time
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.middleware.auth import (ExpiredTokenError, FirebaseTokenVerifier, InvalidTokenError,
+                                 PublicKeyStore, RevokedTokenError, TokenCache, set_verifier,
+                                 stop_key_rotation)
+
+PROJECT_ID = 'interviewsprint-test'
+NOW = 1_760_000_000
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_key_and_cert():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'securetoken')])
+    start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    cert = (x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(start)
+            .not_valid_after(start + datetime.timedelta(days=3650))
+            .sign(key, hashes.SHA256()))
+    return key, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+@pytest.fixture(scope='module')
+def signing_key():
+    return make_key_and_cert()
+
+
+class Fetcher:
+    def __init__(self, certs):
+        self.certs = certs
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return dict(self.certs), 3600
+
+
+def mint(private_key, kid='kid-1', **overrides):
+    claims = {
+        'iss': f'https://securetoken.google.com/{PROJECT_ID}',
+        'aud': PROJECT_ID,
+        'sub': 'user123',
+        'iat': NOW - 10,
+        'auth_time': NOW - 10,
+        'exp': NOW + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm='RS256', headers={'kid': kid})
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def fetcher(signing_key):
+    return Fetcher({'kid-1': signing_key[1]})
+
+
+@pytest.fixture
+def verifier(clock, fetcher):
+    return FirebaseTokenVerifier(
+        PROJECT_ID,
+        key_store=PublicKeyStore(fetcher=fetcher, clock=clock),
+        cache=TokenCache(max_size=2, clock=clock),
+        clock=clock,
+        revocation_checker=lambda claims: None,
+    )
+
+
+def test_valid_token_returns_claims_with_uid(verifier, signing_key):
+    """
+    Test para verificar un token válido firmado con una clave local
+    """
+    claims = verifier.verify(mint(signing_key[0]))
+    assert claims['uid'] == 'user123'
+
+
+def test_repeated_token_is_served_from_cache(verifier, signing_key, fetcher):
+    """
+    Test para verificar que el mismo token solo se verifica una vez
+    """
+    token = mint(signing_key[0])
+    for _ in range(5):
+        verifier.verify(token)
+
+    stats = verifier.stats()
+    assert stats['verified'] == 1
+    assert stats['cache_hits'] == 4
+    assert fetcher.calls == 1
+
+
+def test_cached_token_expires_with_exp(verifier, signing_key, clock):
+    """
+    Test para verificar que la entrada en cache vence con el exp del token
+    """
+    token = mint(signing_key[0], exp=NOW + 60)
+    verifier.verify(token)
+    clock.now += 61
+    with pytest.raises(ExpiredTokenError):
+        verifier.verify(token)
+
+
+def test_cache_is_bounded_by_size(verifier, signing_key):
+    """
+    Test para verificar que el LRU descarta las entradas más antiguas
+    """
+    for uid in ('a', 'b', 'c'):
+        verifier.verify(mint(signing_key[0], sub=uid))
+    assert verifier.stats()['cache_size'] == 2
+    assert verifier.stats()['cache_evictions'] == 1
+
+
+@pytest.mark.parametrize('overrides', [
+    {'aud': 'otro-proyecto'},
+    {'iss': 'https://securetoken.google.com/otro-proyecto'},
+    {'sub': ''},
+    {'iat': NOW + 600},
+])
+def test_invalid_claims_are_rejected(verifier, signing_key, overrides):
+    """
+    Test para verificar que se rechazan claims inválidos
+    """
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(mint(signing_key[0], **overrides))
+    assert verifier.stats()['failures'] == 1
+
+
+def test_token_signed_with_other_key_is_rejected(verifier):
+    """
+    Test para verificar que una firma con otra clave no es válida
+    """
+    other_key, _ = make_key_and_cert()
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(mint(other_key))
+
+
+def test_unknown_kid_refreshes_keys_once(verifier, signing_key, fetcher, clock):
+    """
+    Test para verificar la rotación: un kid nuevo fuerza una recarga acotada
+    """
+    verifier.verify(mint(signing_key[0]))
+    clock.now += 120
+    fetcher.certs['kid-2'] = signing_key[1]
+    assert verifier.verify(mint(signing_key[0], kid='kid-2', sub='otro'))['uid'] == 'otro'
+    assert fetcher.calls == 2
+
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(mint(signing_key[0], kid='kid-3'))
+    assert fetcher.calls == 2
+
+
+def test_keys_are_refreshed_before_max_age(verifier, signing_key, fetcher, clock):
+    """
+    Test para verificar que las claves se renuevan antes de vencer
+    """
+    verifier.verify(mint(signing_key[0]))
+    clock.now += 3600 - 100
+    verifier.verify(mint(signing_key[0], sub='otro', exp=clock.now + 60))
+    assert fetcher.calls == 2
+
+
+class FailingFetcher(Fetcher):
+    def __init__(self, certs):
+        super().__init__(certs)
+        self.failing = False
+
+    def __call__(self):
+        if self.failing:
+            self.calls += 1
+            raise ConnectionError("certs endpoint down")
+        return super().__call__()
+
+
+def test_failed_refresh_serves_cached_keys_and_backs_off(signing_key, clock):
+    """
+    Test para verificar que si falla la renovación se siguen usando las claves hasta que vencen
+    """
+    fetcher = FailingFetcher({'kid-1': signing_key[1]})
+    store = PublicKeyStore(fetcher=fetcher, clock=clock, failure_backoff=10.0)
+    store.get_key('kid-1')
+    fetcher.failing = True
+
+    clock.now += 3600 - 100
+    for _ in range(5):
+        assert store.get_key('kid-1') is not None
+    assert fetcher.calls == 2 and store.refresh_failures == 1
+
+    clock.now += 10
+    store.get_key('kid-1')
+    assert fetcher.calls == 3
+
+    clock.now += 100
+    with pytest.raises(InvalidTokenError):
+        store.get_key('kid-1')
+
+
+def test_unknown_kid_with_fetch_error_is_invalid_token(signing_key, clock):
+    """
+    Test para verificar que un error al descargar las claves por un kid desconocido da 401, no 500
+    """
+    fetcher = FailingFetcher({'kid-1': signing_key[1]})
+    store = PublicKeyStore(fetcher=fetcher, clock=clock)
+    store.get_key('kid-1')
+    fetcher.failing = True
+    clock.now += 120
+
+    with pytest.raises(InvalidTokenError):
+        store.get_key('kid-2')
+    with pytest.raises(InvalidTokenError):
+        store.get_key('kid-2')
+    assert fetcher.calls == 2
+
+
+def test_concurrent_refreshes_fetch_once(signing_key, clock):
+    """
+    Test para verificar que peticiones concurrentes con las claves vencidas descargan una sola vez
+    """
+    class SlowFetcher(Fetcher):
+        def __call__(self):
+            time.sleep(0.05)
+            return super().__call__()
+
+    fetcher = SlowFetcher({'kid-1': signing_key[1]})
+    store = PublicKeyStore(fetcher=fetcher, clock=clock)
+    threads = [threading.Thread(target=store.get_key, args=('kid-1',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fetcher.calls == 1
+
+
+def test_stop_ends_the_rotation_thread(verifier, signing_key, fetcher):
+    """
+    Test para verificar que stop() para el hilo de rotación, también desde el verificador del proceso
+    """
+    store = PublicKeyStore(fetcher=fetcher)
+    store.start()
+    rotation = store._rotation
+    assert rotation.is_alive()
+    store.stop()
+    assert not rotation.is_alive()
+
+    verifier.key_store.start()
+    rotation = verifier.key_store._rotation
+    set_verifier(verifier)
+    try:
+        stop_key_rotation()
+    finally:
+        set_verifier(None)
+    assert not rotation.is_alive()
+
+
+def test_revocation_check_is_opt_in(verifier, signing_key):
+    """
+    Test para verificar que la revocación solo se consulta si se pide
+    """
+    def revoked(claims):
+        raise RevokedTokenError("Token revoked")
+
+    verifier.revocation_checker = revoked
+    token = mint(signing_key[0])
+    assert verifier.verify(token)['uid'] == 'user123'
+    with pytest.raises(RevokedTokenError):
+        verifier.verify(token, check_revoked=True)
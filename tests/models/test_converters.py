@@ -0,0 +1,49 @@
+from datetime import datetime, UTC
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.converters import (progress_from_document, session_item_from_topic,
+                                   topic_from_document)
+from app.models.progress import ProgressResponse
+from app.models.topic import TopicResponse
+
+
+def test_topic_from_document_skips_validation_and_extra_fields():
+    """
+    Test para verificar que un documento completo se construye sin revalidar y sin campos extra
+    """
+    topic = topic_from_document('py-decoradores', {
+        'title': 'Decoradores', 'category_id': 'python', 'details': ['Detalle'],
+        'created_at': datetime.now(UTC)})
+    assert isinstance(topic, TopicResponse)
+    assert topic.model_dump() == {'title': 'Decoradores', 'category_id': 'python',
+                                  'details': ['Detalle'], 'id': 'py-decoradores'}
+
+
+def test_incomplete_document_is_fully_validated():
+    """
+    Test para verificar que si faltan campos obligatorios se valida y falla con un error claro
+    """
+    with pytest.raises(ValidationError):
+        topic_from_document('roto', {'title': 'Sin categoría'})
+
+
+def test_progress_from_document_fills_defaults():
+    """
+    Test para verificar que los campos con valor por defecto se completan sin validar
+    """
+    now = datetime.now(UTC)
+    progress = progress_from_document('user123_t', {
+        'user_id': 'user123', 'topic_id': 't', 'status': 'completed',
+        'created_at': now, 'updated_at': now})
+    assert isinstance(progress, ProgressResponse)
+    assert (progress.confidence_level, progress.streak, progress.notes) == (1, 0, '')
+
+
+def test_session_item_from_topic():
+    """
+    Test para verificar el SessionItem construido desde un tema
+    """
+    topic = topic_from_document('t', {'title': 'T', 'category_id': 'python', 'details': ['D']})
+    assert session_item_from_topic(topic).model_dump()['topic_id'] == 't'
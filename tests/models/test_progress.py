@@ -46,6 +46,18 @@ def test_progress_create_valid():
     assert progress.status == "completed"
 
 
+def test_progress_create_ignores_server_fields():
+    """
+    Test para verificar que la racha y la última revisión no se aceptan del cliente
+    """
+    progress = ProgressCreate(user_id="user456", topic_id="py-decoradores", status="completed",
+                              streak=30, last_reviewed_at=datetime(2024, 1, 1))
+    assert 'streak' not in progress.model_dump()
+    assert 'last_reviewed_at' not in progress.model_dump()
+    assert 'streak' in ProgressResponse.model_fields
+    assert 'streak' not in ProgressCreate.model_json_schema()['properties']
+
+
 def test_progress_update_partial():
     """
     Test para actualización parcial de progreso
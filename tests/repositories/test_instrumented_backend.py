@@ -0,0 +1,39 @@
+import asyncio
+
+from app.core.metrics import STORAGE_DOCUMENTS_READ, current_request_stats, start_request_stats
+from app.repositories.backends import AsyncMemoryBackend, InstrumentedBackend, WriteOp
+
+
+def test_instrumented_backend_counts_reads_and_writes():
+    """
+    Test para verificar que el envoltorio cuenta lecturas, escrituras y documentos por petición
+    """
+    backend = InstrumentedBackend(AsyncMemoryBackend())
+    before = STORAGE_DOCUMENTS_READ.value(collection='medidas')
+
+    async def scenario():
+        stats, _ = start_request_stats()
+        await backend.write_batch([WriteOp('set', 'medidas', f'doc-{i}', {'n': i})
+                                   for i in range(3)])
+        await backend.get('medidas', 'doc-0')
+        await backend.get('medidas', 'no-existe')
+        await backend.query('medidas')
+        docs = [doc async for doc in backend.stream('medidas')]
+        assert current_request_stats() is stats
+        return stats, docs
+
+    stats, docs = asyncio.run(scenario())
+    assert len(docs) == 3
+    assert (stats.reads, stats.documents_read) == (4, 7)
+    assert (stats.writes, stats.documents_written) == (1, 3)
+    assert STORAGE_DOCUMENTS_READ.value(collection='medidas') - before == 7
+
+
+def test_instrumented_backend_without_request_context():
+    """
+    Test para verificar que fuera de una petición solo se actualizan las métricas globales
+    """
+    backend = InstrumentedBackend(AsyncMemoryBackend())
+    asyncio.run(backend.set('medidas', 'doc', {'n': 1}))
+    assert current_request_stats() is None
+    assert backend.sync.get('medidas', 'doc') == {'n': 1}
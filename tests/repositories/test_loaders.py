@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.repositories.loaders import DataLoader
+
+
+def make_loader(calls, max_batch_size=100, fail=False):
+    async def batch_load(keys):
+        calls.append(list(keys))
+        await asyncio.sleep(0)
+        if fail:
+            raise RuntimeError('sin red')
+        return {key: key * 10 for key in keys if key >= 0}
+    return DataLoader(batch_load, max_batch_size=max_batch_size)
+
+
+def test_loads_in_the_same_tick_are_batched_and_deduped():
+    """
+    Test para verificar que las cargas concurrentes se agrupan en un solo lote sin duplicados
+    """
+    calls = []
+
+    async def run():
+        loader = make_loader(calls)
+        return await asyncio.gather(loader.load(1), loader.load(2), loader.load(1),
+                                    loader.load_many([3, 2, -1]))
+
+    assert asyncio.run(run()) == [10, 20, 10, [30, 20, None]]
+    assert calls == [[1, 2, 3, -1]]
+
+
+def test_batches_are_chunked_and_results_cached():
+    """
+    Test para verificar el troceado por tamaño máximo y la reutilización de resultados
+    """
+    calls = []
+
+    async def run():
+        loader = make_loader(calls, max_batch_size=2)
+        first = await loader.load_many([1, 2, 3, 4, 5])
+        again = await loader.load_many([5, 1])
+        return first, again, loader.stats()
+
+    first, again, stats = asyncio.run(run())
+    assert first == [10, 20, 30, 40, 50] and again == [50, 10]
+    assert calls == [[1, 2], [3, 4], [5]]
+    assert stats == {'loads': 7, 'cached': 2, 'batches': 3, 'keys': 5}
+
+
+def test_failed_batch_is_not_cached():
+    """
+    Test para verificar que un lote fallido propaga el error y permite reintentar
+    """
+    calls = []
+
+    async def run():
+        loader = make_loader(calls, fail=True)
+        with pytest.raises(RuntimeError):
+            await loader.load(1)
+        with pytest.raises(RuntimeError):
+            await loader.load(1)
+
+    asyncio.run(run())
+    assert calls == [[1], [1]]
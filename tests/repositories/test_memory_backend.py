@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+from app.repositories.backends import (DELETE_FIELD, DocumentNotFoundError, MemoryBackend,
+                                       WriteOp)
+
+
+@pytest.fixture
+def backend():
+    backend = MemoryBackend()
+    backend.set('progress', 'p1', {'user_id': 'u1', 'topic_id': 'js-closures', 'status': 'completed', 'score': 3})
+    backend.set('progress', 'p2', {'user_id': 'u1', 'topic_id': 'py-decoradores', 'status': 'in-progress', 'score': 1})
+    backend.set('progress', 'p3', {'user_id': 'u2', 'topic_id': 'sql-joins', 'status': 'completed', 'score': 2})
+    backend.set('progress', 'p4', {'user_id': 'u1', 'topic_id': 'sql-joins', 'status': 'completed'})
+    return backend
+
+
+def ids(docs):
+    return [doc.id for doc in docs]
+
+
+def test_query_equality_and_in_filters(backend):
+    """
+    Test para verificar los filtros de igualdad e 'in'
+    """
+    assert ids(backend.query('progress', [('user_id', '==', 'u1')])) == ['p1', 'p2', 'p4']
+    assert ids(backend.query('progress', [('user_id', '==', 'u1'),
+                                          ('status', '==', 'completed')])) == ['p1', 'p4']
+    assert ids(backend.query('progress', [('topic_id', 'in', ['sql-joins'])])) == ['p3', 'p4']
+
+
+def test_query_range_filters(backend):
+    """
+    Test para verificar los filtros de rango, que no comparan valores de distinto tipo
+    """
+    assert ids(backend.query('progress', [('user_id', '>', 'u1')])) == ['p3']
+    assert ids(backend.query('progress', [('user_id', '<=', 'u1')])) == ['p1', 'p2', 'p4']
+    assert ids(backend.query('progress', [('user_id', '>=', 5)])) == []
+
+
+def test_query_order_by_excludes_missing_field(backend):
+    """
+    Test para verificar que order_by excluye documentos sin el campo, como Firestore
+    """
+    assert ids(backend.query('progress', order_by='score')) == ['p2', 'p3', 'p1']
+    assert ids(backend.query('progress', order_by='score', descending=True)) == ['p1', 'p3', 'p2']
+
+
+def test_query_limit_and_cursor_pagination(backend):
+    """
+    Test para verificar la paginación con limit y start_after
+    """
+    first = backend.query('progress', limit=2)
+    second = backend.query('progress', limit=2, start_after=first[-1].id)
+    assert ids(first) == ['p1', 'p2']
+    assert ids(second) == ['p3', 'p4']
+    assert backend.query('progress', limit=2, start_after='p4') == []
+
+    by_score = backend.query('progress', order_by='score', limit=1, start_after='p2')
+    assert ids(by_score) == ['p3']
+
+
+def test_query_select_projection(backend):
+    """
+    Test para verificar que select() devuelve solo los campos pedidos
+    """
+    docs = backend.query('progress', [('user_id', '==', 'u2')], select=['status'])
+    assert docs[0].data == {'status': 'completed'}
+
+
+def test_count_and_get_many(backend):
+    """
+    Test para verificar count() y la lectura múltiple
+    """
+    assert backend.count('progress', [('status', '==', 'completed')]) == 3
+    assert set(backend.get_many('progress', ['p1', 'p3', 'no-existe'])) == {'p1', 'p3'}
+
+
+def test_update_with_dotted_paths_and_merge(backend):
+    """
+    Test para verificar update con rutas de puntos y set con merge profundo
+    """
+    backend.set('due', 'u1', {'topics': {'a': 1}})
+    backend.update('due', 'u1', {'topics.b': 2})
+    backend.set('due', 'u1', {'topics': {'c': 3}}, merge=True)
+    backend.update('due', 'u1', {'topics.a': DELETE_FIELD})
+    assert backend.get('due', 'u1') == {'topics': {'b': 2, 'c': 3}}
+
+    with pytest.raises(DocumentNotFoundError):
+        backend.update('due', 'no-existe', {'x': 1})
+
+
+def test_write_batch_is_atomic(backend):
+    """
+    Test para verificar que un batch con un update inválido no aplica nada
+    """
+    with pytest.raises(DocumentNotFoundError):
+        backend.write_batch([
+            WriteOp('set', 'progress', 'p5', {'user_id': 'u3'}),
+            WriteOp('update', 'progress', 'no-existe', {'status': 'completed'}),
+        ])
+    assert backend.get('progress', 'p5') is None
+
+
+def test_returned_documents_are_copies(backend):
+    """
+    Test para verificar que modificar un resultado no altera el almacenamiento
+    """
+    backend.get('progress', 'p1')['status'] = 'modificado'
+    backend.query('progress')[0].data['status'] = 'modificado'
+    assert backend.get('progress', 'p1')['status'] == 'completed'
+
+
+def test_watch_receives_collection_on_each_write(backend):
+    """
+    Test para verificar que el listener recibe la colección tras cada escritura
+    """
+    snapshots = []
+    handle = backend.watch('progress', lambda docs: snapshots.append(ids(docs)))
+    backend.delete('progress', 'p4')
+    handle.unsubscribe()
+    backend.delete('progress', 'p3')
+
+    assert snapshots == [['p1', 'p2', 'p3', 'p4'], ['p1', 'p2', 'p3']]
+    assert handle.is_active is False
+
+
+def test_concurrent_writes_are_thread_safe():
+    """
+    Test para verificar escrituras concurrentes desde varios hilos
+    """
+    backend = MemoryBackend()
+
+    def write(worker):
+        for i in range(200):
+            backend.set('progress', f'{worker}-{i}', {'user_id': str(worker)})
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.count('progress') == 1600
+
+
+def test_transform_merges_what_fn_returns(backend):
+    """
+    Test para verificar que transform lee el documento, escribe con merge y no escribe si fn devuelve None
+    """
+    backend.set('user_progress', 'ana', {'topics': {'a': {'status': 'completed'}}})
+
+    result = backend.transform('user_progress', 'ana',
+                               lambda data: {'topics': {'b': {'status': len(data['topics'])}}})
+    assert result == {'topics': {'b': {'status': 1}}}
+    assert backend.get('user_progress', 'ana') == {
+        'topics': {'a': {'status': 'completed'}, 'b': {'status': 1}}}
+
+    assert backend.transform('user_progress', 'luis', lambda data: None) is None
+    assert backend.get('user_progress', 'luis') is None
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, UTC
+
+import pytest
+
+from app.core import config
+from app.repositories import progress_repository
+
+
+@pytest.fixture
+def user_map_layout(memory_backend, monkeypatch):
+    monkeypatch.setattr(config, 'progress_layout', 'user_map')
+    return memory_backend
+
+
+def test_user_map_layout_keeps_one_document_per_user(user_map_layout):
+    """
+    Test para verificar que con 'user_map' todo el progreso de un usuario vive en un documento
+    """
+    now = datetime.now(UTC)
+    asyncio.run(progress_repository.save_progress('ana', 'topic-1', {
+        'status': 'in-progress', 'created_at': now, 'updated_at': now}))
+    asyncio.run(progress_repository.save_progress_many('ana', {
+        'topic-2': {'status': 'completed', 'created_at': now, 'updated_at': now},
+        'topic-1': {'confidence_level': 4, 'updated_at': now},
+    }))
+
+    stored = user_map_layout.get('user_progress', 'ana')
+    assert stored['topics']['topic-1'] == {
+        'status': 'in-progress', 'confidence_level': 4, 'created_at': now, 'updated_at': now}
+    assert user_map_layout.count('progress') == 0
+
+    progress = asyncio.run(progress_repository.get_user_progress_map('ana'))
+    assert progress['topic-1'].id == 'ana_topic-1'
+    assert progress['topic-2'].status == 'completed'
+    assert asyncio.run(progress_repository.get_progress_by_topic('ana', 'topic-3')) is None
+    assert set(asyncio.run(progress_repository.get_progress_many(
+        'ana', ['topic-2', 'topic-3']))) == {'topic-2'}
+    assert asyncio.run(progress_repository.list_users_with_progress()) == ['ana']
+
+
+def test_unknown_layout_is_rejected(memory_backend, monkeypatch):
+    """
+    Test para verificar que un PROGRESS_LAYOUT desconocido es un error
+    """
+    monkeypatch.setattr(config, 'progress_layout', 'otro')
+    with pytest.raises(ValueError):
+        asyncio.run(progress_repository.get_user_progress('ana'))
+
+
+def test_full_write_buffer_writes_through(memory_backend):
+    """
+    Test para verificar que con el buffer lleno el progreso se escribe directamente
+    """
+    from app.repositories.progress_write_buffer import ProgressWriteBuffer
+
+    # Sin awaits reales entre escrituras, el flush programado aún no ha corrido
+    buffer = ProgressWriteBuffer('progress', window_seconds=60, max_pending=1)
+    progress_repository.set_write_buffer(buffer)
+
+    async def scenario():
+        await progress_repository.save_progress('ana', 'topic-1', {'status': 'completed'})
+        await progress_repository.save_progress('ana', 'topic-2', {'status': 'completed'})
+        failed = await progress_repository.save_progress_many(
+            'ana', {'topic-3': {'status': 'in-progress'}})
+        stats = buffer.stats()
+        await buffer.close()
+        return failed, stats
+
+    try:
+        failed, stats = asyncio.run(scenario())
+    finally:
+        progress_repository.set_write_buffer(None)
+    assert failed == {}
+    assert stats['pending'] == 1 and stats['rejected'] == 2
+    assert memory_backend.get('progress', 'ana_topic-2')['status'] == 'completed'
+    assert memory_backend.get('progress', 'ana_topic-3')['status'] == 'in-progress'
+
+
+@pytest.mark.parametrize('layout', ['documents', 'user_map'])
+def test_update_progress_computes_on_the_transaction_read(memory_backend, monkeypatch, layout):
+    """
+    Test para verificar que update_progress calcula sobre lo leído en la transacción y no pisa otra escritura
+    """
+    monkeypatch.setattr(config, 'progress_layout', layout)
+    transform = memory_backend.transform
+
+    def concurrent_write_then_transform(collection, doc_id, fn):
+        # Otra petición actualiza el mismo progreso justo antes de esta transacción
+        transform(collection, doc_id, fn)
+        return transform(collection, doc_id, fn)
+
+    monkeypatch.setattr(memory_backend, 'transform', concurrent_write_then_transform)
+
+    now = datetime.now(UTC)
+
+    def review(current):
+        level = current.confidence_level + 1 if current is not None else 1
+        return {'status': 'in-progress', 'confidence_level': level,
+                'created_at': now, 'updated_at': now}
+
+    existing, fields = asyncio.run(progress_repository.update_progress('ana', 'topic-1', review))
+    assert existing.confidence_level == 1 and fields['confidence_level'] == 2
+    stored = asyncio.run(progress_repository.get_progress_by_topic('ana', 'topic-1'))
+    assert stored.confidence_level == 2
@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from app.repositories.backends import AsyncMemoryBackend
+from app.repositories.progress_write_buffer import FlushError, ProgressWriteBuffer
+
+
+class FailingBackend(AsyncMemoryBackend):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.batches = []
+
+    async def write_batch(self, operations):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('boom')
+        self.batches.append(len(operations))
+        await super().write_batch(operations)
+
+
+def test_patches_to_same_doc_are_merged():
+    """
+    Test para verificar que los parches de un mismo documento se combinan en una sola escritura
+    """
+    backend = FailingBackend(failures=0)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=60, backend=backend)
+        buffer.add('u_t', {'status': 'in-progress', 'notes': 'a'})
+        buffer.add('u_t', {'notes': 'b'})
+        assert buffer.get_pending('u_t') == {'status': 'in-progress', 'notes': 'b'}
+        await buffer.close()
+        return buffer.stats()
+
+    stats = asyncio.run(scenario())
+    assert backend.sync.get('progress', 'u_t') == {'status': 'in-progress', 'notes': 'b'}
+    assert stats['received'] == 2
+    assert stats['merged'] == 1
+    assert stats['flushed_docs'] == 1
+    assert stats['pending'] == 0
+
+
+def test_flush_after_window():
+    """
+    Test para verificar que la ventana programa el flush sin llamarlo explícitamente
+    """
+    backend = FailingBackend(failures=0)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=0.01, backend=backend)
+        buffer.add('u_t', {'status': 'completed'})
+        await asyncio.sleep(0.05)
+        return buffer.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['flushed_batches'] == 1
+    assert backend.sync.get('progress', 'u_t') == {'status': 'completed'}
+
+
+def test_flush_splits_in_batches_of_500():
+    """
+    Test para verificar que el flush respeta el límite de escrituras por batch
+    """
+    backend = FailingBackend(failures=0)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=60, max_pending=10000,
+                                     backend=backend)
+        for i in range(1200):
+            buffer.add(f'doc-{i}', {'status': 'completed'})
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert backend.batches == [500, 500, 200]
+
+
+def test_failed_batch_is_requeued_under_newer_patches():
+    """
+    Test para verificar que un batch fallido vuelve al buffer sin pisar parches más recientes
+    """
+    backend = FailingBackend(failures=1)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=60, backend=backend)
+        buffer.add('u_t', {'status': 'in-progress', 'notes': 'viejo'})
+        await buffer.flush()
+        assert buffer.get_pending('u_t') == {'status': 'in-progress', 'notes': 'viejo'}
+        buffer.add('u_t', {'notes': 'nuevo'})
+        await buffer.close()
+        return buffer.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['flush_errors'] == 1
+    assert backend.sync.get('progress', 'u_t') == {'status': 'in-progress', 'notes': 'nuevo'}
+
+
+def test_failing_backend_gets_one_flush_with_backoff():
+    """
+    Test para verificar que con el backend caído no se lanza un flush por cada escritura
+    """
+    backend = FailingBackend(failures=1000)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=1, max_pending=2,
+                                     backend=backend, max_backoff_seconds=10)
+        buffer.add('a', {'status': 'completed'})
+        buffer.add('b', {'status': 'completed'})
+        await asyncio.sleep(0.01)
+        accepted = [buffer.add(f'doc-{i}', {'status': 'completed'}) for i in range(50)]
+        assert buffer.add('a', {'notes': 'sigue'}) is True
+        await asyncio.sleep(0.01)
+        stats = buffer.stats()
+        buffer._timer.cancel()
+        return accepted, stats
+
+    accepted, stats = asyncio.run(scenario())
+    assert not any(accepted)
+    assert stats['rejected'] == 50
+    assert stats['pending'] == 2
+    # Un solo intento; el siguiente espera 2 s (la ventana duplicada)
+    assert stats['flush_errors'] == 1
+    assert stats['consecutive_errors'] == 1
+
+
+def test_pending_includes_writes_being_flushed():
+    """
+    Test para verificar que las lecturas ven los parches del flush en curso
+    """
+    class SlowBackend(AsyncMemoryBackend):
+        async def write_batch(self, operations):
+            await asyncio.sleep(0.02)
+            await super().write_batch(operations)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=60, max_pending=1,
+                                     backend=SlowBackend())
+        assert buffer.add('u_t', {'status': 'completed'}) is True
+        await asyncio.sleep(0)
+        in_flight = buffer.get_pending('u_t')
+        assert buffer.add('u_t', {'notes': 'b'}) is True
+        merged = buffer.get_pending('u_t')
+        await buffer.close()
+        return in_flight, merged
+
+    in_flight, merged = asyncio.run(scenario())
+    assert in_flight == {'status': 'completed'}
+    assert merged == {'status': 'completed', 'notes': 'b'}
+
+
+def test_close_retries_the_final_flush():
+    """
+    Test para verificar que al cerrar se reintenta el flush fallido con espera creciente
+    """
+    backend = FailingBackend(failures=2)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=0.001, backend=backend)
+        buffer.add('u_t', {'status': 'completed'})
+        await buffer.close()
+        return buffer.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['flush_errors'] == 2
+    assert stats['pending'] == 0
+    assert backend.sync.get('progress', 'u_t') == {'status': 'completed'}
+
+
+def test_close_raises_when_writes_are_still_pending():
+    """
+    Test para verificar que cerrar con el backend caído no descarta los parches en silencio
+    """
+    backend = FailingBackend(failures=1000)
+
+    async def scenario():
+        buffer = ProgressWriteBuffer('progress', window_seconds=0.001, backend=backend)
+        buffer.add('u_t', {'status': 'completed'})
+        with pytest.raises(FlushError) as error:
+            await buffer.close(attempts=2)
+        return error.value, buffer
+
+    error, buffer = asyncio.run(scenario())
+    assert error.pending == {'u_t': {'status': 'completed'}}
+    assert buffer.stats()['flush_errors'] == 2
+    assert buffer._timer is None
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from app.core import config
+from app.repositories import topic_repository
+from app.repositories.backends import AsyncMemoryBackend, MemoryBackend
+from app.repositories.topic_repository import TopicCatalogCache
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.streams = 0
+        self.fail = False
+
+    def stream(self, collection):
+        self.streams += 1
+        if self.fail:
+            raise RuntimeError("Firestore no disponible")
+        return super().stream(collection)
+
+
+def load(cache, backend):
+    asyncio.run(cache.ensure_loaded(AsyncMemoryBackend(backend)))
+
+
+def make_topic(title, category_id):
+    return {'title': title, 'category_id': category_id, 'details': ['Detalle']}
+
+
+@pytest.fixture
+def backend():
+    backend = CountingBackend()
+    backend.set('topics', 'py-decoradores', make_topic('Decoradores', 'python'))
+    backend.set('topics', 'js-closures', make_topic('Closures', 'js-react'))
+    backend.set('topics', 'py-generadores', make_topic('Generadores', 'python'))
+    return backend
+
+
+def test_catalog_loads_once_and_serves_from_memory(backend):
+    """
+    Test para verificar que las lecturas posteriores no tocan Firestore
+    """
+    cache = TopicCatalogCache(ttl_seconds=60, listen=False)
+    load(cache, backend)
+    load(cache, backend)
+    load(cache, backend)
+
+    assert backend.streams == 1
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 2
+    assert stats['size'] == 3
+
+
+def test_catalog_indexes_by_id_and_category(backend):
+    """
+    Test para verificar los índices por id y category_id
+    """
+    cache = TopicCatalogCache(ttl_seconds=60, listen=False)
+    load(cache, backend)
+
+    assert cache.get('js-closures').title == 'Closures'
+    assert cache.get('no-existe') is None
+    assert [t.id for t in cache.by_category('python')] == [
+        'py-decoradores', 'py-generadores']
+    assert cache.by_category('sql') == []
+
+
+def test_catalog_reloads_after_ttl(backend):
+    """
+    Test para verificar que el catálogo se recarga al vencer el TTL
+    """
+    cache = TopicCatalogCache(ttl_seconds=0, listen=False)
+    load(cache, backend)
+    load(cache, backend)
+
+    assert backend.streams == 2
+    assert cache.version == 2
+
+
+def test_catalog_serves_stale_copy_when_reload_fails(backend):
+    """
+    Test para verificar que se sirve la copia previa si Firestore falla
+    """
+    cache = TopicCatalogCache(ttl_seconds=60, listen=False)
+    load(cache, backend)
+    cache.invalidate()
+    backend.fail = True
+    load(cache, backend)
+
+    assert cache.get('js-closures') is not None
+    assert cache.stats()['stale_hits'] == 1
+
+
+def test_catalog_first_load_failure_raises(backend):
+    """
+    Test para verificar que sin copia previa el error se propaga
+    """
+    cache = TopicCatalogCache(ttl_seconds=60, listen=False)
+    backend.fail = True
+    with pytest.raises(RuntimeError):
+        load(cache, backend)
+
+
+def test_catalog_snapshot_updates_without_reads(backend):
+    """
+    Test para verificar que el listener actualiza el catálogo sin lecturas extra
+    """
+    cache = TopicCatalogCache(ttl_seconds=0, listen=True)
+    load(cache, backend)
+    assert cache.stats()['listening'] is True
+
+    backend.set('topics', 'sql-joins', make_topic('Joins', 'sql'))
+    load(cache, backend)
+
+    assert backend.streams == 1
+    assert cache.get('sql-joins').title == 'Joins'
+    assert cache.stats()['snapshots'] == 2
+
+    cache.stop()
+    assert cache.stats()['listening'] is False
+
+
+def test_concurrent_misses_share_one_reload(backend):
+    """
+    Test para verificar que las recargas concurrentes se agrupan en una sola
+    """
+    cache = TopicCatalogCache(ttl_seconds=60, listen=False)
+    async_backend = AsyncMemoryBackend(backend)
+
+    async def many_reads():
+        await asyncio.gather(*(cache.ensure_loaded(async_backend) for _ in range(10)))
+
+    asyncio.run(many_reads())
+    assert backend.streams == 1
+    assert cache.stats()['reloads'] == 1
+
+
+@pytest.mark.parametrize('cache_enabled', [True, False])
+def test_first_topics_skips_excluded_across_pages(memory_backend, monkeypatch, cache_enabled):
+    """
+    Test para verificar los primeros temas por id sin los excluidos, con y sin cache (por páginas)
+    """
+    monkeypatch.setattr(config, 'topics_cache_enabled', cache_enabled)
+    monkeypatch.setattr(topic_repository, 'MAX_TOPICS_PAGE', 2)
+    for topic_id in ('a', 'b', 'c', 'd', 'e'):
+        memory_backend.set('topics', topic_id, {'title': topic_id, 'category_id': 'python',
+                                                'details': []})
+
+    topics = asyncio.run(topic_repository.first_topics(2, exclude={'a', 'b', 'c'}))
+    assert [topic.id for topic in topics] == ['d', 'e']
+    assert [t.id for t in asyncio.run(topic_repository.first_topics(9))] == ['a', 'b', 'c', 'd', 'e']
@@ -0,0 +1,26 @@
+import asyncio
+from datetime import datetime, UTC
+
+from scripts import backfill_streaks
+
+
+def test_backfill_builds_bitmaps_from_timestamps(memory_backend):
+    """
+    Test para verificar que el backfill construye el bitmap y respeta los ya calculados
+    """
+    memory_backend.set('progress', 'ana_topic-1', {
+        'user_id': 'ana', 'topic_id': 'topic-1', 'status': 'completed',
+        'created_at': datetime(2024, 3, 1, 9, tzinfo=UTC),
+        'last_reviewed_at': datetime(2024, 3, 2, 9, tzinfo=UTC),
+        'updated_at': datetime(2024, 3, 2, 9, tzinfo=UTC)})
+    memory_backend.set('progress', 'ana_topic-2', {
+        'user_id': 'ana', 'topic_id': 'topic-2', 'status': 'completed',
+        'created_at': datetime(2024, 3, 1, tzinfo=UTC), 'updated_at': datetime(2024, 3, 1, tzinfo=UTC),
+        'study_days': 1, 'study_anchor': '2024-03-01'})
+
+    assert asyncio.run(backfill_streaks.backfill()) == {'ana': 1}
+
+    stored = memory_backend.get('progress', 'ana_topic-1')
+    assert (stored['study_days'], stored['study_anchor']) == (0b11, '2024-03-02')
+    assert stored['longest_streak'] == 2
+    assert memory_backend.get('progress', 'ana_topic-2')['study_days'] == 1
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from datetime import datetime, UTC
+
+import pytest
+
+from app.core import config
+from app.repositories.backends import AsyncMemoryBackend, set_async_backend
+from scripts import export_data
+
+
+def add_documents(backend, progress=7, sessions=3):
+    now = datetime(2024, 3, 1, tzinfo=UTC)
+    for i in range(progress):
+        backend.set('progress', f'ana_topic-{i}', {
+            'user_id': 'ana', 'topic_id': f'topic-{i}', 'status': 'completed',
+            'created_at': now, 'updated_at': now})
+    for i in range(sessions):
+        backend.set('sessions', f'session-{i}', {
+            'user_id': 'ana', 'created_at': now,
+            'topics': [{'topic_id': 'topic-1', 'title': 'Tema 1'}]})
+
+
+def read_ndjson(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_export_ndjson_pages_and_reports_throughput(memory_backend, tmp_path):
+    """
+    Test para verificar la exportación NDJSON por páginas y el informe de throughput
+    """
+    add_documents(memory_backend)
+
+    result = asyncio.run(export_data.export(output_dir=str(tmp_path), output_format='ndjson',
+                                            page_size=2, row_group_size=3))
+
+    assert result['format'] == 'ndjson'
+    assert result['collections']['progress']['rows'] == 7
+    assert result['collections']['sessions']['rows'] == 3
+    assert result['collections']['progress']['bytes'] > 0
+    rows = read_ndjson(tmp_path / 'progress.ndjson')
+    assert [row['id'] for row in rows] == [f'ana_topic-{i}' for i in range(7)]
+    assert rows[0]['created_at'].startswith('2024-03-01T00:00:00')
+    assert read_ndjson(tmp_path / 'sessions.ndjson')[0]['topics'][0]['topic_id'] == 'topic-1'
+
+
+def test_export_resumes_from_checkpoint(memory_backend, tmp_path):
+    """
+    Test para verificar que tras un fallo --resume continúa sin duplicar filas
+    """
+    add_documents(memory_backend, progress=10, sessions=0)
+    queries = []
+
+    class FlakyBackend(AsyncMemoryBackend):
+        async def query(self, *args, **kwargs):
+            queries.append(kwargs.get('start_after'))
+            if len(queries) == 3:
+                raise ConnectionError('sin red')
+            return await super().query(*args, **kwargs)
+
+    set_async_backend(FlakyBackend(memory_backend))
+    with pytest.raises(ConnectionError):
+        asyncio.run(export_data.export(['progress'], str(tmp_path), 'ndjson',
+                                       page_size=2, row_group_size=3))
+    checkpoint = json.loads((tmp_path / 'checkpoint.json').read_text())
+    assert checkpoint['collections']['progress']['rows'] == 3
+
+    result = asyncio.run(export_data.export(['progress'], str(tmp_path), 'ndjson',
+                                            page_size=2, row_group_size=3, resume=True))
+
+    assert result['collections']['progress']['rows'] == 7
+    rows = read_ndjson(tmp_path / 'progress.ndjson')
+    assert [row['id'] for row in rows] == sorted(f'ana_topic-{i}' for i in range(10))
+    assert export_data.main(['--collection', 'progress', '--output-dir', str(tmp_path),
+                             '--format', 'ndjson', '--resume']) == 0
+
+
+def test_export_flattens_user_progress_with_user_map_layout(memory_backend, tmp_path,
+                                                           monkeypatch):
+    """
+    Test para verificar que con PROGRESS_LAYOUT=user_map se exporta user_progress, una fila por tema
+    """
+    monkeypatch.setattr(config, 'progress_layout', 'user_map')
+    now = datetime(2024, 3, 1, tzinfo=UTC)
+    for user_id, topics in (('ana', 3), ('luis', 2)):
+        memory_backend.set('user_progress', user_id, {'user_id': user_id, 'topics': {
+            f'topic-{i}': {'status': 'completed', 'updated_at': now} for i in range(topics)}})
+
+    result = asyncio.run(export_data.export(output_dir=str(tmp_path), output_format='ndjson',
+                                            page_size=1, row_group_size=2))
+
+    assert set(result['collections']) == {'user_progress', 'sessions'}
+    rows = read_ndjson(tmp_path / 'user_progress.ndjson')
+    assert [row['id'] for row in rows] == [
+        'ana_topic-0', 'ana_topic-1', 'ana_topic-2', 'luis_topic-0', 'luis_topic-1']
+    assert rows[0]['user_id'] == 'ana' and rows[0]['topic_id'] == 'topic-0'
+    assert 'topics' not in rows[0]
+    checkpoint = json.loads((tmp_path / 'checkpoint.json').read_text())
+    assert checkpoint['collections']['user_progress']['cursor'] == 'luis'
+
+
+def test_export_parquet_row_groups(memory_backend, tmp_path):
+    """
+    Test para verificar la exportación a Parquet en row groups (requiere pyarrow)
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+    add_documents(memory_backend)
+
+    asyncio.run(export_data.export(['progress', 'sessions'], str(tmp_path), 'parquet',
+                                   page_size=2, row_group_size=3))
+
+    table = pq.read_table(tmp_path / 'progress')
+    assert table.num_rows == 7
+    assert pq.ParquetFile(tmp_path / 'progress' / 'part-00000.parquet').num_row_groups == 3
+    sessions = pq.read_table(tmp_path / 'sessions').to_pylist()
+    assert json.loads(sessions[0]['topics'])[0]['topic_id'] == 'topic-1'
+
+
+def test_conform_row_moves_mismatched_values_to_extra():
+    """
+    Test para verificar que los valores que no encajan con el esquema inferido van a _extra
+    """
+    kinds = {'id': 'string', 'confidence_level': 'int', 'reviewed_at': 'timestamp',
+             'streak': 'float'}
+    row = {'id': 'ana_topic-1', 'confidence_level': 3.5, 'reviewed_at': '2024-03-01',
+           'streak': 2, 'nuevo': True}
+
+    conformed = export_data.conform_row(row, kinds)
+
+    assert conformed['id'] == 'ana_topic-1'
+    assert conformed['confidence_level'] is None and conformed['reviewed_at'] is None
+    assert conformed['streak'] == 2
+    assert json.loads(conformed['_extra']) == {
+        'confidence_level': 3.5, 'reviewed_at': '2024-03-01', 'nuevo': True}
+    assert export_data.conform_row({'id': 'x', 'streak': None}, kinds)['_extra'] is None
+
+
+def test_export_parquet_tolerates_type_drift(memory_backend, tmp_path):
+    """
+    Test para verificar que un tipo distinto en un row group posterior no corta la exportación
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+    now = datetime(2024, 3, 1, tzinfo=UTC)
+    memory_backend.set('progress', 'a', {'confidence_level': 3, 'updated_at': now})
+    memory_backend.set('progress', 'b', {'confidence_level': 3.5, 'updated_at': 'ayer'})
+
+    asyncio.run(export_data.export(['progress'], str(tmp_path), 'parquet', row_group_size=1))
+
+    rows = pq.read_table(tmp_path / 'progress').to_pylist()
+    assert rows[1]['confidence_level'] is None
+    assert json.loads(rows[1]['_extra']) == {'confidence_level': 3.5, 'updated_at': 'ayer'}
+
+
+def test_sizes_must_be_positive():
+    """
+    Test para verificar que --page-size y --row-group-size rechazan cero y negativos
+    """
+    for option in ('--page-size', '--row-group-size'):
+        for value in ('0', '-1'):
+            with pytest.raises(SystemExit):
+                export_data.parse_args([option, value])
+
+
+def test_resume_ignores_stray_part_files(tmp_path):
+    """
+    Test para verificar que al reanudar solo se borran los part-NNNNN.parquet a medio escribir
+    """
+    for name in ('part-00000.parquet', 'part-00001.parquet', 'part-notas.txt', 'part-1.parquet'):
+        (tmp_path / name).write_bytes(b'')
+    export_data.ParquetWriter(str(tmp_path), state={'parts': 1})
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'part-00000.parquet', 'part-1.parquet', 'part-notas.txt']
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from scripts import migrate_progress_layout
+
+
+def add_progress(backend, user_id, topic_id, updated_at, status='completed'):
+    backend.set('progress', f'{user_id}_{topic_id}', {
+        'user_id': user_id, 'topic_id': topic_id, 'status': status,
+        'created_at': updated_at, 'updated_at': updated_at})
+
+
+def test_migrate_builds_user_maps(memory_backend):
+    """
+    Test para verificar que la migración agrupa el progreso por usuario entre páginas
+    """
+    now = datetime.now(UTC)
+    for i in range(5):
+        add_progress(memory_backend, 'ana', f'topic-{i}', now)
+    add_progress(memory_backend, 'luis', 'topic-1', now)
+
+    totals = asyncio.run(migrate_progress_layout.migrate(page_size=2))
+
+    assert totals == {'documents': 6, 'migrated': 6, 'skipped': 0, 'invalid': 0, 'deleted': 0,
+                      'users': 2, 'invalid_ids': []}
+    ana = memory_backend.get('user_progress', 'ana')
+    assert set(ana['topics']) == {f'topic-{i}' for i in range(5)}
+    assert ana['topics']['topic-0'] == {'status': 'completed', 'created_at': now,
+                                        'updated_at': now}
+    assert memory_backend.count('progress') == 6
+
+
+def test_migrate_keeps_newer_entries_and_deletes_source(memory_backend):
+    """
+    Test para verificar que no se pisan entradas más recientes y que --delete-source borra el origen
+    """
+    now = datetime.now(UTC)
+    add_progress(memory_backend, 'ana', 'topic-1', now - timedelta(days=1), status='in-progress')
+    add_progress(memory_backend, 'ana', 'topic-2', now)
+    memory_backend.set('user_progress', 'ana', {'user_id': 'ana', 'topics': {
+        'topic-1': {'status': 'completed', 'updated_at': now}}})
+
+    totals = asyncio.run(migrate_progress_layout.migrate(page_size=1, delete_source=True))
+
+    assert totals['migrated'] == 1 and totals['skipped'] == 1 and totals['deleted'] == 2
+    topics = memory_backend.get('user_progress', 'ana')['topics']
+    assert topics['topic-1']['status'] == 'completed'
+    assert topics['topic-2']['status'] == 'completed'
+    assert memory_backend.count('progress') == 0
+
+
+def test_migrate_keeps_invalid_documents(memory_backend):
+    """
+    Test para verificar que --delete-source no borra los documentos sin user_id o topic_id
+    """
+    add_progress(memory_backend, 'ana', 'topic-1', datetime.now(UTC))
+    memory_backend.set('progress', 'broken', {'status': 'completed'})
+
+    totals = asyncio.run(migrate_progress_layout.migrate(page_size=1, delete_source=True))
+
+    assert totals['migrated'] == 1 and totals['deleted'] == 1
+    assert totals['invalid'] == 1 and totals['invalid_ids'] == ['broken']
+    assert memory_backend.get('progress', 'broken') == {'status': 'completed'}
+    assert memory_backend.get('progress', 'ana_topic-1') is None
+
+
+def test_migrate_does_not_overwrite_concurrent_api_writes(memory_backend, monkeypatch):
+    """
+    Test para verificar que una escritura de la API entre la lectura de la página y la del mapa gana
+    """
+    now = datetime.now(UTC)
+    add_progress(memory_backend, 'ana', 'topic-1', now - timedelta(days=1), status='in-progress')
+    transform = memory_backend.transform
+
+    def write_then_transform(collection, doc_id, fn):
+        memory_backend.set('user_progress', 'ana', {'user_id': 'ana', 'topics': {
+            'topic-1': {'status': 'completed', 'updated_at': now}}}, merge=True)
+        return transform(collection, doc_id, fn)
+
+    monkeypatch.setattr(memory_backend, 'transform', write_then_transform)
+    totals = asyncio.run(migrate_progress_layout.migrate())
+
+    assert totals['migrated'] == 0 and totals['skipped'] == 1
+    assert memory_backend.get('user_progress', 'ana')['topics']['topic-1']['status'] == 'completed'
+
+
+def test_migrate_dry_run_writes_nothing(memory_backend):
+    """
+    Test para verificar que --dry-run solo cuenta
+    """
+    add_progress(memory_backend, 'ana', 'topic-1', datetime.now(UTC))
+    assert migrate_progress_layout.main(['--dry-run']) == 0
+    assert memory_backend.get('user_progress', 'ana') is None
+
+
+def test_page_size_must_be_positive():
+    """
+    Test para verificar que --page-size rechaza cero y negativos
+    """
+    for value in ('0', '-5'):
+        with pytest.raises(SystemExit):
+            migrate_progress_layout.parse_args(['--page-size', value])
+    assert migrate_progress_layout.parse_args(['--page-size', '10']).page_size == 10
@@ -0,0 +1,37 @@
+import asyncio
+from datetime import datetime, UTC
+
+from scripts import rebuild_due_queue
+
+
+def add_progress(backend, user_id, topic_id):
+    now = datetime.now(UTC)
+    backend.set('progress', f'{user_id}_{topic_id}', {
+        'user_id': user_id, 'topic_id': topic_id, 'status': 'completed',
+        'created_at': now, 'updated_at': now, 'last_reviewed_at': now})
+
+
+def test_rebuild_replaces_drifted_queues(memory_backend):
+    """
+    Test para verificar que la reconstrucción corrige colas desactualizadas de todos los usuarios
+    """
+    add_progress(memory_backend, 'ana', 'topic-1')
+    add_progress(memory_backend, 'ana', 'topic-2')
+    add_progress(memory_backend, 'luis', 'topic-1')
+    memory_backend.set('due_queues', 'ana', {'topics': {'borrado': datetime.now(UTC)}})
+
+    rebuilt = asyncio.run(rebuild_due_queue.rebuild())
+
+    assert rebuilt == {'ana': 2, 'luis': 1}
+    assert set(memory_backend.get('due_queues', 'ana')['topics']) == {'topic-1', 'topic-2'}
+
+
+def test_rebuild_single_user(memory_backend):
+    """
+    Test para verificar que --user limita la reconstrucción
+    """
+    add_progress(memory_backend, 'ana', 'topic-1')
+    add_progress(memory_backend, 'luis', 'topic-1')
+
+    assert asyncio.run(rebuild_due_queue.rebuild(['luis'])) == {'luis': 1}
+    assert memory_backend.get('due_queues', 'ana') is None
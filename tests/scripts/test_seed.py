@@ -0,0 +1,74 @@
+import pytest
+from scripts.seed import TOPIC_FIELDS, chunked, content_hash, parse_args, plan_writes
+
+
+def make_topic(topic_id, title='Closures'):
+    return {
+        'id': topic_id,
+        'title': title,
+        'category_id': 'js-react',
+        'details': ['Una función interna tiene acceso al scope externo'],
+    }
+
+
+def test_content_hash_ignores_id_and_key_order():
+    """
+    Test para verificar que el hash depende solo del contenido sembrable
+    """
+    topic = make_topic('js-closures')
+    reordered = dict(reversed(list(topic.items())))
+    reordered['id'] = 'otro-id'
+
+    assert content_hash(topic, TOPIC_FIELDS) == content_hash(reordered, TOPIC_FIELDS)
+    assert content_hash(topic, TOPIC_FIELDS) != content_hash(
+        make_topic('js-closures', title='Otro'), TOPIC_FIELDS)
+
+
+def test_plan_writes_skips_unchanged_topics():
+    """
+    Test para verificar que solo se escriben topics nuevos o modificados
+    """
+    unchanged = make_topic('js-closures')
+    changed = make_topic('js-promesas', title='Promesas')
+    new = make_topic('sql-joins', title='Joins')
+    existing = {
+        'js-closures': content_hash(unchanged, TOPIC_FIELDS),
+        'js-promesas': 'hash-anterior',
+    }
+
+    writes = plan_writes([unchanged, changed, new], TOPIC_FIELDS, existing)
+
+    assert [(doc_id, is_new) for doc_id, _, is_new in writes] == [
+        ('js-promesas', False), ('sql-joins', True)]
+    assert 'id' not in writes[0][1]
+    assert writes[0][1]['content_hash'] == content_hash(changed, TOPIC_FIELDS)
+
+
+def test_chunked_respects_size():
+    """
+    Test para verificar la división en lotes
+    """
+    assert list(chunked(list(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 500)) == []
+
+
+def test_plan_writes_force_keeps_existing_documents_as_existing():
+    """
+    Test para verificar que --force reescribe todo sin marcar como nuevos los que ya existen
+    """
+    unchanged = make_topic('js-closures')
+    new = make_topic('sql-joins', title='Joins')
+
+    writes = plan_writes([unchanged, new], TOPIC_FIELDS, {'js-closures': None}, force=True)
+
+    assert [(doc_id, is_new) for doc_id, _, is_new in writes] == [
+        ('js-closures', False), ('sql-joins', True)]
+
+
+def test_parse_args_rejects_non_positive_chunk_size():
+    """
+    Test para verificar que --chunk-size debe ser mayor que 0
+    """
+    with pytest.raises(SystemExit):
+        parse_args(['--bulk', '--chunk-size', '0'])
+    assert parse_args(['--chunk-size', '100']).chunk_size == 100
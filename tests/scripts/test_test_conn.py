@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from app.core import config
+from app.repositories.backends import AsyncMemoryBackend, MemoryBackend
+from scripts import test_conn
+
+
+class CountingBackend(AsyncMemoryBackend):
+    def __init__(self, backend):
+        super().__init__(backend)
+        self.documents_read = 0
+
+    async def query(self, *args, **kwargs):
+        docs = await super().query(*args, **kwargs)
+        self.documents_read += len(docs)
+        return docs
+
+    def stream(self, collection):
+        raise AssertionError('Las estadísticas no deben descargar colecciones completas')
+
+
+def make_backend():
+    backend = MemoryBackend()
+    backend.set('categories', 'python', {'name': 'Python', 'icon': 'py'})
+    backend.set('categories', 'js-react', {'name': 'JS', 'icon': 'js'})
+    for i in range(6):
+        category = 'python' if i < 4 else 'js-react'
+        backend.set('topics', f'topic-{i}', {
+            'title': f'Tema {i}', 'category_id': category, 'details': ['Detalle']})
+    for user_id in ('ana', 'luis', 'zoe'):
+        for i in range(5):
+            backend.set('progress', f'{user_id}_topic-{i}',
+                        {'user_id': user_id, 'topic_id': f'topic-{i}', 'status': 'completed'})
+    return CountingBackend(backend)
+
+
+def test_gather_stats_uses_aggregations_and_samples():
+    """
+    Test para verificar conteos, tamaño medio, temas por categoría y usuarios con progreso
+    """
+    backend = make_backend()
+    stats = asyncio.run(test_conn.gather_stats(backend, sample_size=2))
+
+    assert list(stats['collections']) == ['categories', 'progress', 'topics']
+    assert stats['collections']['progress']['count'] == 15
+    assert stats['collections']['progress']['sampled'] == 2
+    assert stats['collections']['topics']['avg_document_bytes'] > 0
+    assert stats['topics_by_category'] == {'js-react': 2, 'python': 4}
+    assert stats['users_with_progress'] == 3
+    # Muestras (2 por colección) + categorías + una lectura por usuario, no los 15 progresos
+    assert backend.documents_read == 2 * 3 + 2 + 3
+
+
+def test_users_with_progress_by_user_id_and_layout(monkeypatch):
+    """
+    Test para verificar el conteo de usuarios con IDs que contienen '_' y con el layout user_map
+    """
+    backend = MemoryBackend()
+    for user_id in ('ana_b', 'ana', 'ana_b_c'):
+        for topic_id in ('topic-1', 'topic-2'):
+            backend.set('progress', f'{user_id}_{topic_id}',
+                        {'user_id': user_id, 'topic_id': topic_id, 'status': 'completed'})
+    async_backend = AsyncMemoryBackend(backend)
+    assert asyncio.run(test_conn.count_users_with_progress(async_backend)) == 3
+
+    monkeypatch.setattr(config, 'progress_layout', 'user_map')
+    for user_id in ('ana', 'luis'):
+        backend.set('user_progress', user_id, {'user_id': user_id, 'topics': {}})
+    assert asyncio.run(test_conn.count_users_with_progress(async_backend)) == 2
+
+
+def test_main_prints_json(memory_backend, capsys):
+    """
+    Test para verificar la salida --json del script
+    """
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    assert test_conn.main(['--json']) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output['collections']['topics']['count'] == 1
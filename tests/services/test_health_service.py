@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+from app.services.health_service import DependencyProber, ThreadedCheck
+
+
+async def ok():
+    return None
+
+
+async def broken():
+    raise ConnectionError('sin red')
+
+
+async def slow():
+    await asyncio.sleep(1)
+
+
+def test_prober_caches_results_and_reports_ages(fake_clock):
+    """
+    Test para verificar que el prober guarda latencia y antigüedad del último éxito
+    """
+    prober = DependencyProber({'storage': ok}, interval=10, clock=fake_clock)
+    assert prober.snapshot()['status'] == 'unknown'
+    assert not prober.is_ready()
+
+    asyncio.run(prober.run_once())
+    fake_clock.now += 4
+    snapshot = prober.snapshot()
+    assert snapshot['status'] == 'ok'
+    assert snapshot['dependencies']['storage']['last_success_age_seconds'] == 4
+    assert prober.is_ready()
+
+    fake_clock.now += 60
+    assert not prober.is_ready()
+
+
+def test_prober_reports_failures_and_timeouts(fake_clock):
+    """
+    Test para verificar que un error o un timeout marcan la dependencia como caída
+    """
+    prober = DependencyProber({'storage': ok, 'auth': broken, 'slow': slow},
+                              timeout=0.01, clock=fake_clock)
+    asyncio.run(prober.run_once())
+
+    snapshot = prober.snapshot()
+    assert snapshot['status'] == 'degraded'
+    assert snapshot['dependencies']['auth']['error'] == 'ConnectionError: sin red'
+    assert snapshot['dependencies']['auth']['last_success_age_seconds'] is None
+    assert snapshot['dependencies']['slow']['error'].startswith('Timed out')
+    assert snapshot['dependencies']['storage']['ok']
+
+
+def test_prober_keeps_last_success_after_failure(fake_clock):
+    """
+    Test para verificar que un fallo conserva el momento del último éxito
+    """
+    checks = {'storage': ok}
+    prober = DependencyProber(checks, clock=fake_clock)
+    asyncio.run(prober.run_once())
+    checks['storage'] = broken
+    fake_clock.now += 5
+    asyncio.run(prober.run_once())
+    assert prober.result('storage')['last_success_age_seconds'] == 5
+
+
+def test_threaded_check_skips_while_previous_call_hangs(fake_clock):
+    """
+    Test para verificar que no se lanza otro hilo hasta que termine el colgado, y que luego se recupera
+    """
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+
+    check = ThreadedCheck(hung)
+    prober = DependencyProber({'auth': check}, timeout=0.01, clock=fake_clock)
+
+    async def scenario():
+        await prober.run_once()
+        first = prober.result('auth')['error']
+        await prober.run_once()
+        second = prober.result('auth')['error']
+        release.set()
+        while check.running():
+            await asyncio.sleep(0.01)
+        await prober.run_once()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.startswith('Timed out')
+    assert second == 'RuntimeError: Previous check is still running'
+    assert len(calls) == 2
+    assert prober.result('auth')['ok']
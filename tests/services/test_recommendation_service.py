@@ -0,0 +1,199 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.models.progress import ProgressResponse
+from app.models.topic import TopicResponse
+from app.repositories.topic_repository import TopicCatalogCache
+from app.services import recommendation_service
+from app.services.recommendation_service import (NEW_TOPIC_PRIORITY, build_due_queue,
+                                                 calculate_topic_priority, next_due_at,
+                                                 rank_topics, rank_topics_vectorized,
+                                                 select_due_topics, select_top_topics)
+
+NOW = datetime(2025, 10, 30, 10, 0, tzinfo=timezone.utc)
+STATUSES = ['not-started', 'in-progress', 'completed', 'archivado']
+
+
+def make_topic(topic_id):
+    return TopicResponse(id=topic_id, title=f'Tema {topic_id}',
+                         category_id='python', details=['Detalle'])
+
+
+def make_progress(topic_id, status='completed', days_ago=1, confidence=3, streak=0):
+    reviewed_at = NOW - timedelta(days=days_ago)
+    return ProgressResponse(id=f'user123_{topic_id}', user_id='user123', topic_id=topic_id,
+                            status=status, confidence_level=confidence, streak=streak,
+                            last_reviewed_at=reviewed_at, created_at=reviewed_at,
+                            updated_at=reviewed_at)
+
+
+def test_new_user_gets_high_priority_for_every_topic():
+    """
+    Test para verificar que un usuario sin progreso tiene prioridad alta en todo
+    """
+    topics = [make_topic(f'topic-{i}') for i in range(5)]
+    ranking = rank_topics(topics, {}, NOW)
+    assert all(priority == NEW_TOPIC_PRIORITY for priority, _ in ranking)
+
+
+def test_completed_yesterday_has_low_priority():
+    """
+    Test para verificar que un tema completado ayer con confianza alta es poco urgente
+    """
+    progress = make_progress('py-decoradores', 'completed', days_ago=1, confidence=5, streak=4)
+    priority = calculate_topic_priority(make_topic('py-decoradores'), progress, NOW)
+    assert priority == 1.0
+    assert priority < NEW_TOPIC_PRIORITY
+
+
+def test_topic_not_reviewed_in_60_days_comes_first():
+    """
+    Test para verificar que un tema sin revisar en 60 días aparece primero
+    """
+    topics = [make_topic(t) for t in ('a-nuevo', 'b-reciente', 'c-olvidado')]
+    progress_map = {
+        'b-reciente': make_progress('b-reciente', 'in-progress', days_ago=2),
+        'c-olvidado': make_progress('c-olvidado', 'in-progress', days_ago=60),
+    }
+    ranking = rank_topics(topics, progress_map, NOW)
+    assert ranking[0][1].id == 'c-olvidado'
+
+
+def test_naive_datetimes_are_treated_as_utc():
+    """
+    Test para verificar fechas sin zona horaria (se asumen UTC)
+    """
+    progress = make_progress('sql-joins', days_ago=20)
+    naive = progress.model_copy(update={'last_reviewed_at': progress.last_reviewed_at.replace(tzinfo=None)})
+    topic = make_topic('sql-joins')
+    assert calculate_topic_priority(topic, naive, NOW) == calculate_topic_priority(topic, progress, NOW)
+
+
+def test_vectorized_ranking_matches_reference():
+    """
+    Test para verificar que el cálculo vectorizado da el mismo ranking que la referencia
+    """
+    rng = random.Random(42)
+    topics = [make_topic(f'topic-{i:04d}') for i in range(2000)]
+    progress_map = {}
+    for topic in rng.sample(topics, 1200):
+        progress_map[topic.id] = make_progress(
+            topic.id,
+            status=rng.choice(STATUSES),
+            days_ago=rng.uniform(0, 90),
+            confidence=rng.randint(1, 5),
+            streak=rng.randint(0, 20),
+        )
+
+    reference = rank_topics(topics, progress_map, NOW)
+    vectorized = rank_topics_vectorized(topics, progress_map, NOW)
+
+    assert [t.id for _, t in vectorized] == [t.id for _, t in reference]
+    assert [p for p, _ in vectorized] == [p for p, _ in reference]
+
+
+def test_vectorized_ranking_ignores_progress_for_unknown_topics():
+    """
+    Test para verificar que el progreso de temas fuera del catálogo se ignora
+    """
+    topics = [make_topic('py-decoradores')]
+    progress_map = {'tema-borrado': make_progress('tema-borrado')}
+    assert rank_topics_vectorized(topics, progress_map, NOW) == rank_topics(topics, progress_map, NOW)
+
+
+def test_select_top_topics_matches_full_ranking():
+    """
+    Test para verificar que el heap acotado elige lo mismo que ordenar todo
+    """
+    rng = random.Random(7)
+    topics = [make_topic(f'topic-{i:03d}') for i in range(300)]
+    progress_map = {t.id: make_progress(t.id, rng.choice(STATUSES), rng.uniform(0, 60))
+                    for t in rng.sample(topics, 200)}
+
+    for limit in (1, 5, 50, 400):
+        top = select_top_topics(topics, progress_map, limit, NOW)
+        assert top == rank_topics(topics, progress_map, NOW)[:limit]
+    assert select_top_topics(topics, progress_map, 0, NOW) == []
+
+
+def make_catalog(topic_ids):
+    catalog = TopicCatalogCache(listen=False)
+    catalog._replace((topic_id, {'title': f'Tema {topic_id}', 'category_id': 'python',
+                                 'details': ['Detalle']}) for topic_id in topic_ids)
+    return catalog
+
+
+def test_next_due_at_grows_with_confidence_and_streak():
+    """
+    Test para verificar que el intervalo de repaso crece con la confianza y la racha
+    """
+    low = make_progress('t', 'completed', days_ago=0, confidence=1)
+    high = make_progress('t', 'completed', days_ago=0, confidence=5)
+    streak = make_progress('t', 'completed', days_ago=0, confidence=5, streak=4)
+    assert next_due_at(low) == NOW + timedelta(days=7)
+    assert next_due_at(low) < next_due_at(high) < next_due_at(streak)
+    assert next_due_at(make_progress('t', 'not-started', days_ago=3)) == NOW - timedelta(days=3)
+
+
+def test_select_due_topics_orders_overdue_new_and_future():
+    """
+    Test para verificar que primero van los atrasados, luego los nuevos y al final los que vencen después
+    """
+    catalog = make_catalog(['a', 'b', 'c', 'd', 'e'])
+    due_queue = build_due_queue([
+        make_progress('a', 'completed', days_ago=0, confidence=5),
+        make_progress('d', 'in-progress', days_ago=10, confidence=1),
+    ])
+    due_queue['borrado'] = NOW - timedelta(days=90)
+
+    selected = select_due_topics(due_queue, catalog, 10, NOW)
+    assert [t.id for t in selected] == ['d', 'b', 'c', 'e', 'a']
+    assert [t.id for t in select_due_topics(due_queue, catalog, 2, NOW)] == ['d', 'b']
+
+
+def test_daily_session_reads_due_queue(memory_backend, monkeypatch):
+    """
+    Test para verificar que con la cola activa la sesión se arma desde ella (reconstruyéndola si falta)
+    """
+    monkeypatch.setattr(recommendation_service.config, 'due_queue_enabled', True)
+    for topic_id in ('a', 'b', 'c'):
+        memory_backend.set('topics', topic_id, {'title': topic_id, 'category_id': 'python',
+                                                'details': ['Detalle']})
+    progress = make_progress('a', 'in-progress', days_ago=30, confidence=1)
+    memory_backend.set('progress', progress.id, progress.model_dump(exclude={'id'}))
+
+    async def session():
+        return [item.topic_id async for item in
+                recommendation_service.generate_daily_session('user123', limit=2, now=NOW)]
+
+    assert asyncio.run(session()) == ['a', 'b']
+    assert set(memory_backend.get('due_queues', 'user123')['topics']) == {'a'}
+
+
+def test_due_queue_session_without_topics_cache(memory_backend, monkeypatch):
+    """
+    Test para verificar que sin cache de temas la cola se resuelve con lecturas al backend y no con el catálogo
+    """
+    monkeypatch.setattr(recommendation_service.config, 'due_queue_enabled', True)
+    for topic_id in ('a', 'b', 'c', 'd'):
+        memory_backend.set('topics', topic_id, {'title': topic_id, 'category_id': 'python',
+                                                'details': ['Detalle']})
+    for progress in (make_progress('c', 'in-progress', days_ago=30, confidence=1),
+                     make_progress('a', 'completed', days_ago=0, confidence=5)):
+        memory_backend.set('progress', progress.id, progress.model_dump(exclude={'id'}))
+
+    async def session(limit):
+        return [item.topic_id async for item in
+                recommendation_service.generate_daily_session('user123', limit=limit, now=NOW)]
+
+    cached = asyncio.run(session(4))
+    monkeypatch.setattr(recommendation_service.config, 'topics_cache_enabled', False)
+
+    async def catalog_not_allowed():
+        raise AssertionError('El catálogo en memoria no se usa sin cache')
+
+    monkeypatch.setattr(recommendation_service.topic_repository.get_catalog(), 'ensure_loaded',
+                        catalog_not_allowed)
+    assert asyncio.run(session(4)) == cached == ['c', 'b', 'd', 'a']
+    assert asyncio.run(session(2)) == ['c', 'b']
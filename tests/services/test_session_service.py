@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, UTC
+
+import pytest
+
+from app.models.session import SessionResponse
+from app.repositories import session_repository
+from app.repositories.session_repository import SESSIONS_COLLECTION
+from app.services.session_service import (SessionMemo, get_session_memo, get_today_session,
+                                          inputs_hash, invalidate_user_sessions,
+                                          open_today_session)
+
+
+@pytest.fixture
+def topics(memory_backend):
+    for i in range(4):
+        memory_backend.set('topics', f'topic-{i}', {
+            'title': f'Tema {i}', 'category_id': 'python', 'details': [f'Detalle {i}']})
+    return memory_backend
+
+
+def test_inputs_hash_ignores_order_and_duplicates():
+    """
+    Test para verificar que el hash de entradas no depende del orden de los temas
+    """
+    assert inputs_hash(['b', 'a', 'a'], 5) == inputs_hash(['a', 'b'], 5)
+    assert inputs_hash(['a', 'b'], 5) != inputs_hash(['a', 'b'], 3)
+
+
+def test_local_date_depends_on_timezone(topics):
+    """
+    Test para verificar que el día de la sesión es el día local del usuario
+    """
+    now = datetime(2024, 3, 10, 3, 0, tzinfo=UTC)
+    utc = asyncio.run(get_today_session('user123', now=now))
+    mexico = asyncio.run(get_today_session('user123', timezone='America/Mexico_City', now=now))
+    assert '_2024-03-10_' in utc.session_id
+    assert '_2024-03-09_' in mexico.session_id
+
+
+def test_session_served_from_storage_after_memo_eviction(topics):
+    """
+    Test para verificar que otra réplica (sin LRU) devuelve la sesión persistida
+    """
+    now = datetime(2024, 3, 10, 12, 0, tzinfo=UTC)
+    first = asyncio.run(get_today_session('user123', limit=2, now=now))
+    get_session_memo().clear()
+    again = asyncio.run(get_today_session('user123', limit=2, now=now.replace(hour=20)))
+    assert again.model_dump() == first.model_dump()
+
+
+def test_invalidate_user_sessions_deletes_only_that_user(topics):
+    """
+    Test para verificar que la invalidación borra solo las sesiones del usuario
+    """
+    now = datetime(2024, 3, 10, 12, 0, tzinfo=UTC)
+    asyncio.run(get_today_session('user123', now=now))
+    asyncio.run(get_today_session('other', now=now))
+    asyncio.run(invalidate_user_sessions('user123', now=now))
+    owners = {doc.data['user_id'] for doc in topics.query(SESSIONS_COLLECTION)}
+    assert owners == {'other'}
+
+
+def test_memo_expires_entries_after_ttl():
+    """
+    Test para verificar el TTL y el límite de tamaño del LRU de sesiones
+    """
+    clock = [0.0]
+    memo = SessionMemo(max_entries=2, ttl_seconds=10, clock=lambda: clock[0])
+    for i in range(3):
+        memo.put(SessionResponse(session_id=f's{i}', user_id='u', created_at=datetime.now(UTC),
+                                 topics=[]))
+    assert memo.get('s0') is None
+    assert memo.get('s2') is not None
+    clock[0] = 11
+    assert memo.get('s2') is None
+    assert memo.stats()['size'] == 1
+
+
+def test_memo_rejects_sessions_read_before_an_invalidation():
+    """
+    Test para verificar que put() descarta una sesión si el usuario se invalidó desde que se leyó
+    """
+    memo = SessionMemo()
+    session = SessionResponse(session_id='s', user_id='u', created_at=datetime.now(UTC), topics=[])
+    epoch = memo.epoch('u')
+    memo.invalidate_user('u')
+    assert not memo.put(session, epoch)
+    assert memo.get('s') is None
+    assert memo.put(session, memo.epoch('u'))
+
+
+def test_invalidation_during_generation_discards_the_session(topics):
+    """
+    Test para verificar que una sesión que se generaba mientras cambió el progreso no se guarda
+    """
+    now = datetime(2024, 3, 10, 12, 0, tzinfo=UTC)
+
+    async def generate_with_concurrent_write():
+        session, items = await open_today_session('user123', now=now)
+        first = await anext(items)
+        await invalidate_user_sessions('user123', now=now)
+        rest = [item async for item in items]
+        return session, [first, *rest]
+
+    session, items = asyncio.run(generate_with_concurrent_write())
+    assert len(items) == 4
+    assert topics.get(SESSIONS_COLLECTION, session.session_id) is None
+    assert get_session_memo().get(session.session_id) is None
+
+
+def test_generation_finishing_during_invalidation_is_not_memoized(topics, monkeypatch):
+    """
+    Test para verificar que una sesión que termina mientras se sube la versión no queda en el LRU
+    """
+    now = datetime(2024, 3, 10, 12, 0, tzinfo=UTC)
+    bump = session_repository.bump_sessions_version
+
+    async def scenario():
+        session, items = await open_today_session('user123', now=now)
+
+        async def generation_finishes_then_bump(user_id):
+            # La generación lee la versión anterior y termina antes de que suba
+            async for _ in items:
+                pass
+            await bump(user_id)
+
+        monkeypatch.setattr(session_repository, 'bump_sessions_version',
+                            generation_finishes_then_bump)
+        await invalidate_user_sessions('user123', now=now)
+        return session
+
+    session = asyncio.run(scenario())
+    assert get_session_memo().get(session.session_id) is None
+    assert topics.get(SESSIONS_COLLECTION, session.session_id) is None
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date, datetime, UTC
+
+from app.models.progress import ProgressCreate
+from app.services import progress_service
+from app.services.streak_service import (STUDY_WINDOW_DAYS, current_streak, longest_streak,
+                                         record_study_day, study_day_fields)
+
+
+def study(days):
+    bitmap, anchor = 0, None
+    for day in days:
+        bitmap, anchor = record_study_day(bitmap, anchor, day)
+    return bitmap, anchor
+
+
+def test_record_study_day_shifts_from_the_anchor():
+    """
+    Test para verificar el desplazamiento del bitmap y los días repetidos o pasados
+    """
+    bitmap, anchor = study([date(2024, 3, 1), date(2024, 3, 2), date(2024, 3, 2),
+                            date(2024, 3, 4)])
+    assert (bitmap, anchor) == (0b1101, '2024-03-04')
+    assert record_study_day(bitmap, anchor, date(2024, 3, 3)) == (0b1111, '2024-03-04')
+
+
+def test_bitmap_is_capped_to_the_window():
+    """
+    Test para verificar que el bitmap nunca pasa de 63 bits
+    """
+    bitmap, anchor = study([date(2024, 1, 1), date(2024, 1, 2)])
+    bitmap, anchor = record_study_day(bitmap, anchor, date(2024, 3, 2))
+    assert bitmap.bit_length() <= STUDY_WINDOW_DAYS
+    bitmap, anchor = record_study_day(bitmap, anchor, date(2024, 12, 31))
+    assert (bitmap, anchor) == (1, '2024-12-31')
+
+
+def test_current_and_longest_streak():
+    """
+    Test para verificar la racha actual (viva hasta ayer) y la más larga
+    """
+    bitmap, anchor = study([date(2024, 3, d) for d in (1, 2, 3, 4, 6, 7)])
+    assert current_streak(bitmap, anchor, date(2024, 3, 7)) == 2
+    assert current_streak(bitmap, anchor, date(2024, 3, 8)) == 2
+    assert current_streak(bitmap, anchor, date(2024, 3, 9)) == 0
+    assert current_streak(bitmap, anchor, date(2024, 3, 6)) == 1
+    assert longest_streak(bitmap) == 4
+
+
+def test_study_day_fields_keep_the_longest_streak():
+    """
+    Test para verificar los campos de racha que guarda el servicio
+    """
+    class Existing:
+        study_days, study_anchor, longest_streak = 0b111, '2024-03-03', 10
+
+    fields = study_day_fields(Existing, datetime(2024, 3, 4, 22, tzinfo=UTC))
+    assert fields == {'study_days': 0b1111, 'study_anchor': '2024-03-04', 'streak': 4,
+                      'longest_streak': 10}
+    assert study_day_fields(None, date(2024, 3, 4))['streak'] == 1
+
+
+def test_late_study_day_can_join_past_streaks():
+    """
+    Test para verificar que un día anterior al ancla que une dos rachas recalcula la más larga
+    """
+    bitmap, anchor = study([date(2024, 3, d) for d in (1, 2, 4, 5, 10)])
+
+    class Existing:
+        study_days, study_anchor, longest_streak = bitmap, anchor, 2
+
+    fields = study_day_fields(Existing, date(2024, 3, 3))
+    assert fields['study_anchor'] == '2024-03-10'
+    assert fields['longest_streak'] == 5
+
+
+def test_progress_writes_track_study_streak(memory_backend):
+    """
+    Test para verificar que cada día con progreso alarga la racha del bitmap
+    """
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+
+    def study_on(day):
+        return asyncio.run(progress_service.record_progress(
+            ProgressCreate(user_id='user123', topic_id='topic-1', status='in-progress'),
+            now=datetime(2024, 3, day, 12, tzinfo=UTC)))
+
+    study_on(1)
+    study_on(2)
+    progress = study_on(3)
+    assert (progress.streak, progress.longest_streak) == (3, 3)
+    assert (progress.study_days, progress.study_anchor) == (0b111, '2024-03-03')
+
+    progress = study_on(5)
+    assert (progress.streak, progress.longest_streak, progress.study_days) == (1, 3, 0b11101)
+
+
+def test_concurrent_study_days_are_not_lost(memory_backend, monkeypatch):
+    """
+    Test para verificar que un día registrado por otra petición a la vez no se pierde del bitmap
+    """
+    memory_backend.set('topics', 'topic-1', {
+        'title': 'Tema 1', 'category_id': 'python', 'details': ['Detalle']})
+    first_day = datetime(2024, 3, 1, 12, tzinfo=UTC)
+    transform = memory_backend.transform
+
+    def other_request_then_transform(collection, doc_id, fn):
+        # Otra petición registra el día 1 justo antes de esta transacción
+        memory_backend.set(collection, doc_id, {
+            'user_id': 'user123', 'topic_id': 'topic-1', 'status': 'in-progress',
+            'created_at': first_day, 'updated_at': first_day,
+            **study_day_fields(None, first_day)}, merge=True)
+        return transform(collection, doc_id, fn)
+
+    monkeypatch.setattr(memory_backend, 'transform', other_request_then_transform)
+    progress = asyncio.run(progress_service.record_progress(
+        ProgressCreate(user_id='user123', topic_id='topic-1', status='in-progress'),
+        now=datetime(2024, 3, 2, 12, tzinfo=UTC)))
+
+    assert (progress.study_days, progress.streak, progress.longest_streak) == (0b11, 2, 2)
+    assert memory_backend.get('progress', 'user123_topic-1')['study_days'] == 0b11